@@ -1,11 +1,13 @@
 # accounts/models.py
 
-from statistics import median
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
-from vitals.models import BloodPressure
+from vitals.stats import (
+    blood_pressure_averages_and_medians,
+    blood_pressure_range,
+    blood_pressure_statistics,
+)
 
 
 class CustomUser(AbstractUser):
@@ -40,57 +42,10 @@ class CustomUser(AbstractUser):
         reading of all the `BloodPressure` objects for the current user.
         - `diastolic_max` is the maximum diastolic blood pressure
         reading of all the `BloodPressure` objects for the current user.
+
+        Returns `None` if the current user has no `BloodPressure` objects.
         """
-        if BloodPressure.objects.filter(user=self).count() == 0:
-            # TODO: Determine if there is a better way to handle this.
-            """
-            {
-                "systolic_min": None,
-                "diastolic_min": None,
-                "systolic_max": None,
-                "diastolic_max": None,
-            }
-            """
-            return None
-        else:
-            systolic_min = (
-                BloodPressure.objects.filter(
-                    user=self,
-                )
-                .order_by("systolic")
-                .first()
-                .systolic
-            )
-            diastolic_min = (
-                BloodPressure.objects.filter(
-                    user=self,
-                )
-                .order_by("diastolic")
-                .first()
-                .diastolic
-            )
-            systolic_max = (
-                BloodPressure.objects.filter(
-                    user=self,
-                )
-                .order_by("-systolic")
-                .first()
-                .systolic
-            )
-            diastolic_max = (
-                BloodPressure.objects.filter(
-                    user=self,
-                )
-                .order_by("-diastolic")
-                .first()
-                .diastolic
-            )
-            return {
-                "systolic_min": systolic_min,
-                "diastolic_min": diastolic_min,
-                "systolic_max": systolic_max,
-                "diastolic_max": diastolic_max,
-            }
+        return blood_pressure_range(blood_pressure_statistics(self))
 
     def get_average_and_median_blood_pressure(self):
         """
@@ -108,50 +63,7 @@ class CustomUser(AbstractUser):
         - `diastolic_median` is the median diastolic blood pressure
         reading of all the `BloodPressure` objects for the current user.
         """
-        systolic_average = (
-            BloodPressure.objects.filter(
-                user=self,
-            )
-            .values_list("systolic", flat=True)
-            .aggregate(models.Avg("systolic"))
-        )
-        diastolic_average = (
-            BloodPressure.objects.filter(
-                user=self,
-            )
-            .values_list("diastolic", flat=True)
-            .aggregate(models.Avg("diastolic"))
-        )
-        if BloodPressure.objects.filter(user=self).count() == 0:
-            return {
-                "systolic_average": None,
-                "diastolic_average": None,
-                "systolic_median": None,
-                "diastolic_median": None,
-            }
-        else:
-            systolic_median = median(
-                BloodPressure.objects.filter(
-                    user=self,
-                ).values_list("systolic", flat=True)
-            )
-            diastolic_median = median(
-                BloodPressure.objects.filter(
-                    user=self,
-                ).values_list("diastolic", flat=True)
-            )
-            return {
-                "systolic_average": round(
-                    systolic_average["systolic__avg"],
-                    2,
-                ),
-                "diastolic_average": round(
-                    diastolic_average["diastolic__avg"],
-                    2,
-                ),
-                "systolic_median": systolic_median,
-                "diastolic_median": diastolic_median,
-            }
+        return blood_pressure_averages_and_medians(blood_pressure_statistics(self))
 
     def __str__(self):
         """
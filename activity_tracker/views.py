@@ -42,7 +42,11 @@ class ActivityListView(RegistrationAcceptedMixin, ListView):
     # template_name = "activity_tracker/activity_list.html"
     # context_object_name = "activities"
     def get_queryset(self) -> QuerySet[Any]:
-        return Activity.objects.filter(user=self.request.user)
+        return (
+            Activity.objects.filter(user=self.request.user)
+            .select_related("activity_type")
+            .prefetch_related("completed_activity")
+        )
 
 
 class ActivityDetailView(RegistrationAcceptedMixin, DetailView):
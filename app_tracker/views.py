@@ -46,6 +46,7 @@ class OrganizationalConceptListView(
     """
 
     model = OrganizationalConcept
+    queryset = OrganizationalConcept.objects.prefetch_related("applications")
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         """
@@ -0,0 +1,54 @@
+# base/cache.py
+
+"""
+Per-user version numbers for cached data.
+
+A module caches a user's data under keys that include the user's current
+version in its namespace, and bumps the version whenever the data changes.
+Stale entries are then never read again, only left to expire. The versions
+only invalidate across processes when the cache backend is shared by all of
+them, as the Redis cache configured in `config.settings.base` is.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _version_key(namespace, user_id):
+    return f"{namespace}:{user_id}:version"
+
+
+def cache_version(namespace, user_id):
+    """
+    Return the version the user's data in `namespace` is currently cached
+    under.
+    """
+    key = _version_key(namespace, user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than 1, so a version evicted from the
+        # cache can't come back and find the data it had cached.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(namespace, user_id):
+    """
+    Invalidate the user's data cached in `namespace` once the current
+    transaction commits.
+
+    Bumping any earlier would let a request that reads before the commit
+    cache the old data under the new version, where it would stay.
+    """
+
+    def bump():
+        try:
+            cache.incr(_version_key(namespace, user_id))
+        except ValueError:
+            # No version is cached, so nothing was cached under one either.
+            pass
+
+    transaction.on_commit(bump)
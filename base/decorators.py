@@ -30,3 +30,18 @@ def registration_accepted_required(view_func):
         return view_func(request, *args, **kwargs)
 
     return _wrapped_view
+
+
+def query_budget(queries):
+    """
+    Declare the most queries a function view may run per request.
+
+    `base.middleware.QueryInstrumentationMiddleware` checks the budget. For
+    class-based views, set a `query_budget` class attribute instead.
+    """
+
+    def decorator(view_func):
+        view_func.query_budget = queries
+        return view_func
+
+    return decorator
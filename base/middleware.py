@@ -0,0 +1,206 @@
+# base/middleware.py
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# The most recent request records, shared by every request this process serves.
+_recent_requests = deque(maxlen=settings.QUERY_INSTRUMENTATION_BUFFER)
+_recent_requests_lock = threading.Lock()
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when a view runs more queries than its declared `query_budget` and
+    `settings.QUERY_BUDGET_RAISE` is set, so the test that requested the view
+    fails.
+    """
+
+
+def fingerprint(sql):
+    """
+    Return `sql` with `IN` lists of any length collapsed, so the same query
+    run with different parameters gets the same fingerprint.
+
+    Django hands the SQL to the database with placeholders, so literal values
+    never need to be stripped.
+    """
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+def recent_requests():
+    """
+    Return a list of the recorded requests, oldest first.
+    """
+    with _recent_requests_lock:
+        return list(_recent_requests)
+
+
+def clear_recent_requests():
+    with _recent_requests_lock:
+        _recent_requests.clear()
+
+
+def view_query_budget(resolver_match):
+    """
+    Return the `query_budget` declared by the view `resolver_match` resolved
+    to, or `None`.
+
+    Class-based views declare it as a class attribute, function views with
+    `base.decorators.query_budget`.
+    """
+    if resolver_match is None:
+        return None
+    view = resolver_match.func
+    view_class = getattr(view, "view_class", None)
+    if view_class is not None:
+        return getattr(view_class, "query_budget", None)
+    return getattr(view, "query_budget", None)
+
+
+class QueryRecorder:
+    """
+    A `connection.execute_wrapper` that times every query and remembers its
+    fingerprint.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicate_count(self):
+        """
+        How many queries repeated a fingerprint that already ran.
+        """
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def duplicates(self, limit=5):
+        """
+        The fingerprints run more than once, most frequent first. A query run
+        once per row of a list is the usual sign of an N+1 pattern.
+        """
+        return [
+            (sql, count)
+            for sql, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Record the query count, SQL time, duplicate queries and render time of
+    every request, per resolved URL name.
+
+    Records go to an in-process ring buffer shown on the staff-only
+    `query_stats` page. They are also sent as `X-Query-Count`,
+    `X-Query-Duplicates` and `Server-Timing` response headers when
+    `settings.DEBUG` is set or the user is staff.
+
+    A view whose `query_budget` is exceeded is logged, or fails with
+    `QueryBudgetExceeded` when `settings.QUERY_BUDGET_RAISE` is set.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request._query_render_started = None
+        request._query_render_time = None
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total_time = time.perf_counter() - start
+
+        record = self._record(request, response, recorder, total_time)
+        with _recent_requests_lock:
+            _recent_requests.append(record)
+        self._add_headers(request, response, record)
+        self._check_budget(record)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        Time the rendering of `TemplateResponse`s, which happens after the
+        view returns.
+        """
+        request._query_render_started = time.perf_counter()
+
+        def finished(response):
+            request._query_render_time = (
+                time.perf_counter() - request._query_render_started
+            )
+
+        response.add_post_render_callback(finished)
+        return response
+
+    def _record(self, request, response, recorder, total_time):
+        match = request.resolver_match
+        render_time = request._query_render_time
+        if render_time is not None:
+            render_time = round(render_time * 1000, 2)
+        return {
+            "time": timezone.now(),
+            "method": request.method,
+            "path": request.path,
+            "url_name": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "sql_ms": round(recorder.duration * 1000, 2),
+            "render_ms": render_time,
+            "total_ms": round(total_time * 1000, 2),
+            "duplicate_queries": recorder.duplicate_count,
+            "duplicates": recorder.duplicates(),
+            "budget": view_query_budget(match),
+        }
+
+    def _add_headers(self, request, response, record):
+        user = getattr(request, "user", None)
+        if not (settings.DEBUG or getattr(user, "is_staff", False)):
+            return
+        response["X-Query-Count"] = str(record["queries"])
+        response["X-Query-Duplicates"] = str(record["duplicate_queries"])
+        timings = [f"db;dur={record['sql_ms']}"]
+        if record["render_ms"] is not None:
+            timings.append(f"render;dur={record['render_ms']}")
+        timings.append(f"total;dur={record['total_ms']}")
+        response["Server-Timing"] = ", ".join(timings)
+
+    def _check_budget(self, record):
+        budget = record["budget"]
+        if budget is None or record["queries"] <= budget:
+            return
+        message = (
+            f"{record['url_name']} ran {record['queries']} queries, over its "
+            f"budget of {budget}."
+        )
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
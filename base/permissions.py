@@ -0,0 +1,19 @@
+# base/permissions.py
+
+from rest_framework.permissions import BasePermission
+
+
+class RegistrationAccepted(BasePermission):
+    """
+    Allow only authenticated users whose registration has been accepted, as
+    `RegistrationAcceptedMixin` does for views.
+    """
+
+    message = "Your registration has not been accepted yet."
+
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and request.user.registration_accepted
+        )
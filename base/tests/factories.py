@@ -0,0 +1,242 @@
+from decimal import Decimal
+
+import factory
+
+from activity_tracker.models import Activity as TrackedActivity
+from activity_tracker.models import ActivityCompleted
+from activity_tracker.models import ActivityType as TrackedActivityType
+from app_tracker.models import Application, OrganizationalConcept
+from boosts.models import Inspirational, InspirationalSent
+from cbt.models import CognitiveDistortion, Thought
+from pi_tracker.models import PiDevice
+from plan_it.models import ActivityInstance
+from plan_it.tests.factories import UserFactory
+from self_enquiry.models import GrowthOpportunity, Journal
+from sonic_text.models import AudioFile
+from uc_goals.models import Goal, VIACharacterStrength, Virtue
+from unimportant_notes.models import NoteTag, UnimportantNote
+from vitals.models import BloodPressure, BodyWeight, Pulse, Temperature
+
+
+class AcceptedUserFactory(UserFactory):
+    registration_accepted = True
+
+
+class JournalFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Journal
+
+    author = factory.SubFactory(AcceptedUserFactory)
+    title = factory.Sequence(lambda n: f"Journal {n}")
+    content = "Calm."
+
+
+class GrowthOpportunityFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = GrowthOpportunity
+
+    author = factory.SubFactory(AcceptedUserFactory)
+    question = factory.Sequence(lambda n: f"Question {n}?")
+
+
+class BloodPressureFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = BloodPressure
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    systolic = factory.Sequence(lambda n: 110 + n % 30)
+    diastolic = factory.Sequence(lambda n: 70 + n % 20)
+    pulse = factory.Sequence(lambda n: 60 + n % 25)
+
+
+class PulseFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Pulse
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    bpm = factory.Sequence(lambda n: 60 + n % 25)
+
+
+class TemperatureFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Temperature
+
+    subject = factory.SubFactory(AcceptedUserFactory)
+    measurement = Decimal("98.6")
+
+
+class BodyWeightFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = BodyWeight
+
+    subject = factory.SubFactory(AcceptedUserFactory)
+    measurement = Decimal("180.0")
+
+
+class ApplicationFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Application
+
+    name = factory.Sequence(lambda n: f"Application {n}")
+
+
+class OrganizationalConceptFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = OrganizationalConcept
+
+    name = factory.Sequence(lambda n: f"Concept {n}")
+
+    @factory.post_generation
+    def applications(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.applications.add(*extracted)
+
+
+class CognitiveDistortionFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = CognitiveDistortion
+
+    name = factory.Sequence(lambda n: f"Distortion {n}")
+    description = "A distortion."
+
+
+class ThoughtFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Thought
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    name = factory.Sequence(lambda n: f"Thought {n}")
+    description = "A thought."
+
+    @factory.post_generation
+    def cognitive_distortion(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.cognitive_distortion.add(*extracted)
+
+
+class NoteTagFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = NoteTag
+
+    author = factory.SubFactory(AcceptedUserFactory)
+    name = factory.Sequence(lambda n: f"Tag {n}")
+
+
+class UnimportantNoteFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = UnimportantNote
+
+    author = factory.SubFactory(AcceptedUserFactory)
+    title = factory.Sequence(lambda n: f"Note {n}")
+
+    @factory.post_generation
+    def tag(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.tag.add(*extracted)
+
+
+class TrackedActivityTypeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = TrackedActivityType
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    name = factory.Sequence(lambda n: f"Tracked Type {n}")
+
+
+class TrackedActivityFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = TrackedActivity
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    name = factory.Sequence(lambda n: f"Tracked Activity {n}")
+    activity_type = factory.SubFactory(
+        TrackedActivityTypeFactory, user=factory.SelfAttribute("..user")
+    )
+
+
+class ActivityCompletedFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ActivityCompleted
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    activity = factory.SubFactory(
+        TrackedActivityFactory, user=factory.SelfAttribute("..user")
+    )
+
+
+class PiDeviceFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = PiDevice
+
+    name = factory.Sequence(lambda n: f"Pi {n}")
+    operating_system = "Raspberry Pi OS"
+    host_name = factory.Sequence(lambda n: f"pi-{n}")
+    ram = "4GB"
+    form_factor = "4B"
+
+
+class VirtueFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Virtue
+
+    name = factory.Sequence(lambda n: f"Virtue {n}")
+    description = "A virtue."
+
+
+class VIACharacterStrengthFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = VIACharacterStrength
+
+    name = factory.Sequence(lambda n: f"Strength {n}")
+    description = "A strength."
+    virtue = factory.SubFactory(VirtueFactory)
+
+
+class GoalFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Goal
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    name = factory.Sequence(lambda n: f"Goal {n}")
+
+    @factory.post_generation
+    def character_strengths(self, create, extracted, **kwargs):
+        if create and extracted:
+            self.character_strengths.add(*extracted)
+
+
+class AudioFileFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = AudioFile
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    name = factory.Sequence(lambda n: f"Recording {n}")
+    # Only the name is stored; nothing is written to storage.
+    file = factory.Sequence(lambda n: f"sonic_audio_files/recording-{n}.mp3")
+
+
+class InspirationalFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Inspirational
+
+    author = factory.SubFactory(AcceptedUserFactory)
+    body = factory.Sequence(lambda n: f"Keep going, {n}.")
+
+
+class InspirationalSentFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = InspirationalSent
+
+    inspirational = factory.SubFactory(InspirationalFactory)
+    inspirational_text = factory.SelfAttribute("inspirational.body")
+    sender = factory.SelfAttribute("inspirational.author")
+    beastie = factory.SubFactory(AcceptedUserFactory)
+
+
+class ActivityInstanceFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ActivityInstance
+
+    user = factory.SubFactory(AcceptedUserFactory)
+    name_snapshot = factory.Sequence(lambda n: f"Activity {n}")
+    type_name_snapshot = "Chore"
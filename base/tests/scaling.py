@@ -0,0 +1,236 @@
+"""
+A harness that requests every list and detail view in `config.urls` with N and
+then `SCALE` times N objects seeded, and reports how each view's query count
+changed. A view whose query count grows with the data is almost always running
+a query per row.
+"""
+
+from collections import namedtuple
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.views.generic.detail import SingleObjectMixin
+from django.views.generic.edit import DeletionMixin, FormMixin
+from django.views.generic.list import MultipleObjectMixin
+
+from base.tests import factories
+from pi_tracker.models import PiDevice
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ActivityTypeFactory,
+    ItemFactory,
+    StorageLocationFactory,
+)
+
+SCALE = 10
+
+# Views that need URL arguments other than a primary key.
+URL_KWARGS = {
+    "vitals:timeseries-api": {"metric": "systolic"},
+    "vitals:vitals-export": {"kind": "bloodpressure"},
+}
+
+# The model behind function-based detail views, which class-based views declare
+# as `model`.
+DETAIL_MODELS = {
+    "pi_tracker:pi_device_detail": PiDevice,
+}
+
+# Views that are not meant for an accepted, non-staff user, besides the admin.
+EXCLUDED_VIEWS = {"query-stats"}
+
+ViewTarget = namedtuple("ViewTarget", ["name", "kind", "model", "kwargs"])
+ScalingResult = namedtuple(
+    "ScalingResult", ["name", "kind", "path", "status", "small", "large"]
+)
+
+
+def iter_patterns(patterns=None, namespace=None):
+    """
+    Yield `(view_name, pattern)` for every `URLPattern` under `patterns`, the
+    root URLconf by default.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            inner = namespace
+            if pattern.namespace:
+                inner = (
+                    f"{namespace}:{pattern.namespace}"
+                    if namespace
+                    else pattern.namespace
+                )
+            yield from iter_patterns(pattern.url_patterns, inner)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            yield name, pattern
+
+
+def classify(name, pattern):
+    """
+    Return the `ViewTarget` for a list or detail view, or `None` for views
+    the harness leaves alone: Django's own views, forms, deletes, and views
+    whose URL arguments it cannot fill in.
+    """
+    if name in EXCLUDED_VIEWS or name.startswith("admin:"):
+        return None
+    view = pattern.callback
+    view_class = getattr(view, "view_class", None)
+    module = (view_class or view).__module__
+    if module.startswith("django."):
+        return None
+    arguments = set(pattern.pattern.converters)
+    kwargs = URL_KWARGS.get(name, {})
+
+    if view_class is not None:
+        if issubclass(view_class, MultipleObjectMixin):
+            return ViewTarget(name, "list", None, kwargs) if not arguments else None
+        if issubclass(view_class, (FormMixin, DeletionMixin)):
+            return None
+        if issubclass(view_class, SingleObjectMixin) and arguments == {"pk"}:
+            return ViewTarget(name, "detail", view_class.model, {})
+
+    if name in DETAIL_MODELS:
+        return ViewTarget(name, "detail", DETAIL_MODELS[name], {})
+    if arguments == set(kwargs):
+        return ViewTarget(name, "list", None, kwargs)
+    return None
+
+
+def view_targets():
+    targets = []
+    for name, pattern in iter_patterns():
+        target = classify(name, pattern)
+        if target is not None:
+            targets.append(target)
+    return targets
+
+
+def seed(user, count):
+    """
+    Create `count` objects of every model the views list for `user`, with the
+    related objects their templates show.
+    """
+    strength = factories.VIACharacterStrengthFactory()
+    distortion = factories.CognitiveDistortionFactory()
+    tag = factories.NoteTagFactory(author=user)
+    application = factories.ApplicationFactory()
+    storage_root = StorageLocationFactory(user=user)
+    activity_root = ActivityLocationFactory(user=user)
+    for _ in range(count):
+        factories.JournalFactory(author=user)
+        factories.GrowthOpportunityFactory(author=user)
+        factories.BloodPressureFactory(user=user)
+        factories.PulseFactory(user=user)
+        factories.TemperatureFactory(subject=user)
+        factories.BodyWeightFactory(subject=user)
+        factories.OrganizationalConceptFactory(applications=[application])
+        factories.ThoughtFactory(user=user, cognitive_distortion=[distortion])
+        factories.UnimportantNoteFactory(author=user, tag=[tag])
+        factories.ActivityCompletedFactory(user=user)
+        factories.PiDeviceFactory()
+        concern = factories.GoalFactory(
+            user=user, is_ultimate_concern=True, character_strengths=[strength]
+        )
+        factories.GoalFactory(user=user, parent=concern)
+        factories.GoalFactory(user=user)
+        factories.AudioFileFactory(user=user)
+        factories.InspirationalSentFactory(
+            inspirational__author=user, beastie=user
+        )
+        factories.ActivityInstanceFactory(user=user)
+        storage_location = StorageLocationFactory(
+            user=user, parent_location=storage_root
+        )
+        activity_location = ActivityLocationFactory(
+            user=user, parent_location=activity_root
+        )
+        ActivityFactory(
+            user=user,
+            type=ActivityTypeFactory(user=user),
+            target_item=ItemFactory(user=user, storage_location=storage_location),
+            activity_location=activity_location,
+        )
+
+
+def target_path(target, user):
+    if target.kind == "list":
+        return reverse(target.name, kwargs=target.kwargs)
+    if target.model is None:
+        return None
+    if target.model is type(user):
+        instance = user
+    else:
+        instance = target.model._default_manager.order_by("pk").first()
+    if instance is None:
+        return None
+    return reverse(target.name, kwargs={"pk": instance.pk})
+
+
+def count_queries(client, path):
+    """
+    Request `path` and return `(status_code, queries)`, including the queries
+    a streaming response runs while it is consumed.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(path)
+        if response.streaming:
+            b"".join(response.streaming_content)
+    return response.status_code, len(context.captured_queries)
+
+
+def measure_scaling(client, user, count):
+    """
+    Seed `count` objects, request every target, seed up to `SCALE * count`
+    and request them again. Detail views keep the same object throughout.
+    """
+    seed(user, count)
+    paths = [(target, target_path(target, user)) for target in view_targets()]
+    small = {
+        target.name: count_queries(client, path)
+        for target, path in paths
+        if path is not None
+    }
+    seed(user, (SCALE - 1) * count)
+    results = []
+    for target, path in paths:
+        if path is None:
+            results.append(ScalingResult(target.name, target.kind, None, None, 0, 0))
+            continue
+        status, large = count_queries(client, path)
+        results.append(
+            ScalingResult(
+                target.name, target.kind, path, status, small[target.name][1], large
+            )
+        )
+    return results
+
+
+def grows(result):
+    return result.path is not None and result.large > result.small
+
+
+def format_report(results, count):
+    """
+    Return a plain-text table of `results`, worst growth first.
+    """
+    header = (
+        f"{'view':<45} {'kind':<6} {'status':>6} "
+        f"{f'N={count}':>7} {f'N={SCALE * count}':>7} {'growth':>7}"
+    )
+    lines = [header, "-" * len(header)]
+    ordered = sorted(results, key=lambda r: (r.small - r.large, r.name))
+    for result in ordered:
+        if result.path is None:
+            lines.append(f"{result.name:<45} {result.kind:<6} {'skipped':>6}")
+            continue
+        marker = "  <-- grows with N" if grows(result) else ""
+        lines.append(
+            f"{result.name:<45} {result.kind:<6} {result.status:>6} "
+            f"{result.small:>7} {result.large:>7} "
+            f"{result.large - result.small:>+7}{marker}"
+        )
+    return "\n".join(lines)
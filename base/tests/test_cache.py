@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from base.cache import bump_cache_version, cache_version
+
+
+class CacheVersionTest(TestCase):
+    """
+    Tests for `base.cache`.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_stable_until_bumped(self):
+        version = cache_version("test", 1)
+        self.assertEqual(cache_version("test", 1), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_cache_version("test", 1)
+
+        self.assertEqual(cache_version("test", 1), version + 1)
+
+    def test_version_is_bumped_once_the_transaction_commits(self):
+        version = cache_version("test", 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_cache_version("test", 1)
+            self.assertEqual(cache_version("test", 1), version)
+
+        self.assertEqual(cache_version("test", 1), version + 1)
+
+    def test_versions_are_per_namespace_and_user(self):
+        version = cache_version("test", 1)
+        cache_version("other", 1)
+        cache_version("test", 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_cache_version("other", 1)
+            bump_cache_version("test", 2)
+
+        self.assertEqual(cache_version("test", 1), version)
+
+    def test_bumping_an_uncached_version_does_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_cache_version("test", 1)
+
+        self.assertIsNone(cache.get("test:1:version"))
+
+    def test_an_evicted_version_does_not_come_back(self):
+        version = cache_version("test", 1)
+        cache.clear()
+
+        self.assertNotEqual(cache_version("test", 1), version)
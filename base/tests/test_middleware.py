@@ -0,0 +1,165 @@
+from django.http import HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import path, reverse
+from django.views.generic import View
+
+from accounts.models import CustomUser
+from base.decorators import query_budget
+from base.middleware import (
+    QueryBudgetExceeded,
+    QueryInstrumentationMiddleware,
+    clear_recent_requests,
+    fingerprint,
+    recent_requests,
+)
+from base.views import summarize_by_url_name
+
+STAFF_USERNAME = "StaffUser"
+PASSWORD_FOR_TESTING = "a_test_password"
+
+
+def list_users(request):
+    # One query for the list, then one per user: an N+1 pattern.
+    for user in CustomUser.objects.all():
+        CustomUser.objects.filter(pk=user.pk).exists()
+    return HttpResponse("ok")
+
+
+@query_budget(1)
+def over_budget(request):
+    list(CustomUser.objects.all())
+    list(CustomUser.objects.all())
+    return HttpResponse("ok")
+
+
+class WithinBudgetView(View):
+    query_budget = 1
+
+    def get(self, request):
+        list(CustomUser.objects.all())
+        return HttpResponse("ok")
+
+
+def rendered(request):
+    template = engines["django"].from_string("{{ greeting }}")
+    return TemplateResponse(request, template, {"greeting": "Hello."})
+
+
+urlpatterns = [
+    path("users/", list_users, name="list-users"),
+    path("over-budget/", over_budget, name="over-budget"),
+    path("within-budget/", WithinBudgetView.as_view(), name="within-budget"),
+    path("rendered/", rendered, name="rendered"),
+]
+
+
+class FingerprintTest(TestCase):
+    """
+    Tests for `base.middleware.fingerprint`.
+    """
+
+    def test_in_lists_are_collapsed(self):
+        self.assertEqual(
+            fingerprint('SELECT 1 FROM "t" WHERE "id" IN (%s, %s, %s)'),
+            fingerprint('SELECT 1 FROM "t" WHERE "id" IN (%s)'),
+        )
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class QueryInstrumentationMiddlewareTest(TestCase):
+    """
+    Tests for `base.middleware.QueryInstrumentationMiddleware`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for username in ["One", "Two", "Three"]:
+            CustomUser.objects.create(username=username)
+
+    def setUp(self):
+        clear_recent_requests()
+
+    def test_records_queries_and_duplicates(self):
+        self.client.get("/users/")
+        record = recent_requests()[-1]
+        self.assertEqual(record["url_name"], "list-users")
+        self.assertEqual(record["queries"], 4)
+        self.assertEqual(record["duplicate_queries"], 2)
+        self.assertEqual(record["duplicates"][0][1], 3)
+        self.assertIsNone(record["render_ms"])
+
+    def test_times_template_rendering(self):
+        self.client.get("/rendered/")
+        self.assertIsNotNone(recent_requests()[-1]["render_ms"])
+
+    @override_settings(DEBUG=True)
+    def test_headers(self):
+        response = self.client.get("/users/")
+        self.assertEqual(response["X-Query-Count"], "4")
+        self.assertEqual(response["X-Query-Duplicates"], "2")
+        self.assertIn("db;dur=", response["Server-Timing"])
+
+    def test_no_headers_for_anonymous_users_in_production(self):
+        response = self.client.get("/users/")
+        self.assertNotIn("X-Query-Count", response)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_over_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/over-budget/")
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_over_budget_logs(self):
+        with self.assertLogs("base.middleware", level="WARNING"):
+            self.client.get("/over-budget/")
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_class_based_view_budget(self):
+        self.client.get("/within-budget/")
+        self.assertEqual(recent_requests()[-1]["budget"], 1)
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        request = RequestFactory().get("/users/")
+        QueryInstrumentationMiddleware(list_users)(request)
+        self.assertEqual(recent_requests(), [])
+
+    def test_summarize_by_url_name(self):
+        self.client.get("/users/")
+        self.client.get("/users/")
+        self.client.get("/within-budget/")
+        summary = summarize_by_url_name(recent_requests())
+        self.assertEqual(summary[0]["url_name"], "list-users")
+        self.assertEqual(summary[0]["requests"], 2)
+        self.assertEqual(summary[0]["mean_queries"], 4)
+
+
+class QueryStatsViewTest(TestCase):
+    """
+    Tests for the staff-only `query_stats` view.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = CustomUser.objects.create_user(
+            username=STAFF_USERNAME,
+            password=PASSWORD_FOR_TESTING,
+            is_staff=True,
+        )
+
+    def test_staff_can_see_the_page(self):
+        self.client.login(username=STAFF_USERNAME, password=PASSWORD_FOR_TESTING)
+        self.client.get(reverse("home"))
+        response = self.client.get(reverse("query-stats"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Query Stats")
+        self.assertIn(
+            "home", [view["url_name"] for view in response.context["views"]]
+        )
+        self.assertIn("X-Query-Count", response)
+
+    def test_non_staff_are_redirected(self):
+        response = self.client.get(reverse("query-stats"))
+        self.assertEqual(response.status_code, 302)
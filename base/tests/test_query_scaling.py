@@ -0,0 +1,77 @@
+import os
+
+from django.test import TestCase, override_settings
+
+from accounts.models import CustomUser
+from base.tests.scaling import (
+    format_report,
+    grows,
+    measure_scaling,
+    view_targets,
+)
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = "RegisteredUser"
+PASSWORD_FOR_TESTING = "a_test_password"
+
+SEED_COUNT = 3
+
+# Set to a file path to keep the per-view scaling report, e.g.
+# `QUERY_SCALING_REPORT=scaling.txt python manage.py test base.tests`.
+REPORT_PATH = os.getenv("QUERY_SCALING_REPORT")
+
+
+class ViewTargetsTest(TestCase):
+    """
+    Tests for `base.tests.scaling.view_targets`.
+    """
+
+    def test_finds_list_and_detail_views(self):
+        targets = {target.name: target for target in view_targets()}
+        self.assertEqual(targets["plan_it:activity_list"].kind, "list")
+        self.assertEqual(targets["cbt:thought-detail"].kind, "detail")
+        self.assertEqual(targets["pi_tracker:pi_device_detail"].kind, "detail")
+        self.assertIn("vitals:timeseries-api", targets)
+
+    def test_leaves_forms_deletes_and_django_views_alone(self):
+        names = {target.name for target in view_targets()}
+        self.assertNotIn("plan_it:activity_add", names)
+        self.assertNotIn("uc_goals:goal_delete", names)
+        self.assertNotIn("login", names)
+        self.assertNotIn("admin:index", names)
+        self.assertNotIn("plan_it:activity_complete", names)
+
+
+# The dashboard snapshot refresh runs inline instead of needing a broker.
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+class QueryScalingTest(TestCase):
+    """
+    Every list and detail view must run the same number of queries for N and
+    for 10N objects.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_query_counts_do_not_grow_with_the_data(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            results = measure_scaling(self.client, self.user, SEED_COUNT)
+        report = format_report(results, SEED_COUNT)
+        if REPORT_PATH:
+            with open(REPORT_PATH, "w") as report_file:
+                report_file.write(report + "\n")
+
+        for result in results:
+            if result.path is not None:
+                self.assertLess(result.status, 500, report)
+        self.assertEqual([r.name for r in results if grows(r)], [], report)
@@ -0,0 +1,63 @@
+# base/views.py
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import render
+
+from base.middleware import recent_requests
+from config.settings.base import THE_SITE_NAME
+
+
+def summarize_by_url_name(records):
+    """
+    Return per URL name totals of `records` from
+    `base.middleware.recent_requests`, the views running the most queries
+    first.
+    """
+    summary = {}
+    for record in records:
+        row = summary.setdefault(
+            record["url_name"],
+            {
+                "url_name": record["url_name"],
+                "requests": 0,
+                "queries": 0,
+                "max_queries": 0,
+                "duplicate_queries": 0,
+                "sql_ms": 0.0,
+                "total_ms": 0.0,
+                "budget": record["budget"],
+                "over_budget": 0,
+            },
+        )
+        row["requests"] += 1
+        row["queries"] += record["queries"]
+        row["max_queries"] = max(row["max_queries"], record["queries"])
+        row["duplicate_queries"] += record["duplicate_queries"]
+        row["sql_ms"] += record["sql_ms"]
+        row["total_ms"] += record["total_ms"]
+        if record["budget"] is not None and record["queries"] > record["budget"]:
+            row["over_budget"] += 1
+    for row in summary.values():
+        row["mean_queries"] = round(row["queries"] / row["requests"], 1)
+        row["mean_sql_ms"] = round(row["sql_ms"] / row["requests"], 2)
+        row["mean_total_ms"] = round(row["total_ms"] / row["requests"], 2)
+    return sorted(summary.values(), key=lambda row: -row["mean_queries"])
+
+
+@staff_member_required
+def query_stats(request):
+    """
+    Staff-only page of the query counts and timings recorded by
+    `base.middleware.QueryInstrumentationMiddleware` in this process.
+    """
+    records = recent_requests()
+    return render(
+        request,
+        "query_stats.html",
+        {
+            "the_site_name": THE_SITE_NAME,
+            "page_title": "Query Stats",
+            "views": summarize_by_url_name(records),
+            "recent": list(reversed(records))[:100],
+        },
+    )
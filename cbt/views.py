@@ -60,7 +60,9 @@ class ThoughtListView(RegistrationAcceptedMixin, FormMixin, ListView):
         returned to only those belonging to the current user.
         """
         # Get the `Thought` objects belonging to the current user.
-        queryset = Thought.objects.filter(user=self.request.user)
+        queryset = Thought.objects.filter(user=self.request.user).prefetch_related(
+            "cognitive_distortion"
+        )
         # Return the `queryset`.
         return queryset
 
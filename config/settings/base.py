@@ -2,6 +2,7 @@
 
 import os
 from pathlib import Path
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -36,10 +37,12 @@ INSTALLED_APPS = [
     "boosts.apps.BoostsConfig",
     "plan_it.apps.PlanItConfig",
     "pomodo.apps.PomodoConfig",
+    "dashboard.apps.DashboardConfig",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "base.middleware.QueryInstrumentationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -103,12 +106,71 @@ EMAIL_PORT = os.getenv("EMAIL_PORT")
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = True
+# The sender of emails the site sends on its own, such as the goal deadline digest.
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "webmaster@localhost")
 
 CELERY_BROKER_URL = os.getenv("REDISCLOUD_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+
+# Shared by every web and Celery process, so a cache version bumped by one of them
+# invalidates what the others cached. Uses Celery's Redis unless CACHE_URL is set.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("CACHE_URL", CELERY_BROKER_URL),
+    }
+}
 CELERY_TASK_ALWAYS_EAGER = (
     os.getenv("CELERY_TASK_ALWAYS_EAGER", "False").lower() == "true"
 )
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# Installed into `django_celery_beat`'s periodic tasks when beat starts.
+CELERY_BEAT_SCHEDULE = {
+    "plan-it-roll-over-recurring-activities": {
+        "task": "plan_it.tasks.roll_over_recurring_activities",
+        "schedule": crontab(hour=0, minute=5),
+    },
+    "plan-it-prune-sync-tombstones": {
+        "task": "plan_it.tasks.prune_sync_tombstones",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    "uc-goals-send-deadline-digests": {
+        "task": "uc_goals.tasks.send_deadline_digests",
+        "schedule": crontab(hour=7, minute=0),
+    },
+}
+
+# Days `plan_it` keeps the record of a deletion for offline clients to sync; a
+# client that last synced longer ago than this downloads everything again.
+PLAN_IT_SYNC_TOMBSTONE_DAYS = int(os.getenv("PLAN_IT_SYNC_TOMBSTONE_DAYS", "90"))
+
+# How `vitals` answers medians and other quantiles: "exact", "sketch", or "auto"
+# (sketch once a metric has at least `VITALS_SKETCH_THRESHOLD` readings).
+VITALS_QUANTILE_MODE = os.getenv("VITALS_QUANTILE_MODE", "auto")
+VITALS_SKETCH_THRESHOLD = int(os.getenv("VITALS_SKETCH_THRESHOLD", "5000"))
+# Vitals exports with more rows than this are written by a Celery task instead of
+# being streamed from the web worker.
+VITALS_EXPORT_STREAM_LIMIT = int(os.getenv("VITALS_EXPORT_STREAM_LIMIT", "100000"))
+
+# Where background vitals exports are written. They hold health data, so they are
+# never linked to directly; `vitals_export_download` serves them to their owner.
+VITALS_EXPORT_STORAGE = "django.core.files.storage.FileSystemStorage"
+VITALS_EXPORT_STORAGE_OPTIONS = {}
+
+# Seconds between the first write behind a dashboard snapshot and its refresh, so
+# a burst of writes is summarized once.
+DASHBOARD_SNAPSHOT_DEBOUNCE = int(os.getenv("DASHBOARD_SNAPSHOT_DEBOUNCE", "30"))
+# Seconds after which the overview page recomputes a snapshot itself.
+DASHBOARD_SNAPSHOT_MAX_AGE = int(os.getenv("DASHBOARD_SNAPSHOT_MAX_AGE", "3600"))
+
+# Per-request query counts and timings, see `base.middleware`.
+QUERY_INSTRUMENTATION_ENABLED = (
+    os.getenv("QUERY_INSTRUMENTATION_ENABLED", "True").lower() == "true"
+)
+# How many of the most recent requests each process keeps.
+QUERY_INSTRUMENTATION_BUFFER = int(os.getenv("QUERY_INSTRUMENTATION_BUFFER", "500"))
+# Raise, rather than log, when a view exceeds its `query_budget`.
+QUERY_BUDGET_RAISE = os.getenv("QUERY_BUDGET_RAISE", "False").lower() == "true"
 
 LOGGING = {
     "version": 1,
@@ -5,6 +5,13 @@ from .base import *  # noqa: F401, F403
 DEBUG = True
 ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
 
+# Views over their query budget fail loudly in development and in the tests.
+QUERY_BUDGET_RAISE = True
+
+# Development and the tests run in one process, so a local memory cache will do
+# and no Redis server is needed.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 # EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 
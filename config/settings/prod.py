@@ -31,3 +31,13 @@ AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com"
 AWS_S3_OBJECT_PARAMETERS = {"ACL": "public-read", "CacheControl": "max-age=86400"}
 AWS_MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/"
 DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+
+# Vitals exports stay private: no public-read ACL, no long-lived public caching,
+# and signed URLs rather than the public custom domain.
+VITALS_EXPORT_STORAGE = DEFAULT_FILE_STORAGE
+VITALS_EXPORT_STORAGE_OPTIONS = {
+    "default_acl": "private",
+    "object_parameters": {},
+    "querystring_auth": True,
+    "custom_domain": None,
+}
@@ -20,6 +20,7 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic.base import TemplateView
 
+from base.views import query_stats
 from config.settings.base import THE_SITE_NAME
 
 urlpatterns = [
@@ -31,6 +32,7 @@ urlpatterns = [
         ),
         name="home",
     ),
+    path("staff/queries/", query_stats, name="query-stats"),
     path("admin/doc/", include("django.contrib.admindocs.urls")),
     path("admin/", admin.site.urls),
     path("accounts/", include("accounts.urls")),
@@ -47,4 +49,5 @@ urlpatterns = [
     path("boosts/", include("boosts.urls")),
     path("plan-it/", include("plan_it.urls")),
     path("pomodo/", include("pomodo.urls")),
+    path("dashboard/", include("dashboard.urls")),
 ]
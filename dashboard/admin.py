@@ -0,0 +1,31 @@
+# dashboard/admin.py
+
+from django.contrib import admin
+
+from dashboard.models import DashboardSnapshot
+
+
+@admin.register(DashboardSnapshot)
+class DashboardSnapshotAdmin(admin.ModelAdmin):
+    """
+    Inherit from `admin.ModelAdmin` so we can customize the admin panel for
+    the `DashboardSnapshot` model.
+
+    Snapshots are maintained automatically, so every field is read-only.
+    """
+
+    list_display = (
+        "user",
+        "is_dirty",
+        "dirtied_at",
+        "computed_at",
+    )
+    list_filter = ("is_dirty",)
+    search_fields = ("user__username",)
+    readonly_fields = (
+        "user",
+        "data",
+        "is_dirty",
+        "dirtied_at",
+        "computed_at",
+    )
@@ -0,0 +1,14 @@
+# dashboard/apps.py
+
+from django.apps import AppConfig
+
+
+class DashboardConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "dashboard"
+    verbose_name = "Dashboard"
+
+    def ready(self):
+        # Connect the signal receivers which mark `DashboardSnapshot` rows
+        # dirty when the data behind them changes.
+        from dashboard import signals  # noqa: F401
@@ -0,0 +1,79 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "data",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="The serialized summary.",
+                        verbose_name="Data",
+                    ),
+                ),
+                (
+                    "is_dirty",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Designates that the data behind the snapshot changed and a refresh is queued.",
+                        verbose_name="Is Dirty",
+                    ),
+                ),
+                (
+                    "dirtied_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="The date and time of the last change behind the snapshot.",
+                        null=True,
+                        verbose_name="Dirtied At",
+                    ),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="The date and time the snapshot was last computed.",
+                        null=True,
+                        verbose_name="Computed At",
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        help_text="The user the snapshot summarizes.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dashboard_snapshot",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dashboard Snapshot",
+                "verbose_name_plural": "Dashboard Snapshots",
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# dashboard/models.py
+
+from django.conf import settings
+from django.db import models
+
+
+class DashboardSnapshot(models.Model):
+    """
+    A precomputed summary of one user's data across all apps, read by the
+    overview page in a single query.
+
+    Writes to the summarized models mark the snapshot dirty and a Celery task
+    recomputes it shortly afterwards. See `dashboard.snapshots`.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="dashboard_snapshot",
+        help_text="The user the snapshot summarizes.",
+    )
+    data = models.JSONField(
+        verbose_name="Data",
+        default=dict,
+        blank=True,
+        help_text="The serialized summary.",
+    )
+    is_dirty = models.BooleanField(
+        verbose_name="Is Dirty",
+        default=True,
+        help_text=(
+            "Designates that the data behind the snapshot changed and a "
+            "refresh is queued."
+        ),
+    )
+    dirtied_at = models.DateTimeField(
+        verbose_name="Dirtied At",
+        null=True,
+        blank=True,
+        help_text="The date and time of the last change behind the snapshot.",
+    )
+    computed_at = models.DateTimeField(
+        verbose_name="Computed At",
+        null=True,
+        blank=True,
+        help_text="The date and time the snapshot was last computed.",
+    )
+
+    class Meta:
+        verbose_name = "Dashboard Snapshot"
+        verbose_name_plural = "Dashboard Snapshots"
+
+    def __str__(self):
+        return f"{self.user.username} | {self.computed_at}"
@@ -0,0 +1,65 @@
+# dashboard/signals.py
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from boosts.models import Inspirational
+from dashboard.snapshots import mark_dirty
+from plan_it.models import Activity
+from self_enquiry.models import Journal
+from uc_goals.models import Goal
+from vitals.models import BloodPressure, BodyWeight, Pulse, Temperature
+
+# The models summarized by `DashboardSnapshot`, with the field naming their
+# owner.
+SNAPSHOT_SOURCES = {
+    BloodPressure: "user",
+    Pulse: "user",
+    Temperature: "subject",
+    BodyWeight: "subject",
+    Activity: "user",
+    Journal: "author",
+    Inspirational: "author",
+    Goal: "user",
+}
+
+
+def _mark_owner_dirty(instance):
+    mark_dirty(getattr(instance, f"{SNAPSHOT_SOURCES[type(instance)]}_id"))
+
+
+@receiver(post_save, sender=BloodPressure)
+@receiver(post_save, sender=Pulse)
+@receiver(post_save, sender=Temperature)
+@receiver(post_save, sender=BodyWeight)
+@receiver(post_save, sender=Activity)
+@receiver(post_save, sender=Journal)
+@receiver(post_save, sender=Inspirational)
+@receiver(post_save, sender=Goal)
+def mark_dashboard_dirty_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Mark the owner's `DashboardSnapshot` dirty when a summarized object is
+    saved.
+    """
+    if raw:
+        return
+    _mark_owner_dirty(instance)
+
+
+@receiver(post_delete, sender=BloodPressure)
+@receiver(post_delete, sender=Pulse)
+@receiver(post_delete, sender=Temperature)
+@receiver(post_delete, sender=BodyWeight)
+@receiver(post_delete, sender=Activity)
+@receiver(post_delete, sender=Journal)
+@receiver(post_delete, sender=Inspirational)
+@receiver(post_delete, sender=Goal)
+def mark_dashboard_dirty_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Mark the owner's `DashboardSnapshot` dirty when a summarized object is
+    deleted, unless the owner is being deleted along with it.
+    """
+    if isinstance(origin, get_user_model()):
+        return
+    _mark_owner_dirty(instance)
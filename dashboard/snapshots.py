@@ -0,0 +1,183 @@
+# dashboard/snapshots.py
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from boosts.models import Inspirational
+from dashboard.models import DashboardSnapshot
+from plan_it.models import Activity
+from self_enquiry.models import Journal
+from uc_goals.models import Goal
+from vitals.importers import IMPORT_SPECS
+
+logger = logging.getLogger(__name__)
+
+RECENT_JOURNALS = 5
+NEXT_ACTIVITIES = 5
+
+
+def _serialize(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _latest_vitals(user):
+    latest = {}
+    for kind, spec in IMPORT_SPECS.items():
+        reading = (
+            spec.model.objects.filter(**{spec.user_field: user})
+            .order_by("-created", "-id")
+            .values("created", *spec.value_fields)
+            .first()
+        )
+        latest[kind] = (
+            {name: _serialize(value) for name, value in reading.items()}
+            if reading
+            else None
+        )
+    return latest
+
+
+def _plan_it(user, today):
+    activities = Activity.objects.filter(user=user)
+    counts = activities.aggregate(
+        overdue=Count("pk", filter=Q(due_date__lt=today)),
+        due_today=Count("pk", filter=Q(due_date=today)),
+        upcoming=Count("pk", filter=Q(due_date__gt=today)),
+    )
+    counts["next"] = [
+        {"id": pk, "name": name, "due_date": due_date.isoformat()}
+        for pk, name, due_date in activities.filter(due_date__isnull=False)
+        .order_by("due_date", "pk")
+        .values_list("pk", "name", "due_date")[:NEXT_ACTIVITIES]
+    ]
+    return counts
+
+
+def _journals(user):
+    journals = Journal.objects.filter(author=user)
+    return {
+        "count": journals.count(),
+        "recent": [
+            {"id": pk, "title": title or "", "created": created.isoformat()}
+            for pk, title, created in journals.order_by("-created").values_list(
+                "pk", "title", "created"
+            )[:RECENT_JOURNALS]
+        ],
+    }
+
+
+def _goals(user, today):
+    # The aggregate aliases must not shadow the `completed` field.
+    counts = Goal.objects.filter(user=user, is_archived=False).aggregate(
+        total_goals=Count("pk"),
+        completed_goals=Count("pk", filter=Q(completed=True)),
+        overdue_goals=Count("pk", filter=Q(completed=False, due_date__lt=today)),
+    )
+    return {
+        "total": counts["total_goals"],
+        "completed": counts["completed_goals"],
+        "overdue": counts["overdue_goals"],
+    }
+
+
+def build_snapshot(user):
+    """
+    Compute the summary of `user`'s data that the overview page shows.
+
+    Everything is reduced to JSON-serializable values so the result can be
+    stored in `DashboardSnapshot.data` as is.
+    """
+    today = timezone.localdate()
+    return {
+        "vitals": _latest_vitals(user),
+        "plan_it": _plan_it(user, today),
+        "journals": _journals(user),
+        "inspirationals": {
+            "count": Inspirational.objects.filter(author=user).count(),
+        },
+        "goals": _goals(user, today),
+    }
+
+
+def refresh_snapshot(user):
+    """
+    Recompute and store `user`'s snapshot. Returns the `DashboardSnapshot`.
+
+    If the data changed again while the snapshot was being built, the new
+    snapshot is stored but stays dirty and another refresh is queued.
+    """
+    snapshot, _ = DashboardSnapshot.objects.get_or_create(user=user)
+    dirtied_at = snapshot.dirtied_at
+    data = build_snapshot(user)
+    now = timezone.now()
+    cleaned = DashboardSnapshot.objects.filter(
+        pk=snapshot.pk, dirtied_at=dirtied_at
+    ).update(data=data, computed_at=now, is_dirty=False)
+    if not cleaned:
+        DashboardSnapshot.objects.filter(pk=snapshot.pk).update(
+            data=data, computed_at=now
+        )
+        _queue_refresh(user.pk)
+    snapshot.refresh_from_db()
+    return snapshot
+
+
+def mark_dirty(user_id):
+    """
+    Record that data behind the snapshot of the user with `user_id` changed.
+
+    Only the write that turns a clean snapshot dirty queues a refresh, and the
+    refresh runs `settings.DASHBOARD_SNAPSHOT_DEBOUNCE` seconds later, so a
+    burst of writes costs a single recomputation.
+    """
+    now = timezone.now()
+    snapshots = DashboardSnapshot.objects.filter(user_id=user_id)
+    if snapshots.filter(is_dirty=False).update(is_dirty=True, dirtied_at=now):
+        _queue_refresh(user_id)
+    else:
+        # Either a refresh is already queued, or there is no snapshot yet and
+        # the overview page builds the first one. Moving `dirtied_at` tells a
+        # refresh that is already running that its result is out of date.
+        snapshots.update(dirtied_at=now)
+
+
+def is_outdated(snapshot):
+    """
+    Whether `snapshot` was computed more than
+    `settings.DASHBOARD_SNAPSHOT_MAX_AGE` seconds ago.
+
+    The overview page recomputes such snapshots itself, which picks up writes
+    that send no signals, such as bulk imports, and refreshes that could not
+    be queued.
+    """
+    max_age = timedelta(seconds=settings.DASHBOARD_SNAPSHOT_MAX_AGE)
+    return snapshot.computed_at is None or (
+        timezone.now() - snapshot.computed_at > max_age
+    )
+
+
+def _queue_refresh(user_id):
+    from dashboard.tasks import refresh_dashboard_snapshot  # avoid circular import
+
+    def queue():
+        try:
+            refresh_dashboard_snapshot.apply_async(
+                (user_id,), countdown=settings.DASHBOARD_SNAPSHOT_DEBOUNCE
+            )
+        except OperationalError:
+            # The snapshot stays dirty and the overview page says so; saving
+            # the reading itself must not fail because the broker is down.
+            logger.warning("Could not queue a dashboard refresh for %s.", user_id)
+
+    transaction.on_commit(queue)
@@ -0,0 +1,21 @@
+# dashboard/tasks.py
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.contrib.auth import get_user_model
+
+from dashboard.snapshots import refresh_snapshot
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def refresh_dashboard_snapshot(user_id):
+    """
+    Recompute the `DashboardSnapshot` of the user with `user_id`.
+    """
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None:
+        return
+    refresh_snapshot(user)
+    logger.info("Refreshed the dashboard snapshot of user %s.", user_id)
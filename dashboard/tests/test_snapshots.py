@@ -0,0 +1,168 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from boosts.models import Inspirational
+from dashboard.models import DashboardSnapshot
+from dashboard.snapshots import build_snapshot, mark_dirty, refresh_snapshot
+from plan_it.models import Activity, ActivityType
+from self_enquiry.models import Journal
+from uc_goals.models import Goal
+from vitals.models import BloodPressure, Temperature
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = "RegisteredUser"
+PASSWORD_FOR_TESTING = "a_test_password"
+
+OVERVIEW_URL = "/dashboard/"
+OVERVIEW_VIEW_NAME = "dashboard:overview"
+OVERVIEW_TEMPLATE = "dashboard/overview.html"
+
+REFRESH_TASK = "dashboard.tasks.refresh_dashboard_snapshot.apply_async"
+
+
+class DashboardSnapshotTestBase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+        today = timezone.localdate()
+        BloodPressure.objects.create(
+            user=cls.user, systolic=120, diastolic=80, pulse=70
+        )
+        Temperature.objects.create(subject=cls.user, measurement=Decimal("98.6"))
+        activity_type = ActivityType.objects.create(user=cls.user, name="Chore")
+        for due_date in [today - timedelta(days=1), today, today + timedelta(days=3)]:
+            Activity.objects.create(
+                user=cls.user, name="Sweep", type=activity_type, due_date=due_date
+            )
+        Journal.objects.create(author=cls.user, title="Monday", content="Calm.")
+        Inspirational.objects.create(author=cls.user, body="Keep going.")
+        Goal.objects.create(user=cls.user, name="Run", completed=True)
+        Goal.objects.create(
+            user=cls.user, name="Swim", due_date=today - timedelta(days=1)
+        )
+
+
+class BuildSnapshotTest(DashboardSnapshotTestBase):
+    """
+    Tests for `dashboard.snapshots.build_snapshot`.
+    """
+
+    def test_summary(self):
+        data = build_snapshot(self.user)
+        self.assertEqual(data["vitals"]["bloodpressure"]["systolic"], 120)
+        self.assertEqual(data["vitals"]["temperature"]["measurement"], 98.6)
+        self.assertIsNone(data["vitals"]["pulse"])
+        self.assertEqual(data["plan_it"]["overdue"], 1)
+        self.assertEqual(data["plan_it"]["due_today"], 1)
+        self.assertEqual(data["plan_it"]["upcoming"], 1)
+        self.assertEqual(len(data["plan_it"]["next"]), 3)
+        self.assertEqual(data["journals"]["count"], 1)
+        self.assertEqual(data["journals"]["recent"][0]["title"], "Monday")
+        self.assertEqual(data["inspirationals"]["count"], 1)
+        self.assertEqual(data["goals"], {"total": 2, "completed": 1, "overdue": 1})
+
+
+class DirtyMarkingTest(DashboardSnapshotTestBase):
+    """
+    Tests for marking snapshots dirty and debouncing their refresh.
+    """
+
+    def setUp(self):
+        refresh_snapshot(self.user)
+
+    def test_refresh_cleans_the_snapshot(self):
+        snapshot = DashboardSnapshot.objects.get(user=self.user)
+        self.assertFalse(snapshot.is_dirty)
+        self.assertIsNotNone(snapshot.computed_at)
+
+    @override_settings(DASHBOARD_SNAPSHOT_DEBOUNCE=30)
+    def test_burst_of_writes_queues_one_refresh(self):
+        with mock.patch(REFRESH_TASK) as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                for body in ["One.", "Two.", "Three."]:
+                    Journal.objects.create(author=self.user, content=body)
+        apply_async.assert_called_once_with((self.user.pk,), countdown=30)
+        self.assertTrue(DashboardSnapshot.objects.get(user=self.user).is_dirty)
+
+    def test_signals_of_other_models(self):
+        with mock.patch(REFRESH_TASK) as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                Goal.objects.filter(name="Run").get().delete()
+        apply_async.assert_called_once()
+
+    def test_write_during_a_refresh_keeps_the_snapshot_dirty(self):
+        mark_dirty(self.user.pk)
+
+        def build_and_write(user):
+            data = build_snapshot(user)
+            mark_dirty(user.pk)
+            return data
+
+        with mock.patch(
+            "dashboard.snapshots.build_snapshot", side_effect=build_and_write
+        ), mock.patch(REFRESH_TASK) as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                snapshot = refresh_snapshot(self.user)
+        self.assertTrue(snapshot.is_dirty)
+        apply_async.assert_called_once()
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_task_refreshes_the_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Inspirational.objects.create(author=self.user, body="Again.")
+        snapshot = DashboardSnapshot.objects.get(user=self.user)
+        self.assertFalse(snapshot.is_dirty)
+        self.assertEqual(snapshot.data["inspirationals"]["count"], 2)
+
+
+class OverviewViewTest(DashboardSnapshotTestBase):
+    """
+    Tests for `OverviewView`.
+    """
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_url_exists_at_desired_location(self):
+        response = self.client.get(OVERVIEW_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, OVERVIEW_TEMPLATE)
+        self.assertEqual(response.context["page_title"], "Overview")
+
+    def test_builds_the_first_snapshot(self):
+        response = self.client.get(reverse(OVERVIEW_VIEW_NAME))
+        self.assertEqual(response.context["summary"]["journals"]["count"], 1)
+        self.assertContains(response, "120 / 80 mmHg")
+
+    def test_reads_a_fresh_snapshot_in_one_query(self):
+        refresh_snapshot(self.user)
+        self.client.get(reverse(OVERVIEW_VIEW_NAME))
+        # Session and user lookups, then the snapshot.
+        with self.assertNumQueries(3):
+            self.client.get(reverse(OVERVIEW_VIEW_NAME))
+
+    @override_settings(DASHBOARD_SNAPSHOT_MAX_AGE=60)
+    def test_recomputes_an_outdated_snapshot(self):
+        refresh_snapshot(self.user)
+        DashboardSnapshot.objects.filter(user=self.user).update(
+            data={}, computed_at=timezone.now() - timedelta(minutes=5)
+        )
+        response = self.client.get(reverse(OVERVIEW_VIEW_NAME))
+        self.assertEqual(response.context["summary"]["inspirationals"]["count"], 1)
+
+    def test_anonymous_user_is_refused(self):
+        self.client.logout()
+        response = self.client.get(reverse(OVERVIEW_VIEW_NAME))
+        self.assertNotEqual(response.status_code, 200)
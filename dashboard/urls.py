@@ -0,0 +1,11 @@
+# dashboard/urls.py
+
+from django.urls import path
+
+from dashboard.views import OverviewView
+
+app_name = "dashboard"
+
+urlpatterns = [
+    path("", OverviewView.as_view(), name="overview"),
+]
@@ -0,0 +1,36 @@
+# dashboard/views.py
+
+from django.views.generic import TemplateView
+
+from base.mixins import RegistrationAcceptedMixin
+from config.settings.base import THE_SITE_NAME
+from dashboard.models import DashboardSnapshot
+from dashboard.snapshots import is_outdated, refresh_snapshot
+
+
+class OverviewView(RegistrationAcceptedMixin, TemplateView):
+    """
+    `TemplateView` for an overview of the user's data across all apps.
+
+    The page reads the user's `DashboardSnapshot` row instead of querying every
+    app. Only a missing or outdated snapshot is computed on the spot.
+    """
+
+    template_name = "dashboard/overview.html"
+
+    extra_context = {
+        "the_site_name": THE_SITE_NAME,
+        "page_title": "Overview",
+    }
+
+    def get_context_data(self, **kwargs):
+        """
+        Override the `get_context_data` method to add the `snapshot`.
+        """
+        context = super().get_context_data(**kwargs)
+        snapshot = DashboardSnapshot.objects.filter(user=self.request.user).first()
+        if snapshot is None or is_outdated(snapshot):
+            snapshot = refresh_snapshot(self.request.user)
+        context["snapshot"] = snapshot
+        context["summary"] = snapshot.data
+        return context
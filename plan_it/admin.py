@@ -4,6 +4,7 @@ from django.contrib import admin
 
 from plan_it.models import (
     Activity,
+    ActivityCompletionSummary,
     ActivityInstance,
     ActivityLocation,
     ActivityType,
@@ -74,3 +75,16 @@ class ActivityInstanceAdmin(admin.ModelAdmin):
         "completed_at",
     )
     search_fields = ("name_snapshot", "type_name_snapshot")
+
+
+@admin.register(ActivityCompletionSummary)
+class ActivityCompletionSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "name_snapshot",
+        "type_name_snapshot",
+        "month",
+        "completions",
+        "user",
+    )
+    list_filter = ("user", "month")
+    search_fields = ("name_snapshot", "type_name_snapshot")
@@ -0,0 +1,313 @@
+# plan_it/analytics.py
+
+"""
+Completion analytics over `ActivityInstance` history.
+
+Counts per activity and per activity type come from date-truncated aggregates
+computed in the database; streaks and the average time between completions
+come from each activity's distinct completion days. Completions archived into
+`ActivityCompletionSummary` rows are reported as separate totals. A report
+costs the same four queries however long the history is.
+
+`archive_completions` keeps that history short by folding old instances into
+monthly summaries.
+"""
+
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from operator import attrgetter
+
+from django.db import transaction
+from django.db.models import Count, DateField, Max, Min, Sum
+from django.db.models.functions import Trunc, TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import Activity, ActivityCompletionSummary, ActivityInstance
+from .recurrence import step_days
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIODS = [PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH]
+
+DEFAULT_PERIOD = PERIOD_WEEK
+DEFAULT_WINDOW_DAYS = 90
+MAX_WINDOW_DAYS = 3650
+
+ActivityStats = namedtuple(
+    "ActivityStats",
+    [
+        "name",
+        "type_name",
+        "total",
+        "counts",
+        "archived",
+        "current_streak",
+        "longest_streak",
+        "average_interval",
+        "target_interval",
+    ],
+)
+TypeStats = namedtuple("TypeStats", ["name", "total", "counts"])
+
+
+def period_start(day, period):
+    """
+    Return the first day of the `period` containing `day`, as the database's
+    `Trunc` does: weeks start on Monday.
+    """
+    if period == PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == PERIOD_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def period_starts(start, end, period):
+    """
+    Return the first day of every `period` from the one containing `start`
+    up to the one containing `end`.
+    """
+    current = period_start(start, period)
+    starts = []
+    while current <= end:
+        starts.append(current)
+        if period == PERIOD_MONTH:
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=7 if period == PERIOD_WEEK else 1)
+    return starts
+
+
+def start_of_day(day):
+    """
+    Return the aware datetime at which `day` starts in the current timezone.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _activity_key(activity_id, name):
+    # Completions of deleted activities are told apart by name.
+    return activity_id if activity_id is not None else f"name:{name}"
+
+
+def streaks(days, step):
+    """
+    Return `(current, longest)` for the sorted completion `days` of an
+    activity meant to be done every `step` days: the number of completions in
+    a row that each came at most `step` days after the one before. The
+    current streak is the run ending with the last completion.
+    """
+    if not days:
+        return 0, 0
+    longest = run = 1
+    for previous, day in zip(days, days[1:]):
+        run = run + 1 if (day - previous).days <= step else 1
+        longest = max(longest, run)
+    return run, longest
+
+
+def average_interval(days):
+    """
+    Return the mean number of days between consecutive completion `days`, or
+    `None` with fewer than two.
+    """
+    if len(days) < 2:
+        return None
+    return round((days[-1] - days[0]).days / (len(days) - 1), 1)
+
+
+def completion_analytics(
+    user, period=DEFAULT_PERIOD, days=DEFAULT_WINDOW_DAYS, today=None
+):
+    """
+    Return the completion analytics of `user` over the last `days` days,
+    bucketed by `period`.
+
+    The result holds the bucket start dates as `periods`, an `ActivityStats`
+    per activity (most completed first) as `activities` and a `TypeStats` per
+    activity type as `types`. Their `counts` line up with `periods`.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period {period!r}.")
+    if today is None:
+        today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    periods = period_starts(start, today, period)
+    index = {bucket: position for position, bucket in enumerate(periods)}
+
+    instances = ActivityInstance.objects.filter(
+        user=user, completed_at__gte=start_of_day(start)
+    )
+
+    bucket_rows = (
+        instances.annotate(
+            bucket=Trunc("completed_at", period, output_field=DateField())
+        )
+        .values("activity_id", "name_snapshot", "type_name_snapshot", "bucket")
+        .annotate(completions=Count("id"))
+        .order_by("bucket")
+    )
+    day_rows = (
+        instances.annotate(day=TruncDate("completed_at"))
+        .values_list("activity_id", "name_snapshot", "day")
+        .distinct()
+        .order_by("day")
+    )
+    targets = {
+        pk: step_days(unit, interval) if is_recurring else None
+        for pk, is_recurring, unit, interval in Activity.objects.filter(
+            user=user
+        ).values_list(
+            "pk", "is_recurring", "recurrence_unit", "recurrence_interval"
+        )
+    }
+    archived = {
+        _activity_key(activity_id, name): total
+        for activity_id, name, total in ActivityCompletionSummary.objects.filter(
+            user=user
+        )
+        .values_list("activity_id", "name_snapshot")
+        .annotate(total=Sum("completions"))
+        .order_by()
+    }
+
+    activities = {}
+    types = {}
+    for row in bucket_rows:
+        key = _activity_key(row["activity_id"], row["name_snapshot"])
+        stats = activities.setdefault(
+            key,
+            {
+                "activity_id": row["activity_id"],
+                "name": row["name_snapshot"],
+                "type_name": row["type_name_snapshot"],
+                "counts": [0] * len(periods),
+            },
+        )
+        # The latest snapshot names the activity.
+        stats["name"] = row["name_snapshot"]
+        stats["type_name"] = row["type_name_snapshot"]
+        position = index.get(row["bucket"])
+        if position is not None:
+            stats["counts"][position] += row["completions"]
+            type_counts = types.setdefault(
+                row["type_name_snapshot"], [0] * len(periods)
+            )
+            type_counts[position] += row["completions"]
+
+    days_by_activity = {}
+    for activity_id, name, day in day_rows:
+        key = _activity_key(activity_id, name)
+        days_by_activity.setdefault(key, []).append(day)
+
+    activity_stats = []
+    for key, stats in activities.items():
+        target = targets.get(stats["activity_id"])
+        completion_days = days_by_activity.get(key, [])
+        step = target or 1
+        current, longest = streaks(completion_days, step)
+        if completion_days and (today - completion_days[-1]).days > step:
+            # Broken: the next completion is overdue.
+            current = 0
+        activity_stats.append(
+            ActivityStats(
+                name=stats["name"],
+                type_name=stats["type_name"],
+                total=sum(stats["counts"]),
+                counts=stats["counts"],
+                archived=archived.get(key, 0),
+                current_streak=current,
+                longest_streak=longest,
+                average_interval=average_interval(completion_days),
+                target_interval=target,
+            )
+        )
+    activity_stats.sort(key=lambda stats: (-stats.total, stats.name))
+    type_stats = sorted(
+        (TypeStats(name, sum(counts), counts) for name, counts in types.items()),
+        key=lambda stats: (-stats.total, stats.name),
+    )
+    return {"periods": periods, "activities": activity_stats, "types": type_stats}
+
+
+def months_ago(day, months):
+    """
+    Return the first day of the month `months` months before `day`'s month.
+    """
+    month_index = day.year * 12 + day.month - 1 - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archive_completions(before, dry_run=False):
+    """
+    Fold every `ActivityInstance` completed before the date `before` into one
+    `ActivityCompletionSummary` per user, activity and month, delete the
+    instances and return how many there were.
+
+    The instances are aggregated by the database, and the summaries written
+    with one `bulk_create` and one `bulk_update`, in one transaction. Months
+    already summarized by an earlier run are added to, not replaced. With
+    `dry_run` nothing is written.
+    """
+    old = ActivityInstance.objects.filter(completed_at__lt=start_of_day(before))
+    with transaction.atomic():
+        rows = list(
+            old.annotate(month=TruncMonth("completed_at", output_field=DateField()))
+            .values(
+                "user_id",
+                "activity_id",
+                "name_snapshot",
+                "type_name_snapshot",
+                "month",
+            )
+            .annotate(
+                completions=Count("id"),
+                first_completed_at=Min("completed_at"),
+                last_completed_at=Max("completed_at"),
+            )
+            .order_by()
+        )
+        archived = sum(row["completions"] for row in rows)
+        if dry_run or not rows:
+            return archived
+
+        summary_key = attrgetter(
+            "user_id", "activity_id", "name_snapshot", "type_name_snapshot", "month"
+        )
+        existing = {
+            summary_key(summary): summary
+            for summary in ActivityCompletionSummary.objects.filter(
+                user_id__in={row["user_id"] for row in rows},
+                month__in={row["month"] for row in rows},
+            )
+        }
+        created, updated = [], []
+        for row in rows:
+            summary = existing.get(
+                (
+                    row["user_id"],
+                    row["activity_id"],
+                    row["name_snapshot"],
+                    row["type_name_snapshot"],
+                    row["month"],
+                )
+            )
+            if summary is None:
+                created.append(ActivityCompletionSummary(**row))
+                continue
+            summary.completions += row["completions"]
+            summary.first_completed_at = min(
+                summary.first_completed_at, row["first_completed_at"]
+            )
+            summary.last_completed_at = max(
+                summary.last_completed_at, row["last_completed_at"]
+            )
+            updated.append(summary)
+        ActivityCompletionSummary.objects.bulk_create(created)
+        ActivityCompletionSummary.objects.bulk_update(
+            updated,
+            ["completions", "first_completed_at", "last_completed_at"],
+        )
+        old.delete()
+    return archived
@@ -0,0 +1,54 @@
+# plan_it/api.py
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from base.permissions import RegistrationAccepted
+
+from .sync import MAX_MUTATIONS, apply_mutations, pull_changes, read_token
+
+
+class SyncView(APIView):
+    """
+    Delta sync for offline clients, see `plan_it.sync`.
+
+    `GET ?token=...` returns what changed since the token. `POST` with
+    `{"token": ..., "mutations": [...]}` applies the client's offline changes
+    first, and returns their results along with the changes, all in one
+    request.
+    """
+
+    permission_classes = [IsAuthenticated, RegistrationAccepted]
+
+    def get(self, request):
+        try:
+            changes = pull_changes(request.user, request.query_params.get("token"))
+        except ValueError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes)
+
+    def post(self, request):
+        mutations = request.data.get("mutations", [])
+        if not isinstance(mutations, list):
+            return Response(
+                {"error": "mutations must be a list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(mutations) > MAX_MUTATIONS:
+            return Response(
+                {"error": f"At most {MAX_MUTATIONS} mutations per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        token = request.data.get("token")
+        if token:
+            # Checked before any mutation is applied.
+            try:
+                read_token(token)
+            except ValueError as error:
+                return Response(
+                    {"error": str(error)}, status=status.HTTP_400_BAD_REQUEST
+                )
+        results = apply_mutations(request.user, mutations)
+        return Response({"results": results, **pull_changes(request.user, token)})
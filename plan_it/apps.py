@@ -7,3 +7,8 @@ class PlanItConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "plan_it"
     verbose_name = "Plan It"
+
+    def ready(self):
+        # Connect the signal receivers which keep `SearchDocument` and the cached
+        # form choices up to date.
+        from plan_it import signals  # noqa: F401
@@ -0,0 +1,154 @@
+# plan_it/benchmarks.py
+
+"""
+Time plan_it's dashboard, list views and completion endpoints against
+synthetic datasets of several sizes, and report the results as JSON.
+
+For each scale in `plan_it.synthetic.SCALES` the runner generates a dataset
+for a throwaway user, requests every benchmarked URL once to warm up and
+count its queries, then `repeat` more times to time it. Everything a scale
+writes is rolled back afterwards, so it can be pointed at a development
+database. Run it with `python manage.py benchmark_plan_it`.
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection, reset_queries, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Activity
+from .synthetic import SCALES, generate_dataset
+
+DEFAULT_REPEAT = 5
+# How many activities the bulk completion benchmark completes per request.
+BULK_COMPLETE_SIZE = 20
+
+
+def _get(name):
+    def request(client, user):
+        return client.get(reverse(name))
+
+    return request
+
+
+def _search(client, user):
+    return client.get(reverse("plan_it:search"), {"q": "drill"})
+
+
+def _complete_one(client, user):
+    pk = Activity.objects.filter(user=user).values_list("pk", flat=True).first()
+    return client.post(reverse("plan_it:activity_complete", args=[pk]))
+
+
+def _complete_many(client, user):
+    pks = list(
+        Activity.objects.filter(user=user).values_list("pk", flat=True)[
+            :BULK_COMPLETE_SIZE
+        ]
+    )
+    return client.post(reverse("plan_it:activities_complete"), {"activity_ids": pks})
+
+
+# The benchmarked requests, by the name they are reported under.
+BENCHMARKS = {
+    "dashboard": _get("plan_it:dashboard"),
+    "storage_location_list": _get("plan_it:storage_location_list"),
+    "activity_location_list": _get("plan_it:activity_location_list"),
+    "item_list": _get("plan_it:item_list"),
+    "activity_list": _get("plan_it:activity_list"),
+    "completion_analytics": _get("plan_it:completion_analytics"),
+    "search": _search,
+    "complete_activity": _complete_one,
+    "complete_activities": _complete_many,
+}
+
+
+def time_request(request, client, user, repeat):
+    """
+    Make `request` once to warm up and count its queries, then `repeat` times
+    to time it. Returns the status, query count and timings in milliseconds.
+    """
+    # Each request clears the query log when it starts, so start it empty.
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        response = request(client, user)
+    # Read before the next request clears the log.
+    query_count = len(queries)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request(client, user)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "status": response.status_code,
+        "queries": query_count,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def run_scale(scale, repeat=DEFAULT_REPEAT, seed=0, benchmarks=None):
+    """
+    Generate a dataset of the given `Scale` and time each of `benchmarks`
+    (all of `BENCHMARKS` by default) against it, then roll everything back.
+    """
+    if benchmarks is None:
+        benchmarks = BENCHMARKS
+    with transaction.atomic():
+        user = get_user_model().objects.create_user(
+            username=f"benchmark-{uuid.uuid4().hex[:12]}",
+            registration_accepted=True,
+        )
+        started = time.perf_counter()
+        dataset = generate_dataset(user, scale, seed=seed)
+        generate_seconds = time.perf_counter() - started
+
+        client = Client()
+        client.force_login(user)
+        results = {
+            name: time_request(request, client, user, repeat)
+            for name, request in benchmarks.items()
+        }
+        transaction.set_rollback(True)
+    return {
+        "scale": scale._asdict(),
+        "dataset": dataset,
+        "generate_seconds": round(generate_seconds, 3),
+        "benchmarks": results,
+    }
+
+
+def run_benchmarks(scales=None, repeat=DEFAULT_REPEAT, seed=0, benchmarks=None):
+    """
+    Run every benchmark at each of `scales`, a `{name: Scale}` dict (all of
+    `SCALES` by default), and return the report.
+    """
+    if scales is None:
+        scales = SCALES
+    # The test client's requests come from "testserver".
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        results = {
+            name: run_scale(scale, repeat=repeat, seed=seed, benchmarks=benchmarks)
+            for name, scale in scales.items()
+        }
+    return {
+        "generated": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "repeat": repeat,
+        "seed": seed,
+        "scales": results,
+    }
+
+
+def write_report(report, path):
+    with open(path, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+        report_file.write("\n")
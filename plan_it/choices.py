@@ -0,0 +1,80 @@
+# plan_it/choices.py
+
+"""
+A per-user cache of the choices plan_it's forms offer for their foreign keys.
+
+Each user's choices are cached as `(pk, label, path)` rows under a
+`base.cache` version, which the receivers in `plan_it.signals` bump on any
+write to a cached model. On a warm cache a form's choices cost no queries;
+validating a submitted choice still reads that one object.
+"""
+
+from django.core.cache import cache
+
+from base.cache import bump_cache_version, cache_version
+
+from .models import ActivityLocation, ActivityType, Item, StorageLocation
+
+CACHE_NAMESPACE = "plan_it:choices"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# The order each model's choices are listed in: locations as a tree.
+CHOICE_ORDERING = {
+    ActivityType: ["name", "pk"],
+    Item: ["name", "pk"],
+    StorageLocation: ["path"],
+    ActivityLocation: ["path"],
+}
+
+
+def _choices_key(user_id, model, version):
+    return f"{CACHE_NAMESPACE}:{user_id}:{model._meta.model_name}:{version}"
+
+
+def bump_choices_version(user_id):
+    """
+    Invalidate every choice cached for the user.
+    """
+    bump_cache_version(CACHE_NAMESPACE, user_id)
+
+
+def load_choices(user, model):
+    """
+    Return the `(pk, label, path)` rows of `user`'s objects of `model`, read
+    in one query.
+    """
+    rows = model.objects.filter(user=user).order_by(*CHOICE_ORDERING[model])
+    return [(obj.pk, str(obj), getattr(obj, "path", "")) for obj in rows]
+
+
+def use_cached_choices(form, user, choice_fields, exclude_path=None):
+    """
+    Offer `user`'s objects as the choices of each of `form`'s fields in
+    `choice_fields`, a `{field name: model}` dict, from the cache.
+
+    Locations under `exclude_path` are left out, and refused if submitted.
+    The cache is read with two lookups for all the fields together.
+    """
+    version = cache_version(CACHE_NAMESPACE, user.pk)
+    keys = {
+        name: _choices_key(user.pk, model, version)
+        for name, model in choice_fields.items()
+    }
+    cached = cache.get_many(keys.values())
+    missing = {}
+    for name, model in choice_fields.items():
+        rows = cached.get(keys[name])
+        if rows is None:
+            rows = missing[keys[name]] = load_choices(user, model)
+
+        field = form.fields[name]
+        # Only read to validate a submitted choice.
+        queryset = model.objects.filter(user=user)
+        if exclude_path:
+            queryset = queryset.exclude(path__startswith=exclude_path)
+            rows = [row for row in rows if not row[2].startswith(exclude_path)]
+        field.queryset = queryset
+        empty = [("", field.empty_label)] if field.empty_label is not None else []
+        field.choices = empty + [(pk, label) for pk, label, _ in rows]
+    if missing:
+        cache.set_many(missing, CACHE_TIMEOUT)
@@ -0,0 +1,64 @@
+# plan_it/completion.py
+
+"""
+Mark many plan_it activities completed at once.
+"""
+
+from django.db import transaction
+from django.utils.timezone import now
+
+from dashboard.snapshots import mark_dirty
+
+from .models import Activity, ActivityInstance
+
+
+def complete_activities(user, activity_ids, completed_at=None):
+    """
+    Record a completion of each of `user`'s activities in `activity_ids` and
+    return the created `ActivityInstance`s. IDs of other users' activities, or
+    of activities that don't exist, are ignored, and a `completed_at` before
+    an activity's `last_completed` is only recorded as an instance.
+
+    The activities and everything their snapshots name are read in one query,
+    the instances written with one `bulk_create` and the activities with one
+    `bulk_update`, all in one transaction.
+    """
+    if completed_at is None:
+        completed_at = now()
+    completed_on = completed_at.date()
+
+    with transaction.atomic():
+        activities = list(
+            Activity.objects.filter(user=user, pk__in=activity_ids)
+            .select_related("type", "target_item", "activity_location")
+            .select_for_update(of=("self",))
+        )
+        if not activities:
+            return []
+
+        instances = ActivityInstance.objects.bulk_create(
+            [
+                activity.completion_snapshot(user, completed_at)
+                for activity in activities
+            ]
+        )
+        # A completion older than the last one, such as one recorded offline
+        # and synced late, is kept in the history but doesn't move the
+        # activity's last completion or due date back.
+        moved = [
+            activity
+            for activity in activities
+            if activity.last_completed is None
+            or completed_on >= activity.last_completed
+        ]
+        moment = now()
+        for activity in moved:
+            activity.last_completed = completed_on
+            if activity.is_recurring:
+                activity.due_date = activity.next_due_date(completed_on)
+            activity.updated = moment
+        Activity.objects.bulk_update(moved, ["last_completed", "due_date", "updated"])
+
+        # Bulk writes send no signals.
+        mark_dirty(user.pk)
+    return instances
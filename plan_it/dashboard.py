@@ -0,0 +1,81 @@
+# plan_it/dashboard.py
+
+"""
+Build the plan_it dashboard from a fixed number of queries.
+
+A user's activity locations and activities are each read in one query and
+assembled into a tree in memory. Every activity's due status is worked out
+against the same `today`, so the template renders plain values and never goes
+back to the database however many locations and activities a user has.
+"""
+
+from collections import namedtuple
+from datetime import date
+
+from .models import Activity, ActivityLocation
+
+DashboardLocation = namedtuple(
+    "DashboardLocation", ["pk", "label", "depth", "activities", "children"]
+)
+DashboardActivity = namedtuple(
+    "DashboardActivity",
+    ["pk", "name", "due_date", "due_status", "target_item_name"],
+)
+
+
+def dashboard_activity(activity, today):
+    return DashboardActivity(
+        pk=activity.pk,
+        name=activity.name,
+        due_date=activity.due_date,
+        due_status=activity.due_status(today),
+        target_item_name=activity.target_item.name if activity.target_item else "",
+    )
+
+
+def build_activity_tree(user, today=None):
+    """
+    Return `(top_locations, uncategorized)` for `user`.
+
+    `top_locations` are `DashboardLocation`s, each with its activities (soonest
+    due first) and child locations. `uncategorized` are the activities without
+    a location.
+    """
+    if today is None:
+        today = date.today()
+
+    activities_by_location = {}
+    activities = (
+        Activity.objects.filter(user=user)
+        .select_related("target_item")
+        .order_by("due_date")
+    )
+    for activity in activities:
+        activities_by_location.setdefault(activity.activity_location_id, []).append(
+            dashboard_activity(activity, today)
+        )
+
+    roots = []
+    by_pk = {}
+    # Ordering by path puts every parent before its children.
+    locations = (
+        ActivityLocation.objects.filter(user=user)
+        .only("pk", "name", "full_name", "depth", "parent_location")
+        .order_by("path")
+    )
+    for location in locations:
+        node = DashboardLocation(
+            pk=location.pk,
+            label=str(location),
+            depth=location.depth,
+            activities=activities_by_location.get(location.pk, []),
+            children=[],
+        )
+        by_pk[location.pk] = node
+        parent = by_pk.get(location.parent_location_id)
+        if parent is None:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+
+    return roots, activities_by_location.get(None, [])
@@ -0,0 +1,20 @@
+# plan_it/forms.py
+
+from django import forms
+
+
+class LocationMergeForm(forms.Form):
+    """
+    Form to choose the location another one is merged into.
+
+    The choices are filled in by the view, from the user's own locations.
+    """
+
+    target = forms.ModelChoiceField(
+        label="Merge into",
+        queryset=None,
+        help_text=(
+            "Sublocations and everything kept here move to this location, "
+            "and this location is deleted."
+        ),
+    )
@@ -0,0 +1,110 @@
+# plan_it/locations.py
+
+"""
+Move and merge storage and activity locations.
+
+Both lock the locations involved and check the move against their
+materialized paths before writing, so that no location can end up inside its
+own subtree even when two moves race. Their cost grows with the subtree
+moved, not with the number of locations.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.timezone import now
+
+from dashboard.snapshots import mark_dirty
+
+from .models import (
+    Activity,
+    ActivityLocation,
+    Item,
+    StorageLocation,
+    rewrite_descendants,
+)
+from .search import refresh_location_paths
+
+# The `(model, field)` pairs of what is kept in each kind of location.
+LOCATION_CONTENTS = {
+    StorageLocation: [(Item, "storage_location")],
+    ActivityLocation: [(Activity, "activity_location")],
+}
+
+
+def _lock(model, pks):
+    """
+    Return `{pk: location}` for the locations of `model` in `pks`, locked
+    until the end of the transaction.
+    """
+    locations = model.objects.select_for_update().in_bulk(pks)
+    if len(locations) != len(set(pks)):
+        raise model.DoesNotExist("Location not found.")
+    return locations
+
+
+def check_move(location, parent):
+    """
+    Raise `ValidationError` unless `location` can be placed under `parent`,
+    read from their current rows.
+    """
+    if parent is None:
+        return
+    if parent.user_id != location.user_id:
+        raise ValidationError("A location can't be placed in another user's.")
+    if parent.path.startswith(location.path):
+        raise ValidationError("A location can't be moved inside itself.")
+
+
+def move_location(location, parent):
+    """
+    Move `location` and its subtree under `parent`, or to the top level if
+    `parent` is `None`, in one transaction. Unsaved changes to `location`,
+    such as a new name, are saved along with the move.
+    """
+    model = type(location)
+    with transaction.atomic():
+        locked = _lock(model, [location.pk] + ([parent.pk] if parent else []))
+        parent = locked[parent.pk] if parent else None
+        check_move(locked[location.pk], parent)
+        location.parent_location = parent
+        location.save()
+    return location
+
+
+def merge_locations(source, target):
+    """
+    Merge `source` into `target` and delete it: `source`'s sublocations move
+    under `target`, with their subtrees, and everything kept in `source` is
+    reassigned to `target`.
+
+    Runs in one transaction, with one query for the whole subtree and one per
+    kind of content. Bulk writes send no signals, so the search documents
+    under `target` are refreshed here.
+    """
+    model = type(source)
+    if source.pk == target.pk:
+        raise ValidationError("A location can't be merged into itself.")
+    with transaction.atomic():
+        locked = _lock(model, [source.pk, target.pk])
+        source, target = locked[source.pk], locked[target.pk]
+        check_move(source, target)
+
+        rewrite_descendants(
+            model,
+            (source.path, source.depth, source.full_name),
+            (target.path, target.depth, target.full_name),
+        )
+        moment = now()
+        model.objects.filter(parent_location=source).update(
+            parent_location=target, updated=moment
+        )
+        for content_model, field in LOCATION_CONTENTS[model]:
+            content_model.objects.filter(**{field: source}).update(
+                **{field: target, "updated": moment}
+            )
+        source.delete()
+
+        refresh_location_paths(target)
+        if model is ActivityLocation:
+            mark_dirty(target.user_id)
+    return target
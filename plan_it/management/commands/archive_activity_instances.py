@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from plan_it.analytics import archive_completions, months_ago
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold activity instances completed before the last `--months` whole "
+        "months into monthly completion summaries and delete them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=12,
+            help="How many months of instances to keep besides the current one.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many instances would be archived without archiving.",
+        )
+
+    def handle(self, *args, **options):
+        if options["months"] < 0:
+            raise CommandError("--months must not be negative.")
+        before = months_ago(timezone.localdate(), options["months"])
+        archived = archive_completions(before, dry_run=options["dry_run"])
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {archived} activity instances completed before {before}."
+            )
+        )
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from plan_it.benchmarks import DEFAULT_REPEAT, run_benchmarks, write_report
+from plan_it.synthetic import SCALES
+
+
+class Command(BaseCommand):
+    help = (
+        "Time plan_it's dashboard, list views and completion endpoints against "
+        "synthetic datasets and write a JSON report. The datasets are rolled "
+        "back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            action="append",
+            choices=sorted(SCALES),
+            help="A scale to benchmark; repeat for several. Defaults to all.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=DEFAULT_REPEAT,
+            help="How many timed requests to make per benchmark.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            default="plan_it_benchmarks.json",
+            help="Where to write the JSON report.",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        names = options["scale"] or list(SCALES)
+        report = run_benchmarks(
+            {name: SCALES[name] for name in names},
+            repeat=options["repeat"],
+            seed=options["seed"],
+        )
+        write_report(report, options["output"])
+
+        for name, result in report["scales"].items():
+            self.stdout.write(f"{name}:")
+            for benchmark, timing in result["benchmarks"].items():
+                self.stdout.write(
+                    f"  {benchmark:<24} {timing['median_ms']:>9.1f} ms "
+                    f"{timing['queries']:>3} queries"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
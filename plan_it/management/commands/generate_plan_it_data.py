@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from plan_it.synthetic import SCALES, generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic plan_it dataset for a user, at one of the preset "
+        "scales or with the sizes given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="The user to generate the data for.")
+        parser.add_argument(
+            "--scale",
+            choices=sorted(SCALES),
+            default="small",
+            help="The preset sizes to start from.",
+        )
+        for field, help_text in [
+            ("depth", "How many levels deep each location tree is."),
+            ("fanout", "How many sublocations each location has."),
+            ("items", "How many items to create."),
+            ("activities", "How many activities to create."),
+            ("instances", "How many completions to create."),
+        ]:
+            parser.add_argument(f"--{field}", type=int, help=help_text)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="The same seed always generates the same data.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named {options['username']!r}.")
+
+        scale = SCALES[options["scale"]]
+        sizes = {
+            field: options[field]
+            for field in scale._fields
+            if options[field] is not None
+        }
+        if any(size < 0 for size in sizes.values()):
+            raise CommandError("Sizes must not be negative.")
+        scale = scale._replace(**sizes)
+
+        counts = generate_dataset(user, scale, seed=options["seed"])
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {summary} for {user.username}.")
+        )
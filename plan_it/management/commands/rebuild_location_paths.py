@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from plan_it.choices import bump_choices_version
+from plan_it.models import ActivityLocation, StorageLocation
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the materialized `path`, `depth` and `full_name` of every "
+        "storage and activity location from `parent_location`, e.g. after "
+        "`loaddata`."
+    )
+
+    def handle(self, *args, **options):
+        user_ids = set()
+        for model in [StorageLocation, ActivityLocation]:
+            written = model.rebuild_tree()
+            user_ids.update(model.objects.values_list("user_id", flat=True))
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuilt {written} {model._meta.verbose_name_plural}."
+                )
+            )
+        # The bulk update sends no signals, and the locations' labels in the
+        # cached form choices may have changed.
+        for user_id in user_ids:
+            bump_choices_version(user_id)
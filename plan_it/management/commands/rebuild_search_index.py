@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from plan_it.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the search documents of every item, storage location and "
+        "activity, e.g. after `loaddata`."
+    )
+
+    def handle(self, *args, **options):
+        written = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} documents."))
@@ -0,0 +1,86 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:24
+
+from django.db import migrations, models
+
+# Copies of `plan_it.models.PATH_STEP` and `NAME_SEPARATOR` as they stood when
+# this migration was written.
+PATH_STEP = 10
+NAME_SEPARATOR = " > "
+
+
+def build_location_tree(model):
+    nodes = {
+        node.pk: node for node in model.objects.only("pk", "name", "parent_location")
+    }
+    computed = {}
+
+    def compute(node, seen=()):
+        if node.pk in computed:
+            return computed[node.pk]
+        if node.pk in seen:
+            raise ValueError(f"Location {node.pk} is its own ancestor.")
+        segment = f"{node.pk:0{PATH_STEP}d}/"
+        parent = nodes.get(node.parent_location_id)
+        if parent is None:
+            result = (segment, 0, node.name)
+        else:
+            path, depth, full_name = compute(parent, seen + (node.pk,))
+            result = (path + segment, depth + 1, full_name + NAME_SEPARATOR + node.name)
+        computed[node.pk] = result
+        return result
+
+    for node in nodes.values():
+        node.path, node.depth, node.full_name = compute(node)
+    model.objects.bulk_update(
+        nodes.values(), ["path", "depth", "full_name"], batch_size=500
+    )
+
+
+def build_location_paths(apps, schema_editor):
+    for model_name in ["StorageLocation", "ActivityLocation"]:
+        build_location_tree(apps.get_model("plan_it", model_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plan_it", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activitylocation",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="activitylocation",
+            name="full_name",
+            field=models.CharField(default="", editable=False, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name="activitylocation",
+            name="path",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.AddField(
+            model_name="storagelocation",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="storagelocation",
+            name="full_name",
+            field=models.CharField(default="", editable=False, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name="storagelocation",
+            name="path",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(build_location_paths, migrations.RunPython.noop),
+    ]
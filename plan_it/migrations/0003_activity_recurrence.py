@@ -0,0 +1,39 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:30
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("plan_it", "0002_location_paths"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activity",
+            name="recurrence_interval",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                help_text="How many days or weeks pass between occurrences.",
+                validators=[django.core.validators.MinValueValidator(1)],
+            ),
+        ),
+        migrations.AddField(
+            model_name="activity",
+            name="recurrence_unit",
+            field=models.CharField(
+                choices=[("days", "Days"), ("weeks", "Weeks")],
+                default="days",
+                help_text="Whether a recurring activity repeats every few days or weeks.",
+                max_length=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(
+                fields=["user", "due_date"], name="plan_it_activity_due_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("plan_it", "0003_activity_recurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityCompletionSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name_snapshot", models.CharField(max_length=100)),
+                ("type_name_snapshot", models.CharField(max_length=50)),
+                (
+                    "month",
+                    models.DateField(
+                        help_text="The first day of the summarized month."
+                    ),
+                ),
+                ("completions", models.PositiveIntegerField(default=0)),
+                ("first_completed_at", models.DateTimeField()),
+                ("last_completed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Activity Completion Summary",
+                "verbose_name_plural": "Activity Completion Summaries",
+                "ordering": ["-month"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="activityinstance",
+            index=models.Index(
+                fields=["user", "completed_at"], name="plan_it_instance_done_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="activitycompletionsummary",
+            name="activity",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="completion_summaries",
+                to="plan_it.activity",
+            ),
+        ),
+        migrations.AddField(
+            model_name="activitycompletionsummary",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="activity_completion_summaries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="activitycompletionsummary",
+            index=models.Index(
+                fields=["user", "month"], name="plan_it_summary_month_idx"
+            ),
+        ),
+    ]
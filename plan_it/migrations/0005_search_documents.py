@@ -0,0 +1,165 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Copies of `plan_it.search.FTS_TABLE` and `SEARCH_CONFIG` as they stood when
+# this migration was written.
+FTS_TABLE = "plan_it_searchdocument_fts"
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_INDEX = "plan_it_search_vector_idx"
+DOCUMENTS = "plan_it_searchdocument"
+FTS_COLUMNS = "title, body, location_path"
+SQLITE_FTS = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({FTS_COLUMNS}, "
+    f"content='{DOCUMENTS}', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {DOCUMENTS} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS}) "
+    "VALUES (new.id, new.title, new.body, new.location_path); END",
+    f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {DOCUMENTS} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS}) "
+    "VALUES ('delete', old.id, old.title, old.body, old.location_path); END",
+    f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON {DOCUMENTS} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS}) "
+    "VALUES ('delete', old.id, old.title, old.body, old.location_path); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS}) "
+    "VALUES (new.id, new.title, new.body, new.location_path); END",
+]
+
+
+def search_vector():
+    # The same expression as `plan_it.search.search_vector`, so searches can
+    # use the index.
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("location_path", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def build_search_documents(apps):
+    SearchDocument = apps.get_model("plan_it", "SearchDocument")
+    sources = [
+        (
+            "item",
+            apps.get_model("plan_it", "Item").objects.values_list(
+                "pk", "user_id", "name", "description", "storage_location__full_name"
+            ),
+        ),
+        (
+            "storage_location",
+            apps.get_model("plan_it", "StorageLocation").objects.values_list(
+                "pk", "user_id", "name", "full_name"
+            ),
+        ),
+        (
+            "activity",
+            apps.get_model("plan_it", "Activity").objects.values_list(
+                "pk", "user_id", "name", "description", "activity_location__full_name"
+            ),
+        ),
+    ]
+    documents = []
+    for kind, rows in sources:
+        for pk, user_id, name, *body, location_path in rows:
+            documents.append(
+                SearchDocument(
+                    user_id=user_id,
+                    kind=kind,
+                    object_id=pk,
+                    title=name,
+                    body=(body[0] if body else None) or "",
+                    location_path=location_path or "",
+                )
+            )
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+
+        schema_editor.add_index(
+            apps.get_model("plan_it", "SearchDocument"),
+            GinIndex(search_vector(), name=SEARCH_VECTOR_INDEX),
+        )
+    elif vendor == "sqlite":
+        for statement in SQLITE_FTS:
+            schema_editor.execute(statement)
+    build_search_documents(apps)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_VECTOR_INDEX}")
+    elif vendor == "sqlite":
+        for action in ["insert", "delete", "update"]:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{action}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("plan_it", "0004_activity_completion_analytics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("item", "Item"),
+                            ("storage_location", "Storage Location"),
+                            ("activity", "Activity"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("title", models.CharField(max_length=100)),
+                ("body", models.TextField(blank=True, default="")),
+                (
+                    "location_path",
+                    models.CharField(blank=True, default="", max_length=1000),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="plan_it_search_documents",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Document",
+                "verbose_name_plural": "Search Documents",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="plan_it_search_document_unique"
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,15 +1,252 @@
 # plan_it/models.py
 
-from datetime import date
+from datetime import date, timedelta
 
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.urls import reverse
 from django.utils.timezone import now
 
 from django.conf import settings
 
+from .recurrence import (
+    UNIT_CHOICES,
+    UNIT_DAYS,
+    format_rrule,
+    next_occurrence,
+    parse_rrule,
+    step_days,
+)
 
-class StorageLocation(models.Model):
+
+class SyncedModel(models.Model):
+    """
+    An abstract base class for the models offline clients sync through
+    `plan_it.sync`, which sends the rows whose `updated` is newer than the
+    client's change token.
+
+    `save` keeps `updated` current, even when limited to `update_fields`.
+    Queryset `update`s and `bulk_update`s must set it themselves.
+    """
+
+    updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = set(kwargs["update_fields"]) | {"updated"}
+        super().save(*args, **kwargs)
+
+
+# Digits per primary key in a `LocationNode.path`.
+PATH_STEP = 10
+NAME_SEPARATOR = " > "
+
+
+def path_segment(pk):
+    return f"{pk:0{PATH_STEP}d}/"
+
+
+def rebuild_location_tree(model, queryset=None):
+    """
+    Recompute `path`, `depth` and `full_name` for every location of `model` in
+    `queryset` (all of them by default) from `parent_location`, in one read
+    and one bulk write. Returns the number of locations updated.
+    """
+    if queryset is None:
+        queryset = model.objects.all()
+    nodes = {node.pk: node for node in queryset.only("pk", "name", "parent_location")}
+    computed = {}
+
+    def compute(node, seen=()):
+        if node.pk in computed:
+            return computed[node.pk]
+        if node.pk in seen:
+            raise ValueError(f"Location {node.pk} is its own ancestor.")
+        parent = nodes.get(node.parent_location_id)
+        if parent is None:
+            result = (path_segment(node.pk), 0, node.name)
+        else:
+            path, depth, full_name = compute(parent, seen + (node.pk,))
+            result = (
+                path + path_segment(node.pk),
+                depth + 1,
+                full_name + NAME_SEPARATOR + node.name,
+            )
+        computed[node.pk] = result
+        return result
+
+    moment = now()
+    for node in nodes.values():
+        node.path, node.depth, node.full_name = compute(node)
+        node.updated = moment
+    model.objects.bulk_update(
+        nodes.values(), ["path", "depth", "full_name", "updated"], batch_size=500
+    )
+    return len(nodes)
+
+
+def rewrite_descendants(model, old, new):
+    """
+    Rewrite every descendant of the location of `model` whose `(path, depth,
+    full_name)` were `old` as if that location's were `new`, in one query.
+    """
+    old_path, old_depth, old_full_name = old
+    new_path, new_depth, new_full_name = new
+    return (
+        model.objects.filter(path__startswith=old_path)
+        .exclude(path=old_path)
+        .update(
+            path=Concat(
+                Value(new_path),
+                Substr("path", len(old_path) + 1),
+                output_field=models.CharField(),
+            ),
+            depth=F("depth") + (new_depth - old_depth),
+            full_name=Concat(
+                Value(new_full_name),
+                Substr("full_name", len(old_full_name) + 1),
+                output_field=models.CharField(),
+            ),
+            updated=now(),
+        )
+    )
+
+
+class LocationNode(models.Model):
+    """
+    An abstract base class for a location in a per-user tree, indexed by a
+    materialized path.
+
+    `path` holds the zero-padded primary keys from the root down to this
+    location, so ancestors are read from the path itself and a subtree is a
+    single indexed `path__startswith` query. `depth` and `full_name` ("Home >
+    Garage > Shelf") are stored alongside it. All three are kept up to date by
+    `save`, which also rewrites the subtree in one query when a location is
+    moved or renamed. Queryset `update`s and `loaddata` bypass `save`; run
+    `rebuild_tree` (or `manage.py rebuild_location_paths`) after those.
+    """
+
+    path = models.CharField(max_length=255, db_index=True, editable=False, default="")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    full_name = models.CharField(max_length=1000, editable=False, default="")
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.full_name or self.name
+
+    def ancestor_ids(self):
+        """
+        Return the primary keys of this location's ancestors, root first.
+        """
+        step = PATH_STEP + 1
+        return [
+            int(self.path[start : start + PATH_STEP])  # noqa: E203
+            for start in range(0, len(self.path) - step, step)
+        ]
+
+    def ancestors(self):
+        return type(self).objects.filter(pk__in=self.ancestor_ids()).order_by("path")
+
+    def descendants(self):
+        return (
+            type(self)
+            .objects.filter(path__startswith=self.path)
+            .exclude(pk=self.pk)
+            .order_by("path")
+        )
+
+    def subtree(self):
+        """
+        This location and all of its descendants, each parent before its
+        children.
+        """
+        return type(self).objects.filter(path__startswith=self.path).order_by("path")
+
+    def is_descendant_of(self, other):
+        return self.pk != other.pk and self.path.startswith(other.path)
+
+    def clean(self):
+        super().clean()
+        parent = self.parent_location
+        if self.pk and parent is not None and parent.path.startswith(self.path):
+            raise ValidationError(
+                {"parent_location": "A location can't be moved inside itself."}
+            )
+
+    def _tree_fields(self):
+        """
+        Return the `(path, depth, full_name)` this location should have, from
+        the parent's current row rather than a possibly stale instance.
+        """
+        segment = path_segment(self.pk)
+        if self.parent_location_id is None:
+            return segment, 0, self.name
+        parent_path, parent_depth, parent_full_name = (
+            type(self)
+            .objects.values_list("path", "depth", "full_name")
+            .get(pk=self.parent_location_id)
+        )
+        if parent_path.startswith(self.path) and self.path:
+            raise ValueError(f"{self} can't be moved inside itself.")
+        return (
+            parent_path + segment,
+            parent_depth + 1,
+            parent_full_name + NAME_SEPARATOR + self.name,
+        )
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                self.path, self.depth, self.full_name = self._tree_fields()
+                # Saved again, rather than updated, so that `post_save`
+                # receivers see the location with its place in the tree.
+                super().save(
+                    using=kwargs.get("using"),
+                    update_fields=["path", "depth", "full_name"],
+                )
+                return
+
+            old_path, old_depth, old_full_name = (
+                type(self)
+                .objects.values_list("path", "depth", "full_name")
+                .get(pk=self.pk)
+            )
+            self.path = old_path
+            self.path, self.depth, self.full_name = self._tree_fields()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = set(kwargs["update_fields"]) | {
+                    "path",
+                    "depth",
+                    "full_name",
+                }
+            # Descendants move first, so `post_save` receivers see the whole
+            # subtree in its new place.
+            if old_path and (self.path, self.full_name) != (old_path, old_full_name):
+                self._move_descendants(old_path, old_depth, old_full_name)
+            super().save(*args, **kwargs)
+
+    def _move_descendants(self, old_path, old_depth, old_full_name):
+        rewrite_descendants(
+            type(self),
+            (old_path, old_depth, old_full_name),
+            (self.path, self.depth, self.full_name),
+        )
+
+    @classmethod
+    def rebuild_tree(cls, queryset=None):
+        return rebuild_location_tree(cls, queryset)
+
+
+class StorageLocation(SyncedModel, LocationNode):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -27,15 +264,8 @@ class StorageLocation(models.Model):
     def get_absolute_url(self):
         return reverse("plan_it:storage_location_list")
 
-    def __str__(self):
-        return (
-            self.name
-            if not self.parent_location
-            else f"{self.parent_location} > {self.name}"
-        )
-
 
-class ActivityLocation(models.Model):
+class ActivityLocation(SyncedModel, LocationNode):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -53,24 +283,8 @@ class ActivityLocation(models.Model):
     def get_absolute_url(self):
         return reverse("plan_it:activity_location_list")
 
-    def __str__(self):
-        return (
-            self.name
-            if not self.parent_location
-            else f"{self.parent_location} > {self.name}"
-        )
-
-    @property
-    def depth(self):
-        level = 0
-        current = self.parent_location
-        while current:
-            level += 1
-            current = current.parent_location
-        return level
-
 
-class Item(models.Model):
+class Item(SyncedModel):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="items"
     )
@@ -85,7 +299,7 @@ class Item(models.Model):
         return self.name
 
 
-class ActivityType(models.Model):
+class ActivityType(SyncedModel):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -100,7 +314,7 @@ class ActivityType(models.Model):
         return self.name
 
 
-class Activity(models.Model):
+class Activity(SyncedModel):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -117,18 +331,50 @@ class Activity(models.Model):
     description = models.TextField(blank=True, null=True)
     due_date = models.DateField(null=True, blank=True)
     is_recurring = models.BooleanField(default=False)
+    recurrence_unit = models.CharField(
+        max_length=10,
+        choices=UNIT_CHOICES,
+        default=UNIT_DAYS,
+        help_text="Whether a recurring activity repeats every few days or weeks.",
+    )
+    recurrence_interval = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        help_text="How many days or weeks pass between occurrences.",
+    )
     last_completed = models.DateField(null=True, blank=True)
 
     def get_absolute_url(self):
         return reverse("plan_it:activity_list")
 
+    @property
+    def rrule(self):
+        """
+        The recurrence rule as an RRULE, e.g. "FREQ=WEEKLY;INTERVAL=2".
+        """
+        return format_rrule(self.recurrence_unit, self.recurrence_interval)
+
+    @rrule.setter
+    def rrule(self, value):
+        self.recurrence_unit, self.recurrence_interval = parse_rrule(value)
+
+    def next_due_date(self, after):
+        """
+        Return the first occurrence of this recurring activity after it was
+        completed on `after`, and after its current due date.
+        """
+        step = step_days(self.recurrence_unit, self.recurrence_interval)
+        start = self.due_date or after
+        return next_occurrence(start, step, max(after, start) + timedelta(days=1))
+
     def __str__(self):
         return f"{self.name}[{self.activity_location}]"
 
-    def due_status(self):
+    def due_status(self, today=None):
         if not self.due_date:
             return "none"
-        today = date.today()
+        if today is None:
+            today = date.today()
         if self.due_date < today:
             return "overdue"
         elif self.due_date == today:
@@ -136,10 +382,13 @@ class Activity(models.Model):
         else:
             return "upcoming"
 
-    def record_completion(self, user):
-        from .models import ActivityInstance  # avoid circular import
-
-        instance = ActivityInstance.objects.create(
+    def completion_snapshot(self, user, completed_at=None):
+        """
+        Return an unsaved `ActivityInstance` recording a completion of this
+        activity. Select `type`, `target_item` and `activity_location` with
+        the activity to build it without further queries.
+        """
+        return ActivityInstance(
             user=user,
             activity=self,
             name_snapshot=self.name,
@@ -148,14 +397,28 @@ class Activity(models.Model):
             activity_location_name_snapshot=(
                 self.activity_location.name if self.activity_location else ""
             ),
+            completed_at=completed_at or now(),
         )
+
+    def record_completion(self, user):
+        instance = self.completion_snapshot(user)
+        instance.save()
         self.last_completed = instance.completed_at.date()
-        self.save(update_fields=["last_completed"])
+        update_fields = ["last_completed"]
+        if self.is_recurring:
+            self.due_date = self.next_due_date(self.last_completed)
+            update_fields.append("due_date")
+        self.save(update_fields=update_fields)
         return instance
 
     class Meta:
         verbose_name = "Activity"
         verbose_name_plural = "Activities"
+        indexes = [
+            # The dashboard's overdue, today and upcoming buckets are ranges of
+            # `due_date` within one user's activities.
+            models.Index(fields=["user", "due_date"], name="plan_it_activity_due_idx"),
+        ]
 
 
 class ActivityInstance(models.Model):
@@ -185,3 +448,113 @@ class ActivityInstance(models.Model):
         verbose_name = "Activity Instance"
         verbose_name_plural = "Activity Instances"
         ordering = ["-completed_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "completed_at"], name="plan_it_instance_done_idx"
+            ),
+        ]
+
+
+class ActivityCompletionSummary(models.Model):
+    """
+    The completions of one activity in one month, kept in place of the
+    `ActivityInstance`s that `manage.py archive_activity_instances` removed.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="activity_completion_summaries",
+    )
+    activity = models.ForeignKey(
+        Activity,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="completion_summaries",
+    )
+    name_snapshot = models.CharField(max_length=100)
+    type_name_snapshot = models.CharField(max_length=50)
+    month = models.DateField(help_text="The first day of the summarized month.")
+    completions = models.PositiveIntegerField(default=0)
+    first_completed_at = models.DateTimeField()
+    last_completed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name_snapshot} {self.month:%Y-%m}: {self.completions}"
+
+    class Meta:
+        verbose_name = "Activity Completion Summary"
+        verbose_name_plural = "Activity Completion Summaries"
+        ordering = ["-month"]
+        indexes = [
+            models.Index(fields=["user", "month"], name="plan_it_summary_month_idx"),
+        ]
+
+
+SEARCH_KIND_ITEM = "item"
+SEARCH_KIND_STORAGE_LOCATION = "storage_location"
+SEARCH_KIND_ACTIVITY = "activity"
+SEARCH_KIND_CHOICES = [
+    (SEARCH_KIND_ITEM, "Item"),
+    (SEARCH_KIND_STORAGE_LOCATION, "Storage Location"),
+    (SEARCH_KIND_ACTIVITY, "Activity"),
+]
+
+
+class SearchDocument(models.Model):
+    """
+    The searchable text of one item, storage location or activity, with the
+    full path of the location it lives in, kept up to date by the receivers
+    in `plan_it.signals`. See `plan_it.search` for how it is indexed.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="plan_it_search_documents",
+    )
+    kind = models.CharField(max_length=20, choices=SEARCH_KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=100)
+    body = models.TextField(blank=True, default="")
+    location_path = models.CharField(max_length=1000, blank=True, default="")
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="plan_it_search_document_unique"
+            ),
+        ]
+
+
+class SyncTombstone(models.Model):
+    """
+    A record that a synced object was deleted, so that `plan_it.sync` can tell
+    offline clients to delete their copy. Kept for `sync.tombstone_retention()`,
+    `PLAN_IT_SYNC_TOMBSTONE_DAYS` days.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="plan_it_sync_tombstones",
+    )
+    model_name = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    deleted = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"{self.model_name} {self.object_id} deleted {self.deleted:%Y-%m-%d}"
+
+    class Meta:
+        verbose_name = "Sync Tombstone"
+        verbose_name_plural = "Sync Tombstones"
+        indexes = [
+            models.Index(fields=["user", "deleted"], name="plan_it_tombstone_idx"),
+        ]
@@ -0,0 +1,158 @@
+# plan_it/recurrence.py
+
+"""
+Recurrence rules for `plan_it.Activity`.
+
+A rule is a unit (days or weeks) and an interval: daily, weekly, every N days
+and every N weeks. The same rules can be written as the `FREQ` / `INTERVAL`
+subset of an iCalendar RRULE, e.g. "FREQ=WEEKLY;INTERVAL=2".
+
+`roll_over_recurring_activities` moves every recurring activity whose due date
+has passed to its next occurrence with one `UPDATE` per rule, computing the
+new date in the database instead of saving each row.
+"""
+
+from datetime import date, timedelta
+
+from django.db import NotSupportedError
+from django.db.models import DateField, Func
+from django.utils.timezone import now
+
+UNIT_DAYS = "days"
+UNIT_WEEKS = "weeks"
+UNIT_CHOICES = [
+    (UNIT_DAYS, "Days"),
+    (UNIT_WEEKS, "Weeks"),
+]
+UNIT_LENGTHS = {UNIT_DAYS: 1, UNIT_WEEKS: 7}
+
+RRULE_FREQUENCIES = {"DAILY": UNIT_DAYS, "WEEKLY": UNIT_WEEKS}
+
+
+def step_days(unit, interval):
+    """
+    Return the number of days between occurrences of a rule.
+    """
+    return UNIT_LENGTHS[unit] * interval
+
+
+def next_occurrence(due_date, step, on_or_after):
+    """
+    Return the first date on or after `on_or_after` that is a whole number of
+    `step` days after `due_date`, or `due_date` itself if it is not earlier.
+    """
+    if due_date >= on_or_after:
+        return due_date
+    steps = -(-(on_or_after - due_date).days // step)
+    return due_date + timedelta(days=steps * step)
+
+
+def parse_rrule(value):
+    """
+    Return the `(unit, interval)` of an RRULE such as "FREQ=DAILY;INTERVAL=3".
+
+    Only `FREQ` (DAILY or WEEKLY) and `INTERVAL` are supported; anything else
+    raises `ValueError`.
+    """
+    parts = {}
+    for part in value.strip().removeprefix("RRULE:").split(";"):
+        if not part:
+            continue
+        key, separator, part_value = part.partition("=")
+        if not separator:
+            raise ValueError(f"Malformed RRULE part {part!r}.")
+        parts[key.strip().upper()] = part_value.strip().upper()
+
+    unsupported = set(parts) - {"FREQ", "INTERVAL"}
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(unsupported))}.")
+    frequency = parts.get("FREQ")
+    if frequency not in RRULE_FREQUENCIES:
+        raise ValueError(f"Unsupported RRULE frequency {frequency!r}.")
+    try:
+        interval = int(parts.get("INTERVAL", "1"))
+    except ValueError:
+        raise ValueError(f"Invalid RRULE interval {parts['INTERVAL']!r}.")
+    if interval < 1:
+        raise ValueError("The RRULE interval must be at least 1.")
+    return RRULE_FREQUENCIES[frequency], interval
+
+
+def format_rrule(unit, interval):
+    frequency = {
+        rule_unit: frequency for frequency, rule_unit in RRULE_FREQUENCIES.items()
+    }[unit]
+    if interval == 1:
+        return f"FREQ={frequency}"
+    return f"FREQ={frequency};INTERVAL={interval}"
+
+
+class NextOccurrence(Func):
+    """
+    The database-side `next_occurrence` of the date in `expression`, on or
+    after `on_or_after`, for a rule of `step` days.
+    """
+
+    output_field = DateField()
+
+    def __init__(self, expression, on_or_after, step, **extra):
+        self.on_or_after = on_or_after
+        self.step = step
+        super().__init__(expression, **extra)
+
+    def _compile(self, compiler):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return sql, list(params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = self._compile(compiler)
+        days = (
+            f"(CAST(julianday(%s) - julianday({sql}) AS INTEGER) + %s - 1) / %s * %s"
+        )
+        return (
+            f"date({sql}, '+' || ({days}) || ' days')",
+            params
+            + [self.on_or_after.isoformat()]
+            + params
+            + [self.step, self.step, self.step],
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = self._compile(compiler)
+        return (
+            f"({sql} + ((%s::date - {sql}) + %s - 1) / %s * %s)",
+            params + [self.on_or_after] + params + [self.step, self.step, self.step],
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f"NextOccurrence is not implemented for {connection.vendor}."
+        )
+
+
+def roll_over_recurring_activities(today=None):
+    """
+    Move every recurring activity due before `today` to its next occurrence
+    on or after `today`, with one `UPDATE` per rule. Returns the number of
+    activities moved.
+    """
+    from .models import Activity
+
+    if today is None:
+        today = date.today()
+    overdue = Activity.objects.filter(is_recurring=True, due_date__lt=today)
+    rules = (
+        overdue.order_by()
+        .values_list("recurrence_unit", "recurrence_interval")
+        .distinct()
+    )
+    moved = 0
+    moment = now()
+    for unit, interval in list(rules):
+        moved += overdue.filter(
+            recurrence_unit=unit, recurrence_interval=interval
+        ).update(
+            due_date=NextOccurrence("due_date", today, step_days(unit, interval)),
+            updated=moment,
+        )
+    return moved
@@ -0,0 +1,262 @@
+# plan_it/search.py
+
+"""
+Full-text search over a user's items, storage locations and activities.
+
+Each of them has a `SearchDocument` holding its name, description and the full
+path of the location it lives in. The receivers in `plan_it.signals` keep the
+documents up to date. The documents are indexed by whichever database is in
+use:
+
+- On Postgres, by a GIN index over `search_vector()`, and ranked with
+  `ts_rank`.
+- On SQLite, by the FTS5 table `FTS_TABLE`, an external-content index over the
+  documents that triggers keep in step with them, and ranked with `bm25`.
+
+Either way a search is one indexed query. Every search term matches as a
+prefix, so "dril" finds "Drill" and "drills".
+"""
+
+import re
+from collections import namedtuple
+
+from django.db import NotSupportedError, connections
+from django.db.models import OuterRef, Subquery
+from django.urls import reverse
+
+from .models import (
+    SEARCH_KIND_ACTIVITY,
+    SEARCH_KIND_ITEM,
+    SEARCH_KIND_STORAGE_LOCATION,
+    Activity,
+    ActivityLocation,
+    Item,
+    SearchDocument,
+    StorageLocation,
+)
+
+FTS_TABLE = "plan_it_searchdocument_fts"
+SEARCH_CONFIG = "english"
+# How much more a match in the title counts than one in the body, and in the
+# body than in the location path, for `bm25`. Postgres uses weights A, B, C.
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+SEARCH_KINDS = {
+    Item: SEARCH_KIND_ITEM,
+    StorageLocation: SEARCH_KIND_STORAGE_LOCATION,
+    Activity: SEARCH_KIND_ACTIVITY,
+}
+EDIT_URLS = {
+    SEARCH_KIND_ITEM: "plan_it:item_edit",
+    SEARCH_KIND_STORAGE_LOCATION: "plan_it:storage_location_edit",
+    SEARCH_KIND_ACTIVITY: "plan_it:activity_edit",
+}
+# The documents whose location path comes from each kind of location, as
+# `(kind, model, full name lookup, path lookup)`.
+LOCATION_DOCUMENTS = {
+    StorageLocation: [
+        (SEARCH_KIND_STORAGE_LOCATION, StorageLocation, "full_name", "path"),
+        (
+            SEARCH_KIND_ITEM,
+            Item,
+            "storage_location__full_name",
+            "storage_location__path",
+        ),
+    ],
+    ActivityLocation: [
+        (
+            SEARCH_KIND_ACTIVITY,
+            Activity,
+            "activity_location__full_name",
+            "activity_location__path",
+        ),
+    ],
+}
+
+SearchResult = namedtuple(
+    "SearchResult", ["kind", "pk", "title", "location_path", "rank", "url"]
+)
+
+
+def search_vector():
+    """
+    Return the Postgres `tsvector` expression the documents are indexed by.
+    """
+    # Needs psycopg2, which is only installed where Postgres is used.
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("location_path", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def document_fields(instance):
+    """
+    Return the indexed fields of the `SearchDocument` for `instance`.
+    """
+    if isinstance(instance, Item):
+        location_path = instance.storage_location.full_name
+    elif isinstance(instance, StorageLocation):
+        location_path = instance.full_name
+    else:
+        location_path = (
+            instance.activity_location.full_name
+            if instance.activity_location_id
+            else ""
+        )
+    return {
+        "title": instance.name,
+        "body": getattr(instance, "description", None) or "",
+        "location_path": location_path,
+    }
+
+
+def index_object(instance):
+    """
+    Create or update the `SearchDocument` of an item, storage location or
+    activity.
+    """
+    SearchDocument.objects.update_or_create(
+        kind=SEARCH_KINDS[type(instance)],
+        object_id=instance.pk,
+        defaults={"user_id": instance.user_id, **document_fields(instance)},
+    )
+
+
+def unindex_object(instance):
+    SearchDocument.objects.filter(
+        kind=SEARCH_KINDS[type(instance)], object_id=instance.pk
+    ).delete()
+
+
+def refresh_location_paths(location):
+    """
+    Rewrite the location path of every document in `location`'s subtree, one
+    query per kind of document. Moving or renaming a location rewrites its
+    descendants with a queryset `update`, which sends no signals.
+    """
+    for kind, model, full_name, path in LOCATION_DOCUMENTS[type(location)]:
+        in_subtree = model.objects.filter(**{f"{path}__startswith": location.path})
+        SearchDocument.objects.filter(
+            kind=kind, object_id__in=in_subtree.values("pk")
+        ).update(
+            location_path=Subquery(
+                model.objects.filter(pk=OuterRef("object_id")).values(full_name)[:1]
+            )
+        )
+
+
+def rebuild_search_index(user=None):
+    """
+    Replace every `SearchDocument`, or only `user`'s, with one built from the
+    current items, storage locations and activities, in one read per model
+    and batched writes. Returns the number of documents written.
+    """
+
+    def objects(model):
+        queryset = model.objects.all()
+        return queryset if user is None else queryset.filter(user=user)
+
+    sources = [
+        (
+            SEARCH_KIND_ITEM,
+            objects(Item).values_list(
+                "pk", "user_id", "name", "description", "storage_location__full_name"
+            ),
+        ),
+        (
+            SEARCH_KIND_STORAGE_LOCATION,
+            objects(StorageLocation).values_list(
+                "pk", "user_id", "name", "full_name"
+            ),
+        ),
+        (
+            SEARCH_KIND_ACTIVITY,
+            objects(Activity).values_list(
+                "pk", "user_id", "name", "description", "activity_location__full_name"
+            ),
+        ),
+    ]
+    documents = []
+    for kind, rows in sources:
+        for row in rows:
+            pk, user_id, name, *body, location_path = row
+            documents.append(
+                SearchDocument(
+                    user_id=user_id,
+                    kind=kind,
+                    object_id=pk,
+                    title=name,
+                    body=(body[0] if body else None) or "",
+                    location_path=location_path or "",
+                )
+            )
+    old = SearchDocument.objects.all()
+    (old if user is None else old.filter(user=user)).delete()
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+    return len(documents)
+
+
+def search(user, query, limit=DEFAULT_LIMIT):
+    """
+    Return up to `limit` `SearchResult`s for `user`'s documents matching
+    every word of `query`, most relevant first.
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return []
+    vendor = connections[SearchDocument.objects.db].vendor
+    if vendor == "postgresql":
+        documents = _search_postgresql(user, terms, limit)
+    elif vendor == "sqlite":
+        documents = _search_sqlite(user, terms, limit)
+    else:
+        raise NotSupportedError(f"plan_it search is not implemented for {vendor}.")
+    return [
+        SearchResult(
+            kind=document.kind,
+            pk=document.object_id,
+            title=document.title,
+            location_path=document.location_path,
+            rank=document.rank,
+            url=reverse(EDIT_URLS[document.kind], args=[document.object_id]),
+        )
+        for document in documents
+    ]
+
+
+def _search_postgresql(user, terms, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    query = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+    vector = search_vector()
+    return (
+        SearchDocument.objects.filter(user=user)
+        .annotate(document=vector, rank=SearchRank(vector, query))
+        .filter(document=query)
+        .order_by("-rank")[:limit]
+    )
+
+
+def _search_sqlite(user, terms, limit):
+    # Quoted, so words such as "and" or "near" aren't read as FTS5 operators.
+    match = " ".join(f'"{term}"*' for term in terms)
+    documents = SearchDocument._meta.db_table
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    return SearchDocument.objects.raw(
+        f"SELECT document.*, -bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} "
+        f"JOIN {documents} AS document ON document.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND document.user_id = %s "
+        "ORDER BY rank DESC LIMIT %s",
+        [match, user.pk, limit],
+    )
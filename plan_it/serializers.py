@@ -0,0 +1,80 @@
+# plan_it/serializers.py
+
+from rest_framework import serializers
+
+from .models import Activity, ActivityLocation, ActivityType, Item, StorageLocation
+
+
+class UserOwnedSerializer(serializers.ModelSerializer):
+    """
+    A serializer whose related fields only accept the objects of the user in
+    its context, as `user`.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        user = self.context.get("user")
+        for field in fields.values():
+            if isinstance(field, serializers.PrimaryKeyRelatedField) and not (
+                field.read_only
+            ):
+                field.queryset = field.queryset.filter(user=user)
+        return fields
+
+
+class LocationSerializer(UserOwnedSerializer):
+    class Meta:
+        fields = ["id", "name", "parent_location", "depth", "full_name", "updated"]
+        read_only_fields = ["depth", "full_name", "updated"]
+
+    def validate_parent_location(self, value):
+        if self.instance and value and value.path.startswith(self.instance.path):
+            raise serializers.ValidationError(
+                "A location can't be moved inside itself."
+            )
+        return value
+
+
+class StorageLocationSerializer(LocationSerializer):
+    class Meta(LocationSerializer.Meta):
+        model = StorageLocation
+
+
+class ActivityLocationSerializer(LocationSerializer):
+    class Meta(LocationSerializer.Meta):
+        model = ActivityLocation
+
+
+class ItemSerializer(UserOwnedSerializer):
+    class Meta:
+        model = Item
+        fields = ["id", "name", "storage_location", "description", "updated"]
+        read_only_fields = ["updated"]
+
+
+class ActivityTypeSerializer(UserOwnedSerializer):
+    class Meta:
+        model = ActivityType
+        fields = ["id", "name", "updated"]
+        read_only_fields = ["updated"]
+
+
+class ActivitySerializer(UserOwnedSerializer):
+    class Meta:
+        model = Activity
+        fields = [
+            "id",
+            "name",
+            "type",
+            "target_item",
+            "activity_location",
+            "description",
+            "due_date",
+            "is_recurring",
+            "recurrence_unit",
+            "recurrence_interval",
+            "last_completed",
+            "updated",
+        ]
+        # Completions are recorded with a `complete` mutation.
+        read_only_fields = ["last_completed", "updated"]
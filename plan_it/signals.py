@@ -0,0 +1,106 @@
+# plan_it/signals.py
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from plan_it.choices import bump_choices_version
+from plan_it.models import (
+    Activity,
+    ActivityLocation,
+    ActivityType,
+    Item,
+    StorageLocation,
+    SyncTombstone,
+)
+from plan_it.search import index_object, refresh_location_paths, unindex_object
+from plan_it.sync import SYNC_NAMES
+
+# The fields a `SearchDocument` is built from. Saves limited to other fields,
+# such as `Activity.record_completion`, leave the document alone.
+INDEXED_FIELDS = {
+    Item: {"name", "description", "storage_location"},
+    StorageLocation: {"name", "full_name"},
+    Activity: {"name", "description", "activity_location"},
+}
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_save, sender=StorageLocation)
+@receiver(post_save, sender=Activity)
+def index_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Keep the `SearchDocument` of a saved item, storage location or activity
+    up to date.
+    """
+    if raw:
+        return
+    if update_fields is not None and not INDEXED_FIELDS[sender] & update_fields:
+        return
+    if isinstance(instance, StorageLocation) and not instance.path:
+        # The first save of a new location, before it has a place in the tree;
+        # `LocationNode.save` saves it again with one.
+        return
+    index_object(instance)
+
+
+@receiver(post_save, sender=StorageLocation)
+@receiver(post_save, sender=ActivityLocation)
+def refresh_paths_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Rewrite the location paths of the documents under a moved or renamed
+    location.
+    """
+    if raw or created or not instance.path:
+        return
+    refresh_location_paths(instance)
+
+
+@receiver(post_delete, sender=Item)
+@receiver(post_delete, sender=StorageLocation)
+@receiver(post_delete, sender=Activity)
+def unindex_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Delete the `SearchDocument` of a deleted item, storage location or
+    activity.
+
+    Skipped when it is removed because its user is being deleted, since the
+    user's documents are deleted along with it.
+    """
+    if isinstance(origin, get_user_model()):
+        return
+    unindex_object(instance)
+
+
+@receiver(post_save, sender=ActivityType)
+@receiver(post_save, sender=Item)
+@receiver(post_save, sender=StorageLocation)
+@receiver(post_save, sender=ActivityLocation)
+@receiver(post_delete, sender=ActivityType)
+@receiver(post_delete, sender=Item)
+@receiver(post_delete, sender=StorageLocation)
+@receiver(post_delete, sender=ActivityLocation)
+def invalidate_cached_choices(sender, instance, **kwargs):
+    """
+    Invalidate the owner's cached form choices when one of them is written.
+    """
+    bump_choices_version(instance.user_id)
+
+
+@receiver(post_delete, sender=StorageLocation)
+@receiver(post_delete, sender=ActivityLocation)
+@receiver(post_delete, sender=Item)
+@receiver(post_delete, sender=ActivityType)
+@receiver(post_delete, sender=Activity)
+def record_sync_tombstone(sender, instance, origin=None, **kwargs):
+    """
+    Record the deletion of a synced object, for offline clients to catch up
+    on.
+
+    Skipped when it is removed because its user is being deleted.
+    """
+    if isinstance(origin, get_user_model()):
+        return
+    SyncTombstone.objects.create(
+        user_id=instance.user_id, model_name=SYNC_NAMES[sender], object_id=instance.pk
+    )
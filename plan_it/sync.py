@@ -0,0 +1,255 @@
+# plan_it/sync.py
+
+"""
+Delta sync of a user's plan_it data for offline clients.
+
+A client keeps the opaque change token of its last sync. Given it back,
+`pull_changes` returns only the rows whose `updated` is newer, and the IDs of
+the rows deleted since, from the `SyncTombstone`s. That takes one query per
+model and one for the tombstones. Without a token, or with one older than the
+tombstones are kept, the client gets everything and must replace its copy.
+
+Changes made offline are sent as a batch of mutations for `apply_mutations`,
+each one of:
+
+    {"id": "m1", "model": "items", "op": "create", "client_id": "tmp-1",
+     "data": {...}}
+    {"id": "m2", "model": "items", "op": "update", "pk": 7,
+     "updated": "<the `updated` the client last saw>", "data": {...}}
+    {"id": "m3", "model": "items", "op": "delete", "pk": 7, "updated": "..."}
+    {"id": "m4", "model": "activities", "op": "complete", "pk": 3,
+     "completed_at": "2025-06-11T08:30:00+00:00"}
+
+A related field in `data` may name an object created earlier in the batch as
+`{"client_id": "tmp-1"}`. Conflicts are resolved in the server's favour: an
+update or delete of a row that changed since the client's `updated` is not
+applied, and the result carries the server's copy instead. Completions are
+never in conflict, so a completion recorded offline is never lost, but one
+older than the activity's `last_completed` leaves its dates alone.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .completion import complete_activities
+from .models import (
+    Activity,
+    ActivityLocation,
+    ActivityType,
+    Item,
+    StorageLocation,
+    SyncTombstone,
+)
+from .serializers import (
+    ActivitySerializer,
+    ActivityLocationSerializer,
+    ActivityTypeSerializer,
+    ItemSerializer,
+    StorageLocationSerializer,
+)
+
+# In the order a client should apply them, parents before what refers to them.
+SYNCED_MODELS = {
+    "storage_locations": (StorageLocation, StorageLocationSerializer),
+    "activity_locations": (ActivityLocation, ActivityLocationSerializer),
+    "items": (Item, ItemSerializer),
+    "activity_types": (ActivityType, ActivityTypeSerializer),
+    "activities": (Activity, ActivitySerializer),
+}
+SYNC_NAMES = {model: name for name, (model, _) in SYNCED_MODELS.items()}
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+OP_COMPLETE = "complete"
+OPS = [OP_CREATE, OP_UPDATE, OP_DELETE, OP_COMPLETE]
+
+STATUS_APPLIED = "applied"
+STATUS_CONFLICT = "conflict"
+STATUS_ERROR = "error"
+
+MAX_MUTATIONS = 200
+TOKEN_SALT = "plan_it.sync"
+# Rows are sent again if they changed shortly before the client's token, in
+# case their transaction committed after that sync read.
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def tombstone_retention():
+    return timedelta(days=settings.PLAN_IT_SYNC_TOMBSTONE_DAYS)
+
+
+def make_token(moment):
+    return signing.dumps(moment.isoformat(), salt=TOKEN_SALT)
+
+
+def read_token(token):
+    """
+    Return the moment `token` was issued. Raises `ValueError` for a token
+    this server didn't issue.
+    """
+    try:
+        return parse_datetime(signing.loads(token, salt=TOKEN_SALT))
+    except (signing.BadSignature, TypeError) as error:
+        raise ValueError("Invalid sync token.") from error
+
+
+def pull_changes(user, token=None):
+    """
+    Return the changes to `user`'s data since `token` was issued, with the
+    token for the next sync.
+
+    The result looks like:
+
+        {
+            "token": "...",
+            "reset": False,
+            "changes": {"items": [{...}, ...], ...},
+            "deleted": {"items": [12, 14], ...},
+        }
+
+    `reset` is true when the client's copy must be replaced by `changes`.
+    """
+    issued = timezone.now()
+    since = None
+    if token:
+        since = read_token(token) - SYNC_OVERLAP
+        if since < issued - tombstone_retention():
+            since = None
+
+    changes = {}
+    deleted = {name: [] for name in SYNCED_MODELS}
+    for name, (model, serializer_class) in SYNCED_MODELS.items():
+        rows = model.objects.filter(user=user)
+        if since is not None:
+            rows = rows.filter(updated__gte=since)
+        changes[name] = serializer_class(rows.order_by("updated", "pk"), many=True).data
+    if since is not None:
+        for model_name, object_id in SyncTombstone.objects.filter(
+            user=user, deleted__gte=since
+        ).values_list("model_name", "object_id"):
+            deleted[model_name].append(object_id)
+    return {
+        "token": make_token(issued),
+        "reset": since is None,
+        "changes": changes,
+        "deleted": deleted,
+    }
+
+
+def apply_mutations(user, mutations):
+    """
+    Apply a batch of offline `mutations` for `user`, in order, and return a
+    result for each.
+
+    Each mutation is applied in its own savepoint, so one that fails or is in
+    conflict doesn't stop the rest.
+    """
+    created = {}
+    results = []
+    for mutation in mutations:
+        try:
+            with transaction.atomic():
+                result = _apply_mutation(user, mutation, created)
+        except ValidationError as error:
+            result = {"status": STATUS_ERROR, "errors": error.detail}
+        except (KeyError, TypeError, ValueError) as error:
+            result = {"status": STATUS_ERROR, "errors": str(error)}
+        result["id"] = mutation.get("id") if isinstance(mutation, dict) else None
+        results.append(result)
+    return results
+
+
+def _resolve_client_ids(data, created):
+    """
+    Replace `{"client_id": ...}` values in `data` with the primary keys of the
+    objects created under those IDs earlier in the batch.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("`data` must be an object.")
+    return {
+        key: (
+            created[value["client_id"]]
+            if isinstance(value, dict) and "client_id" in value
+            else value
+        )
+        for key, value in data.items()
+    }
+
+
+def _parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(f"Invalid date-time: {value!r}.")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _apply_mutation(user, mutation, created):
+    if mutation["model"] not in SYNCED_MODELS:
+        raise ValueError(f"Unknown model: {mutation['model']!r}.")
+    model, serializer_class = SYNCED_MODELS[mutation["model"]]
+    context = {"user": user}
+    op = mutation["op"]
+    if op not in OPS:
+        raise ValueError(f"Unknown op: {op!r}.")
+
+    if op == OP_CREATE:
+        serializer = serializer_class(
+            data=_resolve_client_ids(mutation["data"], created), context=context
+        )
+        serializer.is_valid(raise_exception=True)
+        obj = serializer.save(user=user)
+        if mutation.get("client_id") is not None:
+            created[mutation["client_id"]] = obj.pk
+        return {"status": STATUS_APPLIED, "pk": obj.pk, "object": serializer.data}
+
+    obj = model.objects.select_for_update().filter(user=user, pk=mutation["pk"]).first()
+    if obj is None:
+        if op == OP_DELETE:
+            # Already deleted, here or by another client.
+            return {"status": STATUS_APPLIED, "pk": mutation["pk"]}
+        return {"status": STATUS_CONFLICT, "pk": mutation["pk"], "reason": "deleted"}
+
+    if op == OP_COMPLETE:
+        if model is not Activity:
+            raise ValueError("Only activities can be completed.")
+        completed_at = mutation.get("completed_at")
+        complete_activities(
+            user, [obj.pk], _parse_moment(completed_at) if completed_at else None
+        )
+        obj.refresh_from_db()
+        return {
+            "status": STATUS_APPLIED,
+            "pk": obj.pk,
+            "object": serializer_class(obj, context=context).data,
+        }
+
+    seen = mutation.get("updated")
+    if seen is not None and obj.updated > _parse_moment(seen):
+        return {
+            "status": STATUS_CONFLICT,
+            "pk": obj.pk,
+            "reason": "changed",
+            "object": serializer_class(obj, context=context).data,
+        }
+    if op == OP_DELETE:
+        obj.delete()
+        return {"status": STATUS_APPLIED, "pk": mutation["pk"]}
+
+    serializer = serializer_class(
+        obj,
+        data=_resolve_client_ids(mutation["data"], created),
+        partial=True,
+        context=context,
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    return {"status": STATUS_APPLIED, "pk": obj.pk, "object": serializer.data}
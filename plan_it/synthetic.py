@@ -0,0 +1,179 @@
+# plan_it/synthetic.py
+
+"""
+Generate synthetic plan_it data at a chosen scale, for load testing and the
+benchmarks in `plan_it.benchmarks`.
+
+A dataset is a tree of storage locations and one of activity locations, both
+`depth` levels deep with `fanout` children per location, plus items in the
+storage locations, activities in the activity locations and a year of
+completions of those activities. Everything is written with `bulk_create`,
+so generating even the largest scale takes a few seconds. Bulk writes send no
+signals, so the derived data the receivers in `plan_it.signals` would keep
+(location paths, search documents, cached choices and the dashboard snapshot)
+is brought up to date at the end.
+"""
+
+import random
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.snapshots import mark_dirty
+
+from .choices import bump_choices_version
+from .models import (
+    Activity,
+    ActivityInstance,
+    ActivityLocation,
+    ActivityType,
+    Item,
+    StorageLocation,
+    rebuild_location_tree,
+)
+from .recurrence import UNIT_CHOICES
+from .search import rebuild_search_index
+
+BATCH_SIZE = 1000
+# How far around today due dates, and how far back completions, are spread.
+DUE_DAYS_BEFORE = 30
+DUE_DAYS_AFTER = 60
+COMPLETION_DAYS = 365
+
+TYPE_NAMES = ["Cleaning", "Maintenance", "Shopping", "Exercise", "Study", "Admin"]
+WORDS = [
+    "drill",
+    "hammer",
+    "ladder",
+    "paint",
+    "battery",
+    "cable",
+    "filter",
+    "blanket",
+    "charger",
+    "bucket",
+    "glue",
+    "lamp",
+]
+
+Scale = namedtuple("Scale", ["depth", "fanout", "items", "activities", "instances"])
+
+# Locations per tree are fanout + fanout**2 + ... + fanout**depth: 14, 120
+# and 363 from smallest to largest.
+SCALES = {
+    "small": Scale(depth=3, fanout=2, items=100, activities=50, instances=1000),
+    "medium": Scale(depth=4, fanout=3, items=500, activities=200, instances=10000),
+    "large": Scale(depth=5, fanout=3, items=2000, activities=500, instances=50000),
+}
+
+
+def _build_tree(model, user, scale, prefix):
+    """
+    Create a tree of `model` locations for `user`, one `bulk_create` per
+    level, and return them all.
+    """
+    locations = []
+    parents = [None]
+    for level in range(scale.depth):
+        children = [
+            model(
+                user=user,
+                name=f"{prefix} {level + 1}.{index + 1}",
+                parent_location=parent,
+            )
+            for parent in parents
+            for index in range(scale.fanout)
+        ]
+        parents = model.objects.bulk_create(children, batch_size=BATCH_SIZE)
+        locations.extend(parents)
+    rebuild_location_tree(model, model.objects.filter(user=user))
+    return locations
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def generate_dataset(user, scale, seed=0, today=None):
+    """
+    Create a synthetic dataset of the given `Scale` for `user`, in one
+    transaction, and return how many objects of each kind were created.
+
+    The same `seed` always generates the same names, dates and shape.
+    """
+    if scale.items and not (scale.depth and scale.fanout):
+        raise ValueError("Items need at least one storage location.")
+    rng = random.Random(seed)
+    if today is None:
+        today = timezone.localdate()
+
+    with transaction.atomic():
+        storage_locations = _build_tree(StorageLocation, user, scale, "Storage")
+        activity_locations = _build_tree(ActivityLocation, user, scale, "Area")
+
+        types = ActivityType.objects.bulk_create(
+            [ActivityType(user=user, name=name) for name in TYPE_NAMES]
+        )
+        items = Item.objects.bulk_create(
+            [
+                Item(
+                    user=user,
+                    name=f"{_words(rng, 2).title()} {index + 1}",
+                    storage_location=rng.choice(storage_locations),
+                    description=_words(rng, 8),
+                )
+                for index in range(scale.items)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        activities = []
+        for index in range(scale.activities):
+            is_recurring = rng.random() < 0.5
+            activities.append(
+                Activity(
+                    user=user,
+                    name=f"{rng.choice(TYPE_NAMES)} {_words(rng, 1)} {index + 1}",
+                    type=rng.choice(types),
+                    target_item=(
+                        rng.choice(items) if items and rng.random() < 0.5 else None
+                    ),
+                    activity_location=(
+                        rng.choice(activity_locations) if rng.random() < 0.8 else None
+                    ),
+                    description=_words(rng, 6),
+                    due_date=today
+                    + timedelta(days=rng.randint(-DUE_DAYS_BEFORE, DUE_DAYS_AFTER)),
+                    is_recurring=is_recurring,
+                    recurrence_unit=rng.choice(UNIT_CHOICES)[0],
+                    recurrence_interval=rng.randint(1, 4),
+                )
+            )
+        activities = Activity.objects.bulk_create(activities, batch_size=BATCH_SIZE)
+
+        start = timezone.make_aware(datetime.combine(today, time.min))
+        instances = []
+        if activities:
+            for _ in range(scale.instances):
+                completed_at = start - timedelta(
+                    seconds=rng.randint(0, COMPLETION_DAYS * 24 * 60 * 60)
+                )
+                instances.append(
+                    rng.choice(activities).completion_snapshot(user, completed_at)
+                )
+        ActivityInstance.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+
+        rebuild_search_index(user=user)
+        bump_choices_version(user.pk)
+        mark_dirty(user.pk)
+
+    return {
+        "storage_locations": len(storage_locations),
+        "activity_locations": len(activity_locations),
+        "activity_types": len(types),
+        "items": len(items),
+        "activities": len(activities),
+        "instances": len(instances),
+    }
@@ -0,0 +1,49 @@
+# plan_it/tasks.py
+
+from datetime import date
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.utils import timezone
+
+from dashboard.snapshots import mark_dirty
+
+from .models import Activity, SyncTombstone
+from . import recurrence
+from .sync import tombstone_retention
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def roll_over_recurring_activities():
+    """
+    Move overdue recurring activities to their next occurrence. Scheduled
+    daily by Celery beat, see `CELERY_BEAT_SCHEDULE`.
+    """
+    today = date.today()
+    user_ids = set(
+        Activity.objects.filter(is_recurring=True, due_date__lt=today).values_list(
+            "user_id", flat=True
+        )
+    )
+    moved = recurrence.roll_over_recurring_activities(today)
+    # The bulk update sends no signals, so dirty the dashboard snapshots here.
+    for user_id in user_ids:
+        mark_dirty(user_id)
+    logger.info("Rolled over %s recurring activities.", moved)
+    return moved
+
+
+@shared_task
+def prune_sync_tombstones():
+    """
+    Delete the sync tombstones older than `PLAN_IT_SYNC_TOMBSTONE_DAYS`.
+    Clients whose token is older get a full resync instead. Scheduled daily by
+    Celery beat.
+    """
+    deleted, _ = SyncTombstone.objects.filter(
+        deleted__lt=timezone.now() - tombstone_retention()
+    ).delete()
+    logger.info("Pruned %s sync tombstones.", deleted)
+    return deleted
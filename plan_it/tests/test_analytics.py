@@ -0,0 +1,171 @@
+# plan_it/tests/test_analytics.py
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from plan_it.analytics import (
+    PERIOD_MONTH,
+    PERIOD_WEEK,
+    archive_completions,
+    average_interval,
+    completion_analytics,
+    months_ago,
+    period_starts,
+    streaks,
+)
+from plan_it.completion import complete_activities
+from plan_it.models import ActivityCompletionSummary, ActivityInstance
+from plan_it.recurrence import UNIT_DAYS, UNIT_WEEKS
+from plan_it.tests.factories import ActivityFactory, ActivityTypeFactory, UserFactory
+
+TODAY = date(2025, 6, 11)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+def complete_on(user, activities, *days):
+    for day in days:
+        complete_activities(
+            user,
+            [activity.pk for activity in activities],
+            timezone.make_aware(datetime.combine(day, time(12))),
+        )
+
+
+def days_ago(*offsets):
+    return [TODAY - timedelta(days=offset) for offset in offsets]
+
+
+def test_period_starts():
+    assert period_starts(date(2025, 5, 28), TODAY, PERIOD_WEEK) == [
+        date(2025, 5, 26),
+        date(2025, 6, 2),
+        date(2025, 6, 9),
+    ]
+    assert period_starts(date(2024, 12, 15), date(2025, 2, 1), PERIOD_MONTH) == [
+        date(2024, 12, 1),
+        date(2025, 1, 1),
+        date(2025, 2, 1),
+    ]
+
+
+def test_streaks_and_average_interval():
+    days = days_ago(10, 9, 8, 5, 4)
+    assert streaks(days, 1) == (2, 3)
+    assert streaks(days, 3) == (5, 5)
+    assert streaks([], 1) == (0, 0)
+    assert average_interval(days) == 1.5
+    assert average_interval(days[:1]) is None
+
+
+def test_months_ago():
+    assert months_ago(TODAY, 0) == date(2025, 6, 1)
+    assert months_ago(TODAY, 6) == date(2024, 12, 1)
+    assert months_ago(TODAY, 17) == date(2024, 1, 1)
+
+
+@pytest.mark.django_db
+def test_completion_analytics(user):
+    chore = ActivityTypeFactory(user=user, name="Chore")
+    sweep = ActivityFactory(
+        user=user,
+        name="Sweep",
+        type=chore,
+        is_recurring=True,
+        recurrence_unit=UNIT_WEEKS,
+        recurrence_interval=1,
+    )
+    water = ActivityFactory(
+        user=user,
+        name="Water",
+        type=chore,
+        is_recurring=True,
+        recurrence_unit=UNIT_DAYS,
+        recurrence_interval=1,
+    )
+    complete_on(user, [sweep], *days_ago(22, 15, 8, 1))
+    complete_on(user, [water], *days_ago(5, 4, 3))
+    complete_on(user, [ActivityFactory()], TODAY)
+
+    analytics = completion_analytics(user, PERIOD_WEEK, days=28, today=TODAY)
+
+    assert analytics["periods"][-1] == date(2025, 6, 9)
+    assert len(analytics["periods"]) == 5
+    by_name = {stats.name: stats for stats in analytics["activities"]}
+    assert list(by_name) == ["Sweep", "Water"]
+    assert by_name["Sweep"].total == 4
+    assert by_name["Sweep"].counts == [0, 1, 1, 1, 1]
+    assert by_name["Sweep"].average_interval == 7.0
+    assert by_name["Sweep"].target_interval == 7
+    assert by_name["Sweep"].current_streak == 4
+    # Water was due yesterday, so its streak is broken.
+    assert by_name["Water"].current_streak == 0
+    assert by_name["Water"].longest_streak == 3
+    assert [(stats.name, stats.total) for stats in analytics["types"]] == [
+        ("Chore", 7)
+    ]
+
+
+@pytest.mark.django_db
+def test_completion_analytics_query_count_is_constant(
+    user, django_assert_num_queries
+):
+    activities = [ActivityFactory(user=user) for _ in range(5)]
+    complete_on(user, activities, *days_ago(*range(30)))
+    with django_assert_num_queries(4):
+        completion_analytics(user, today=TODAY)
+
+
+@pytest.mark.django_db
+def test_archive_completions_folds_old_instances_into_monthly_summaries(user):
+    sweep = ActivityFactory(user=user, name="Sweep")
+    complete_on(user, [sweep], date(2025, 1, 3), date(2025, 1, 20), date(2025, 2, 1))
+    complete_on(user, [sweep], TODAY)
+
+    assert archive_completions(date(2025, 2, 1), dry_run=True) == 2
+    assert ActivityInstance.objects.count() == 4
+
+    assert archive_completions(date(2025, 2, 1)) == 2
+    summary = ActivityCompletionSummary.objects.get()
+    assert (summary.month, summary.completions) == (date(2025, 1, 1), 2)
+    assert summary.first_completed_at.date() == date(2025, 1, 3)
+
+    # A later run adds to the month it already summarized.
+    complete_on(user, [sweep], date(2025, 1, 25))
+    assert archive_completions(date(2025, 3, 1)) == 2
+    summaries = dict(
+        ActivityCompletionSummary.objects.values_list("month", "completions")
+    )
+    assert summaries == {date(2025, 1, 1): 3, date(2025, 2, 1): 1}
+    assert ActivityInstance.objects.count() == 1
+
+    analytics = completion_analytics(user, today=TODAY)
+    assert analytics["activities"][0].archived == 4
+
+
+@pytest.mark.django_db
+def test_archive_command(user):
+    complete_on(user, [ActivityFactory(user=user)], date(2020, 1, 1))
+    call_command("archive_activity_instances", "--months", "3")
+    assert not ActivityInstance.objects.exists()
+    assert ActivityCompletionSummary.objects.get().completions == 1
+
+
+@pytest.mark.django_db
+def test_view(client, user):
+    complete_on(user, [ActivityFactory(user=user, name="Sweep")], date.today())
+    client.force_login(user)
+    response = client.get(
+        reverse("plan_it:completion_analytics"), {"period": "month", "days": "x"}
+    )
+    assert response.status_code == 200
+    assert response.context["period"] == PERIOD_MONTH
+    assert response.context["days"] == 90
+    assert "Sweep" in response.content.decode()
@@ -0,0 +1,107 @@
+# plan_it/tests/test_benchmarks.py
+
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+
+from plan_it.benchmarks import BENCHMARKS, run_benchmarks, write_report
+from plan_it.models import (
+    Activity,
+    ActivityInstance,
+    Item,
+    SearchDocument,
+    StorageLocation,
+)
+from plan_it.search import search
+from plan_it.synthetic import SCALES, Scale, generate_dataset
+from plan_it.tests.factories import UserFactory
+
+TINY = Scale(depth=2, fanout=2, items=10, activities=5, instances=30)
+
+# Set to a file path to run the full benchmark suite and keep its JSON
+# report, e.g. `PLAN_IT_BENCHMARK_REPORT=bench.json pytest plan_it/tests`.
+REPORT_PATH = os.getenv("PLAN_IT_BENCHMARK_REPORT")
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.mark.django_db
+def test_generate_dataset_creates_the_scale(user):
+    counts = generate_dataset(user, TINY)
+
+    assert counts == {
+        "storage_locations": 6,
+        "activity_locations": 6,
+        "activity_types": 6,
+        "items": 10,
+        "activities": 5,
+        "instances": 30,
+    }
+    leaf = StorageLocation.objects.filter(user=user, depth=1).first()
+    assert leaf.full_name.startswith(leaf.parent_location.name + " > ")
+    assert ActivityInstance.objects.filter(user=user).count() == 30
+    assert SearchDocument.objects.filter(user=user).count() == 6 + 10 + 5
+    assert search(user, "drill") or search(user, "hammer")
+
+
+@pytest.mark.django_db
+def test_generate_dataset_is_repeatable():
+    first, second = UserFactory(), UserFactory()
+    generate_dataset(first, TINY, seed=3)
+    generate_dataset(second, TINY, seed=3)
+
+    def names(user):
+        return list(Item.objects.filter(user=user).order_by("pk").values_list("name"))
+
+    assert names(first) == names(second)
+
+
+@pytest.mark.django_db
+def test_generate_dataset_writes_in_bulk(user, django_assert_max_num_queries):
+    # Thousands of objects in a few batched queries each, not one query each.
+    with django_assert_max_num_queries(100):
+        generate_dataset(user, TINY._replace(items=300, instances=3000))
+
+
+@pytest.mark.django_db
+def test_generate_plan_it_data_command(user):
+    call_command("generate_plan_it_data", user.username, "--items", "7", "--depth", "1")
+
+    assert Item.objects.filter(user=user).count() == 7
+    assert StorageLocation.objects.filter(user=user).count() == SCALES["small"].fanout
+    assert Activity.objects.filter(user=user).count() == SCALES["small"].activities
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_reports_every_benchmark(tmp_path):
+    report = run_benchmarks({"tiny": TINY}, repeat=1)
+
+    result = report["scales"]["tiny"]
+    assert result["dataset"]["items"] == 10
+    assert set(result["benchmarks"]) == set(BENCHMARKS)
+    for timing in result["benchmarks"].values():
+        assert timing["status"] < 400
+        assert timing["queries"] > 0
+        assert timing["min_ms"] <= timing["median_ms"] <= timing["max_ms"]
+    # The datasets are rolled back.
+    assert not Item.objects.exists()
+
+    path = tmp_path / "report.json"
+    write_report(report, path)
+    assert json.loads(path.read_text())["repeat"] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not REPORT_PATH, reason="PLAN_IT_BENCHMARK_REPORT is not set")
+def test_benchmark_suite():
+    report = run_benchmarks()
+    write_report(report, REPORT_PATH)
+
+    for result in report["scales"].values():
+        for name, timing in result["benchmarks"].items():
+            assert timing["status"] < 400, name
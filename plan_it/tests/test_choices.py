@@ -0,0 +1,127 @@
+# plan_it/tests/test_choices.py
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from plan_it.models import Activity
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ActivityTypeFactory,
+    ItemFactory,
+    StorageLocationFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def logged_in(client, user):
+    client.force_login(user)
+    return client
+
+
+def field_choices(response, name):
+    return [label for pk, label in response.context["form"].fields[name].choices if pk]
+
+
+@pytest.mark.django_db
+def test_warm_activity_form_renders_without_choice_queries(
+    logged_in, user, django_assert_max_num_queries
+):
+    home = ActivityLocationFactory(user=user, name="Home", parent_location=None)
+    for name in ["Kitchen", "Bathroom", "Garden"]:
+        ActivityLocationFactory(user=user, name=name, parent_location=home)
+    ActivityTypeFactory(user=user, name="Chore")
+    ItemFactory(
+        user=user, name="Mop", storage_location=StorageLocationFactory(user=user)
+    )
+    ActivityLocationFactory(name="Someone else's")
+
+    response = logged_in.get(reverse("plan_it:activity_add"))
+    assert field_choices(response, "activity_location") == [
+        "Home",
+        "Home > Kitchen",
+        "Home > Bathroom",
+        "Home > Garden",
+    ]
+    assert field_choices(response, "type") == ["Chore"]
+
+    # The session and the user only.
+    with django_assert_max_num_queries(2):
+        response = logged_in.get(reverse("plan_it:activity_add"))
+    assert field_choices(response, "target_item") == ["Mop"]
+
+
+@pytest.mark.django_db
+def test_writes_invalidate_the_cached_choices(
+    logged_in, user, django_capture_on_commit_callbacks
+):
+    garage = StorageLocationFactory(user=user, name="Garage", parent_location=None)
+    logged_in.get(reverse("plan_it:item_add"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        garage.name = "Shed"
+        garage.save()
+        StorageLocationFactory(user=user, name="Attic", parent_location=None)
+    response = logged_in.get(reverse("plan_it:item_add"))
+    assert sorted(field_choices(response, "storage_location")) == ["Attic", "Shed"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        garage.delete()
+    response = logged_in.get(reverse("plan_it:item_add"))
+    assert field_choices(response, "storage_location") == ["Attic"]
+
+
+@pytest.mark.django_db
+def test_location_update_form_leaves_out_its_own_subtree(logged_in, user):
+    house = StorageLocationFactory(user=user, name="House", parent_location=None)
+    garage = StorageLocationFactory(user=user, name="Garage", parent_location=house)
+    StorageLocationFactory(user=user, name="Shelf", parent_location=garage)
+    StorageLocationFactory(user=user, name="Shed", parent_location=None)
+
+    url = reverse("plan_it:storage_location_edit", args=[garage.pk])
+    response = logged_in.get(url)
+    assert field_choices(response, "parent_location") == ["House", "Shed"]
+
+    shelf = garage.sublocations.get()
+    response = logged_in.post(url, {"name": "Garage", "parent_location": shelf.pk})
+    assert response.status_code == 200
+    assert "parent_location" in response.context["form"].errors
+
+
+@pytest.mark.django_db
+def test_submitted_choices_are_still_validated(logged_in, user):
+    theirs = ActivityTypeFactory()
+    response = logged_in.post(
+        reverse("plan_it:activity_add"), {"name": "Sweep", "type": theirs.pk}
+    )
+    assert "type" in response.context["form"].errors
+
+    mine = ActivityTypeFactory(user=user)
+    logged_in.post(reverse("plan_it:activity_add"), {"name": "Sweep", "type": mine.pk})
+    assert Activity.objects.get(name="Sweep").type == mine
+
+
+@pytest.mark.django_db
+def test_update_form_selects_the_current_choice(logged_in, user):
+    activity = ActivityFactory(
+        user=user,
+        type=ActivityTypeFactory(user=user),
+        activity_location=None,
+        target_item=None,
+    )
+    response = logged_in.get(reverse("plan_it:activity_edit", args=[activity.pk]))
+    assert f'value="{activity.type.pk}" selected' in response.content.decode()
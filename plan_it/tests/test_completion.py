@@ -0,0 +1,109 @@
+# plan_it/tests/test_completion.py
+
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+
+from plan_it.completion import complete_activities
+from plan_it.models import Activity, ActivityInstance
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ActivityTypeFactory,
+    ItemFactory,
+    StorageLocationFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def kitchen_chores(user):
+    kitchen = ActivityLocationFactory(user=user, name="Kitchen")
+    chore = ActivityTypeFactory(user=user, name="Chore")
+    sponge = ItemFactory(
+        user=user, name="Sponge", storage_location=StorageLocationFactory(user=user)
+    )
+    return [
+        ActivityFactory(
+            user=user,
+            name=name,
+            type=chore,
+            target_item=sponge,
+            activity_location=kitchen,
+            due_date=date.today(),
+            is_recurring=name == "Wipe",
+        )
+        for name in ["Wipe", "Sweep", "Mop"]
+    ]
+
+
+@pytest.mark.django_db
+def test_complete_activities(user, kitchen_chores):
+    instances = complete_activities(user, [a.pk for a in kitchen_chores])
+
+    assert len(instances) == 3
+    snapshot = ActivityInstance.objects.get(name_snapshot="Sweep")
+    assert snapshot.type_name_snapshot == "Chore"
+    assert snapshot.target_item_name_snapshot == "Sponge"
+    assert snapshot.activity_location_name_snapshot == "Kitchen"
+    activities = {a.name: a for a in Activity.objects.all()}
+    assert activities["Sweep"].last_completed == date.today()
+    assert activities["Sweep"].due_date == date.today()
+    assert activities["Wipe"].due_date == date.today() + timedelta(days=1)
+
+
+@pytest.mark.django_db
+def test_query_count_does_not_depend_on_the_number_of_activities(
+    user, kitchen_chores, django_assert_max_num_queries
+):
+    more = [
+        ActivityFactory(user=user, activity_location=None, target_item=None)
+        for _ in range(10)
+    ]
+    # Savepoint, select, insert, update, snapshot dirtying and its release.
+    with django_assert_max_num_queries(8):
+        complete_activities(user, [a.pk for a in kitchen_chores + more])
+    assert ActivityInstance.objects.count() == 13
+
+
+@pytest.mark.django_db
+def test_other_users_activities_are_ignored(user, kitchen_chores):
+    theirs = ActivityFactory()
+    instances = complete_activities(user, [theirs.pk, kitchen_chores[0].pk])
+    assert [instance.activity for instance in instances] == [kitchen_chores[0]]
+    theirs.refresh_from_db()
+    assert theirs.last_completed is None
+
+
+@pytest.mark.django_db
+def test_view_completes_the_posted_activities(client, user, kitchen_chores):
+    client.force_login(user)
+    response = client.post(
+        reverse("plan_it:activities_complete"),
+        {"activity_ids": [a.pk for a in kitchen_chores[:2]]},
+    )
+    assert response.status_code == 302
+    assert response.url == reverse("plan_it:dashboard")
+    assert ActivityInstance.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_view_rejects_bad_ids(client, user):
+    client.force_login(user)
+    response = client.post(
+        reverse("plan_it:activities_complete"), {"activity_ids": ["one"]}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_dashboard_offers_to_complete_a_whole_location(client, user, kitchen_chores):
+    client.force_login(user)
+    response = client.get(reverse("plan_it:dashboard"))
+    assert "Complete all in Kitchen" in response.content.decode()
@@ -0,0 +1,109 @@
+# plan_it/tests/test_dashboard_builder.py
+
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+
+from plan_it.dashboard import build_activity_tree
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ActivityTypeFactory,
+    UserFactory,
+)
+
+TODAY = date(2025, 6, 1)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def activity_type(user):
+    return ActivityTypeFactory(user=user)
+
+
+def add_activities(user, activity_type, locations, per_location=2):
+    for location in locations:
+        for days in range(per_location):
+            ActivityFactory(
+                user=user,
+                type=activity_type,
+                activity_location=location,
+                due_date=TODAY + timedelta(days=days - 1),
+            )
+
+
+@pytest.mark.django_db
+def test_tree_and_due_statuses(user, activity_type):
+    house = ActivityLocationFactory(user=user, name="House")
+    kitchen = ActivityLocationFactory(user=user, name="Kitchen", parent_location=house)
+    ActivityFactory(
+        user=user,
+        type=activity_type,
+        activity_location=kitchen,
+        due_date=TODAY - timedelta(days=1),
+    )
+    ActivityFactory(
+        user=user, type=activity_type, activity_location=kitchen, due_date=TODAY
+    )
+    ActivityFactory(
+        user=user,
+        type=activity_type,
+        activity_location=None,
+        target_item=None,
+        due_date=None,
+    )
+
+    top_locations, uncategorized = build_activity_tree(user, TODAY)
+
+    assert [node.label for node in top_locations] == ["House"]
+    assert top_locations[0].activities == []
+    kitchen_node = top_locations[0].children[0]
+    assert kitchen_node.label == "House > Kitchen"
+    assert kitchen_node.depth == 1
+    assert [a.due_status for a in kitchen_node.activities] == ["overdue", "today"]
+    assert kitchen_node.activities[0].target_item_name
+    assert [a.due_status for a in uncategorized] == ["none"]
+
+
+@pytest.mark.django_db
+def test_two_queries_whatever_the_size(user, activity_type, django_assert_num_queries):
+    parent = None
+    locations = []
+    for _ in range(5):
+        parent = ActivityLocationFactory(user=user, parent_location=parent)
+        locations.append(parent)
+    add_activities(user, activity_type, locations)
+
+    with django_assert_num_queries(2):
+        top_locations, _ = build_activity_tree(user, TODAY)
+
+    node, depth = top_locations[0], 0
+    while node.children:
+        node, depth = node.children[0], depth + 1
+    assert depth == 4
+
+
+@pytest.mark.django_db
+def test_dashboard_view_cost_is_flat(
+    client, user, activity_type, django_assert_max_num_queries
+):
+    client.force_login(user)
+    add_activities(user, activity_type, [ActivityLocationFactory(user=user)])
+    with django_assert_max_num_queries(100) as captured:
+        client.get(reverse("plan_it:dashboard"))
+    queries = len(captured)
+
+    locations = [ActivityLocationFactory(user=user) for _ in range(5)]
+    locations += [
+        ActivityLocationFactory(user=user, parent_location=location)
+        for location in locations
+    ]
+    add_activities(user, activity_type, locations, per_location=3)
+    with django_assert_max_num_queries(queries):
+        response = client.get(reverse("plan_it:dashboard"))
+    assert response.status_code == 200
@@ -0,0 +1,136 @@
+# plan_it/tests/test_location_tree.py
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.html import escape
+
+from plan_it.models import ActivityLocation, StorageLocation
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ActivityTypeFactory,
+    StorageLocationFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def tree(user):
+    home = StorageLocationFactory(user=user, name="Home")
+    garage = StorageLocationFactory(user=user, name="Garage", parent_location=home)
+    shelf = StorageLocationFactory(user=user, name="Shelf", parent_location=garage)
+    attic = StorageLocationFactory(user=user, name="Attic", parent_location=home)
+    return {"home": home, "garage": garage, "shelf": shelf, "attic": attic}
+
+
+@pytest.mark.django_db
+def test_save_fills_in_path_depth_and_full_name(tree):
+    shelf = StorageLocation.objects.get(pk=tree["shelf"].pk)
+    assert shelf.depth == 2
+    assert str(shelf) == "Home > Garage > Shelf"
+    assert shelf.ancestor_ids() == [tree["home"].pk, tree["garage"].pk]
+
+
+@pytest.mark.django_db
+def test_str_needs_no_queries(tree, django_assert_num_queries):
+    shelf = StorageLocation.objects.get(pk=tree["shelf"].pk)
+    with django_assert_num_queries(0):
+        assert str(shelf) == "Home > Garage > Shelf"
+        assert shelf.depth == 2
+
+
+@pytest.mark.django_db
+def test_ancestors_and_subtree_are_one_query_each(tree, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert [node.name for node in tree["shelf"].ancestors()] == ["Home", "Garage"]
+    with django_assert_num_queries(1):
+        assert [node.name for node in tree["home"].subtree()] == [
+            "Home",
+            "Garage",
+            "Shelf",
+            "Attic",
+        ]
+    assert [node.name for node in tree["home"].descendants()] == [
+        "Garage",
+        "Shelf",
+        "Attic",
+    ]
+
+
+@pytest.mark.django_db
+def test_moving_a_location_rewrites_its_subtree(tree):
+    garage = tree["garage"]
+    garage.parent_location = tree["attic"]
+    garage.save()
+
+    shelf = StorageLocation.objects.get(pk=tree["shelf"].pk)
+    assert str(shelf) == "Home > Attic > Garage > Shelf"
+    assert shelf.depth == 3
+    assert shelf.is_descendant_of(tree["attic"])
+
+
+@pytest.mark.django_db
+def test_renaming_a_location_renames_its_subtree(tree):
+    home = tree["home"]
+    home.name = "House"
+    home.save()
+    assert str(StorageLocation.objects.get(pk=tree["shelf"].pk)) == (
+        "House > Garage > Shelf"
+    )
+
+
+@pytest.mark.django_db
+def test_a_location_cannot_move_inside_itself(tree):
+    home = tree["home"]
+    home.parent_location = tree["shelf"]
+    with pytest.raises(ValidationError):
+        home.full_clean()
+    with pytest.raises(ValueError):
+        home.save()
+
+
+@pytest.mark.django_db
+def test_rebuild_tree(tree):
+    StorageLocation.objects.update(path="", depth=0, full_name="")
+    assert StorageLocation.rebuild_tree() == 4
+    shelf = StorageLocation.objects.get(pk=tree["shelf"].pk)
+    assert shelf.path == tree["shelf"].path
+    assert str(shelf) == "Home > Garage > Shelf"
+
+
+@pytest.mark.django_db
+def test_dashboard_queries_do_not_grow_with_the_tree(
+    client, user, django_assert_max_num_queries
+):
+    client.force_login(user)
+    activity_type = ActivityTypeFactory(user=user)
+
+    def add_branch(depth):
+        parent = None
+        for _ in range(depth):
+            parent = ActivityLocationFactory(user=user, parent_location=parent)
+            ActivityFactory(
+                user=user,
+                type=activity_type,
+                target_item=None,
+                activity_location=parent,
+            )
+
+    add_branch(2)
+    with django_assert_max_num_queries(100) as captured:
+        client.get(reverse("plan_it:dashboard"))
+    queries = len(captured)
+
+    add_branch(6)
+    add_branch(6)
+    with django_assert_max_num_queries(queries):
+        response = client.get(reverse("plan_it:dashboard"))
+    assert response.status_code == 200
+    deepest = ActivityLocation.objects.order_by("-depth").first()
+    assert escape(str(deepest)) in response.content.decode()
@@ -0,0 +1,198 @@
+# plan_it/tests/test_locations.py
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+from plan_it.locations import merge_locations, move_location
+from plan_it.models import ActivityLocation, Item, StorageLocation
+from plan_it.search import search
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ItemFactory,
+    StorageLocationFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def tree(user):
+    """
+    House > Garage > Shelf, and Shed.
+    """
+
+    def location(name, parent=None):
+        return StorageLocationFactory(user=user, name=name, parent_location=parent)
+
+    house = location("House")
+    garage = location("Garage", house)
+    return {
+        "house": house,
+        "garage": garage,
+        "shelf": location("Shelf", garage),
+        "shed": location("Shed"),
+    }
+
+
+def full_names(model=StorageLocation):
+    return sorted(model.objects.values_list("full_name", flat=True))
+
+
+@pytest.mark.django_db
+def test_move_location_moves_the_subtree(tree):
+    move_location(tree["garage"], tree["shed"])
+    assert full_names() == ["House", "Shed", "Shed > Garage", "Shed > Garage > Shelf"]
+
+    move_location(tree["garage"], None)
+    shelf = StorageLocation.objects.get(name="Shelf")
+    assert (shelf.full_name, shelf.depth) == ("Garage > Shelf", 1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("parent", ["garage", "shelf"])
+def test_move_location_refuses_cycles(tree, parent):
+    with pytest.raises(ValidationError):
+        move_location(tree["garage"], tree[parent])
+    assert StorageLocation.objects.get(name="Shelf").full_name == (
+        "House > Garage > Shelf"
+    )
+
+
+@pytest.mark.django_db
+def test_move_location_refuses_another_users_location(tree):
+    with pytest.raises(ValidationError):
+        move_location(tree["garage"], StorageLocationFactory())
+
+
+@pytest.mark.django_db
+def test_merge_locations(user, tree):
+    bin_ = StorageLocationFactory(user=user, name="Bin", parent_location=tree["shed"])
+    drill = ItemFactory(user=user, name="Drill", storage_location=tree["shed"])
+    ItemFactory(user=user, name="Saw", storage_location=bin_)
+
+    merge_locations(tree["shed"], tree["garage"])
+
+    assert full_names() == [
+        "House",
+        "House > Garage",
+        "House > Garage > Bin",
+        "House > Garage > Shelf",
+    ]
+    assert Item.objects.get(pk=drill.pk).storage_location == tree["garage"]
+    assert search(user, "saw")[0].location_path == "House > Garage > Bin"
+    assert search(user, "shed") == []
+
+
+@pytest.mark.django_db
+def test_merge_locations_cost_does_not_depend_on_the_subtree_size(
+    user, tree, django_assert_max_num_queries
+):
+    for number in range(10):
+        ItemFactory(user=user, storage_location=tree["shed"])
+        StorageLocationFactory(
+            user=user, name=f"Box {number}", parent_location=tree["shed"]
+        )
+    with django_assert_max_num_queries(20):
+        merge_locations(tree["shed"], tree["house"])
+    assert Item.objects.filter(storage_location=tree["house"]).count() == 10
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("target", ["garage", "shelf"])
+def test_merge_locations_refuses_its_own_subtree(tree, target):
+    with pytest.raises(ValidationError):
+        merge_locations(tree["garage"], tree[target])
+    assert StorageLocation.objects.filter(pk=tree["garage"].pk).exists()
+
+
+@pytest.mark.django_db
+def test_merge_activity_locations_reassigns_activities(user):
+    kitchen = ActivityLocationFactory(user=user, name="Kitchen")
+    galley = ActivityLocationFactory(user=user, name="Galley")
+    activity = ActivityFactory(user=user, activity_location=galley)
+
+    merge_locations(galley, kitchen)
+
+    activity.refresh_from_db()
+    assert activity.activity_location == kitchen
+    assert full_names(ActivityLocation) == ["Kitchen"]
+
+
+@pytest.mark.django_db
+def test_update_view_moves_and_renames(client, user, tree):
+    client.force_login(user)
+    url = reverse("plan_it:storage_location_edit", args=[tree["garage"].pk])
+
+    response = client.post(
+        url, {"name": "Workshop", "parent_location": tree["shed"].pk}
+    )
+
+    assert response.status_code == 302
+    assert "Shed > Workshop > Shelf" in full_names()
+
+
+@pytest.mark.django_db
+def test_merge_view_offers_the_users_locations_outside_the_subtree(client, user, tree):
+    StorageLocationFactory(name="Someone else's")
+    client.force_login(user)
+
+    response = client.get(
+        reverse("plan_it:storage_location_merge", args=[tree["garage"].pk])
+    )
+
+    assert response.status_code == 200
+    choices = [label for pk, label in response.context["form"].fields["target"].choices]
+    assert choices[1:] == ["House", "Shed"]
+
+
+@pytest.mark.django_db
+def test_merge_view_merges(client, user, tree):
+    ItemFactory(user=user, name="Saw", storage_location=tree["shed"])
+    client.force_login(user)
+
+    response = client.post(
+        reverse("plan_it:storage_location_merge", args=[tree["shed"].pk]),
+        {"target": tree["garage"].pk},
+    )
+
+    assert response.status_code == 302
+    assert not StorageLocation.objects.filter(pk=tree["shed"].pk).exists()
+    assert Item.objects.get(name="Saw").storage_location == tree["garage"]
+
+
+@pytest.mark.django_db
+def test_merge_view_refuses_other_users_locations(client, user, tree):
+    other = StorageLocationFactory(name="Someone else's")
+    client.force_login(user)
+
+    response = client.post(
+        reverse("plan_it:storage_location_merge", args=[tree["shed"].pk]),
+        {"target": other.pk},
+    )
+    assert response.status_code == 200
+    assert "target" in response.context["form"].errors
+
+    response = client.get(reverse("plan_it:storage_location_merge", args=[other.pk]))
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_activity_location_merge_view(client, user):
+    kitchen = ActivityLocationFactory(user=user, name="Kitchen", parent_location=None)
+    galley = ActivityLocationFactory(user=user, name="Galley", parent_location=None)
+    ActivityFactory(user=user, name="Wipe", activity_location=galley)
+    client.force_login(user)
+
+    response = client.post(
+        reverse("plan_it:activity_location_merge", args=[galley.pk]),
+        {"target": kitchen.pk},
+    )
+
+    assert response.status_code == 302
+    assert full_names(ActivityLocation) == ["Kitchen"]
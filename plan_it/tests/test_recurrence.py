@@ -0,0 +1,150 @@
+# plan_it/tests/test_recurrence.py
+
+from datetime import date, timedelta
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+
+from plan_it.models import Activity
+from plan_it.recurrence import (
+    UNIT_DAYS,
+    UNIT_WEEKS,
+    format_rrule,
+    next_occurrence,
+    parse_rrule,
+    roll_over_recurring_activities,
+)
+from plan_it.tasks import roll_over_recurring_activities as roll_over_task
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityTypeFactory,
+    UserFactory,
+)
+
+TODAY = date(2025, 6, 11)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+def recurring(user, due_date, unit=UNIT_DAYS, interval=1, **kwargs):
+    return ActivityFactory(
+        user=user,
+        due_date=due_date,
+        is_recurring=True,
+        recurrence_unit=unit,
+        recurrence_interval=interval,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("FREQ=DAILY", (UNIT_DAYS, 1)),
+        ("RRULE:FREQ=DAILY;INTERVAL=3", (UNIT_DAYS, 3)),
+        ("freq=weekly;interval=2", (UNIT_WEEKS, 2)),
+    ],
+)
+def test_parse_rrule(value, expected):
+    assert parse_rrule(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["FREQ=MONTHLY", "FREQ=DAILY;BYDAY=MO", "FREQ=DAILY;INTERVAL=0", "DAILY"],
+)
+def test_parse_rrule_rejects_what_it_does_not_support(value):
+    with pytest.raises(ValueError):
+        parse_rrule(value)
+
+
+def test_format_rrule_round_trips():
+    assert format_rrule(UNIT_WEEKS, 2) == "FREQ=WEEKLY;INTERVAL=2"
+    assert parse_rrule(format_rrule(UNIT_DAYS, 1)) == (UNIT_DAYS, 1)
+
+
+def test_next_occurrence():
+    assert next_occurrence(date(2025, 6, 1), 7, TODAY) == date(2025, 6, 15)
+    assert next_occurrence(date(2025, 6, 4), 7, TODAY) == TODAY
+    assert next_occurrence(date(2025, 6, 20), 7, TODAY) == date(2025, 6, 20)
+
+
+@pytest.mark.django_db
+def test_roll_over_moves_each_rule_in_one_update(user, django_assert_num_queries):
+    daily = recurring(user, TODAY - timedelta(days=3))
+    every_three_days = recurring(user, TODAY - timedelta(days=4), interval=3)
+    weekly = recurring(user, date(2025, 6, 1), unit=UNIT_WEEKS)
+    fortnightly = recurring(user, date(2025, 5, 1), unit=UNIT_WEEKS, interval=2)
+    upcoming = recurring(user, TODAY + timedelta(days=1))
+    one_off = ActivityFactory(user=user, due_date=TODAY - timedelta(days=3))
+
+    # The distinct rules, then one UPDATE for each of the four.
+    with django_assert_num_queries(5):
+        assert roll_over_recurring_activities(TODAY) == 4
+
+    due_dates = dict(Activity.objects.values_list("pk", "due_date"))
+    assert due_dates[daily.pk] == TODAY
+    assert due_dates[every_three_days.pk] == TODAY + timedelta(days=2)
+    assert due_dates[weekly.pk] == date(2025, 6, 15)
+    assert due_dates[fortnightly.pk] == date(2025, 6, 12)
+    assert due_dates[upcoming.pk] == TODAY + timedelta(days=1)
+    assert due_dates[one_off.pk] == TODAY - timedelta(days=3)
+
+
+@pytest.mark.django_db
+def test_rrule_property(user):
+    activity = recurring(user, TODAY)
+    activity.rrule = "FREQ=WEEKLY;INTERVAL=3"
+    assert (activity.recurrence_unit, activity.recurrence_interval) == (UNIT_WEEKS, 3)
+    assert activity.rrule == "FREQ=WEEKLY;INTERVAL=3"
+
+
+@pytest.mark.django_db
+def test_completing_a_recurring_activity_schedules_the_next_one(user):
+    activity = recurring(user, date.today() - timedelta(days=1), interval=2)
+    activity.record_completion(user)
+    activity.refresh_from_db()
+    assert activity.due_date == date.today() + timedelta(days=1)
+
+    # Completing it early still moves it on by one occurrence.
+    activity.record_completion(user)
+    activity.refresh_from_db()
+    assert activity.due_date == date.today() + timedelta(days=3)
+
+
+@pytest.mark.django_db
+def test_completing_a_one_off_activity_keeps_its_due_date(user):
+    activity = ActivityFactory(user=user, due_date=date.today())
+    activity.record_completion(user)
+    activity.refresh_from_db()
+    assert activity.due_date == date.today()
+
+
+@pytest.mark.django_db
+def test_task_dirties_the_dashboard_snapshots(user):
+    recurring(user, date.today() - timedelta(days=2))
+    with mock.patch("plan_it.tasks.mark_dirty") as mark_dirty:
+        assert roll_over_task() == 1
+    mark_dirty.assert_called_once_with(user.pk)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("recurrence", [{}, {"recurrence_interval": ""}])
+def test_activity_form_defaults_blank_recurrence_fields(client, user, recurrence):
+    client.force_login(user)
+    response = client.post(
+        reverse("plan_it:activity_add"),
+        {
+            "name": "Sweep",
+            "type": ActivityTypeFactory(user=user).pk,
+            "due_date": TODAY,
+            **recurrence,
+        },
+    )
+    assert response.status_code == 302
+    activity = Activity.objects.get(name="Sweep")
+    assert (activity.recurrence_unit, activity.recurrence_interval) == (UNIT_DAYS, 1)
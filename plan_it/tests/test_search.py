@@ -0,0 +1,155 @@
+# plan_it/tests/test_search.py
+
+import pytest
+from django.urls import reverse
+
+from plan_it.models import (
+    SEARCH_KIND_ACTIVITY,
+    SEARCH_KIND_ITEM,
+    SEARCH_KIND_STORAGE_LOCATION,
+    SearchDocument,
+)
+from plan_it.search import rebuild_search_index, search
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityLocationFactory,
+    ItemFactory,
+    StorageLocationFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def garage(user):
+    house = StorageLocationFactory(user=user, name="House", parent_location=None)
+    return StorageLocationFactory(user=user, name="Garage", parent_location=house)
+
+
+def titles(results):
+    return [result.title for result in results]
+
+
+@pytest.mark.django_db
+def test_search_finds_items_by_name_description_and_location(user, garage):
+    drill = ItemFactory(
+        user=user,
+        name="Cordless drill",
+        description="Bits in the red case",
+        storage_location=garage,
+    )
+    ItemFactory(user=user, name="Hammer", storage_location=garage)
+
+    [result] = search(user, "drill")
+    assert result.kind == SEARCH_KIND_ITEM
+    assert result.pk == drill.pk
+    assert result.location_path == "House > Garage"
+    assert result.url == reverse("plan_it:item_edit", args=[drill.pk])
+    assert titles(search(user, "red case")) == ["Cordless drill"]
+    # Each word is a prefix, and every word has to match.
+    assert titles(search(user, "cord")) == ["Cordless drill"]
+    assert search(user, "drill hammer") == []
+    assert set(titles(search(user, "garage"))) == {
+        "Garage",
+        "Cordless drill",
+        "Hammer",
+    }
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(user, garage):
+    ItemFactory(
+        user=user, name="Box", description="Lamp cords", storage_location=garage
+    )
+    ItemFactory(user=user, name="Lamp", storage_location=garage)
+    assert titles(search(user, "lamp")) == ["Lamp", "Box"]
+
+
+@pytest.mark.django_db
+def test_search_is_per_user(user, garage):
+    ItemFactory(name="Drill")
+    assert search(user, "drill") == []
+
+
+@pytest.mark.django_db
+def test_search_ignores_operators_and_punctuation(user, garage):
+    ItemFactory(user=user, name="Salt and pepper", storage_location=garage)
+    assert titles(search(user, 'salt AND "pepper" (')) == ["Salt and pepper"]
+    assert search(user, "  *  ") == []
+
+
+@pytest.mark.django_db
+def test_documents_follow_edits_moves_and_deletes(user, garage):
+    shed = StorageLocationFactory(user=user, name="Shed", parent_location=None)
+    shelf = StorageLocationFactory(user=user, name="Shelf", parent_location=garage)
+    saw = ItemFactory(user=user, name="Saw", storage_location=shelf)
+
+    saw.name = "Hacksaw"
+    saw.save()
+    assert titles(search(user, "hacksaw")) == ["Hacksaw"]
+
+    # Moving a location rewrites the paths of everything below it.
+    garage.parent_location = shed
+    garage.save()
+    [result] = search(user, "hacksaw")
+    assert result.location_path == "Shed > Garage > Shelf"
+    assert titles(search(user, "house")) == ["House"]
+
+    saw.delete()
+    assert search(user, "hacksaw") == []
+    assert not SearchDocument.objects.filter(kind=SEARCH_KIND_ITEM).exists()
+
+
+@pytest.mark.django_db
+def test_activities_are_searchable_with_their_location(user):
+    kitchen = ActivityLocationFactory(user=user, name="Kitchen")
+    activity = ActivityFactory(
+        user=user, name="Descale kettle", activity_location=kitchen
+    )
+
+    [result] = search(user, "kettle")
+    assert (result.kind, result.location_path) == (SEARCH_KIND_ACTIVITY, "Kitchen")
+
+    kitchen.name = "Galley"
+    kitchen.save()
+    assert search(user, "kettle")[0].location_path == "Galley"
+
+    # Completing it doesn't touch the search document.
+    activity.record_completion(user)
+    assert titles(search(user, "descale")) == ["Descale kettle"]
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(user, garage):
+    ItemFactory(user=user, name="Drill", storage_location=garage)
+    SearchDocument.objects.all().delete()
+
+    assert rebuild_search_index() == 3
+    assert titles(search(user, "drill")) == ["Drill"]
+    assert SearchDocument.objects.filter(kind=SEARCH_KIND_STORAGE_LOCATION).count() == 2
+
+
+@pytest.mark.django_db
+def test_search_is_one_query(user, garage, django_assert_num_queries):
+    for number in range(20):
+        ItemFactory(user=user, name=f"Drill {number}", storage_location=garage)
+    with django_assert_num_queries(1):
+        assert len(search(user, "drill", limit=5)) == 5
+
+
+@pytest.mark.django_db
+def test_search_view(client, user, garage):
+    ItemFactory(user=user, name="Drill", storage_location=garage)
+    client.force_login(user)
+
+    response = client.get(reverse("plan_it:search"), {"q": "drill"})
+    assert response.status_code == 200
+    [result] = response.json()["results"]
+    assert (result["title"], result["location_path"]) == ("Drill", "House > Garage")
+
+    response = client.get(reverse("plan_it:search"), {"q": "drill", "limit": "x"})
+    assert response.status_code == 400
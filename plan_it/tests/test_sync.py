@@ -0,0 +1,342 @@
+# plan_it/tests/test_sync.py
+
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from plan_it.models import ActivityInstance, Item, SyncTombstone
+from plan_it.sync import (
+    STATUS_APPLIED,
+    STATUS_CONFLICT,
+    STATUS_ERROR,
+    apply_mutations,
+    make_token,
+    pull_changes,
+)
+from plan_it.tasks import prune_sync_tombstones
+from plan_it.tests.factories import (
+    ActivityFactory,
+    ActivityTypeFactory,
+    ItemFactory,
+    StorageLocationFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture
+def user():
+    return UserFactory(registration_accepted=True)
+
+
+@pytest.fixture
+def api(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def garage(user):
+    return StorageLocationFactory(user=user, name="Garage", parent_location=None)
+
+
+def names(rows):
+    return [row["name"] for row in rows]
+
+
+def age(obj, **delta):
+    type(obj).objects.filter(pk=obj.pk).update(
+        updated=timezone.now() - timedelta(**delta)
+    )
+
+
+@pytest.mark.django_db
+def test_first_sync_sends_everything(user, garage):
+    ItemFactory(user=user, name="Drill", storage_location=garage)
+    ItemFactory(name="Not mine")
+
+    changes = pull_changes(user)
+
+    assert changes["reset"] is True
+    assert names(changes["changes"]["items"]) == ["Drill"]
+    assert names(changes["changes"]["storage_locations"]) == ["Garage"]
+
+
+@pytest.mark.django_db
+def test_delta_sync_sends_only_changes_and_deletions(
+    user, garage, django_assert_num_queries
+):
+    drill = ItemFactory(user=user, name="Drill", storage_location=garage)
+    saw = ItemFactory(user=user, name="Saw", storage_location=garage)
+    for obj in [garage, drill, saw]:
+        age(obj, hours=1)
+    token = make_token(timezone.now() - timedelta(minutes=30))
+
+    drill.description = "Cordless"
+    drill.save()
+    saw_pk = saw.pk
+    saw.delete()
+
+    # One query per synced model, and one for the tombstones.
+    with django_assert_num_queries(6):
+        changes = pull_changes(user, token)
+
+    assert changes["reset"] is False
+    assert names(changes["changes"]["items"]) == ["Drill"]
+    assert changes["changes"]["storage_locations"] == []
+    assert changes["deleted"]["items"] == [saw_pk]
+
+
+@pytest.mark.django_db
+def test_saves_limited_to_some_fields_still_count_as_changes(user):
+    activity = ActivityFactory(user=user)
+    age(activity, hours=1)
+    token = make_token(timezone.now() - timedelta(minutes=30))
+
+    activity.record_completion(user)
+
+    assert names(pull_changes(user, token)["changes"]["activities"]) == [activity.name]
+
+
+@pytest.mark.django_db
+def test_old_tokens_get_a_full_resync(user, garage, settings):
+    settings.PLAN_IT_SYNC_TOMBSTONE_DAYS = 30
+    age(garage, days=60)
+    changes = pull_changes(user, make_token(timezone.now() - timedelta(days=31)))
+    assert changes["reset"] is True
+    assert names(changes["changes"]["storage_locations"]) == ["Garage"]
+
+
+@pytest.mark.django_db
+def test_mutations_create_with_client_ids_update_and_delete(user, garage):
+    saw = ItemFactory(user=user, name="Saw", storage_location=garage)
+    results = apply_mutations(
+        user,
+        [
+            {
+                "id": "m1",
+                "model": "storage_locations",
+                "op": "create",
+                "client_id": "shelf",
+                "data": {"name": "Shelf", "parent_location": garage.pk},
+            },
+            {
+                "id": "m2",
+                "model": "items",
+                "op": "create",
+                "data": {"name": "Drill", "storage_location": {"client_id": "shelf"}},
+            },
+            {
+                "id": "m3",
+                "model": "items",
+                "op": "update",
+                "pk": saw.pk,
+                "data": {"name": "Hacksaw"},
+            },
+            {"id": "m4", "model": "items", "op": "delete", "pk": saw.pk},
+        ],
+    )
+
+    assert [result["status"] for result in results] == [STATUS_APPLIED] * 4
+    assert [result["id"] for result in results] == ["m1", "m2", "m3", "m4"]
+    drill = Item.objects.get(name="Drill")
+    assert drill.storage_location.full_name == "Garage > Shelf"
+    assert not Item.objects.filter(pk=saw.pk).exists()
+    assert SyncTombstone.objects.filter(model_name="items", object_id=saw.pk).exists()
+
+
+@pytest.mark.django_db
+def test_server_wins_conflicting_updates(user, garage):
+    drill = ItemFactory(user=user, name="Drill", storage_location=garage)
+    seen = (drill.updated - timedelta(minutes=5)).isoformat()
+
+    [update, delete] = apply_mutations(
+        user,
+        [
+            {
+                "model": "items",
+                "op": "update",
+                "pk": drill.pk,
+                "updated": seen,
+                "data": {"name": "Offline name"},
+            },
+            {"model": "items", "op": "delete", "pk": drill.pk, "updated": seen},
+        ],
+    )
+
+    assert update["status"] == delete["status"] == STATUS_CONFLICT
+    assert update["object"]["name"] == "Drill"
+    assert Item.objects.get(pk=drill.pk).name == "Drill"
+
+
+@pytest.mark.django_db
+def test_offline_completions_are_recorded(user):
+    activity = ActivityFactory(user=user, due_date=date(2025, 6, 1))
+    [result] = apply_mutations(
+        user,
+        [
+            {
+                "model": "activities",
+                "op": "complete",
+                "pk": activity.pk,
+                "completed_at": "2025-06-11T08:30:00+00:00",
+            }
+        ],
+    )
+    assert result["status"] == STATUS_APPLIED
+    assert result["object"]["last_completed"] == "2025-06-11"
+    assert ActivityInstance.objects.get().activity == activity
+
+
+@pytest.mark.django_db
+def test_late_offline_completions_do_not_move_dates_back(user):
+    activity = ActivityFactory(
+        user=user,
+        is_recurring=True,
+        recurrence_unit="weeks",
+        due_date=date(2025, 6, 18),
+        last_completed=date(2025, 6, 11),
+    )
+    [result] = apply_mutations(
+        user,
+        [
+            {
+                "model": "activities",
+                "op": "complete",
+                "pk": activity.pk,
+                "completed_at": "2025-06-04T08:30:00+00:00",
+            }
+        ],
+    )
+    assert result["status"] == STATUS_APPLIED
+    assert result["object"]["last_completed"] == "2025-06-11"
+    assert result["object"]["due_date"] == "2025-06-18"
+    assert ActivityInstance.objects.get().completed_at.date() == date(2025, 6, 4)
+
+
+@pytest.mark.django_db
+def test_bad_mutations_fail_alone(user, garage):
+    theirs = StorageLocationFactory()
+    results = apply_mutations(
+        user,
+        [
+            {"model": "items", "op": "create", "data": {"name": "Drill"}},
+            {
+                "model": "items",
+                "op": "create",
+                "data": {"name": "Saw", "storage_location": theirs.pk},
+            },
+            {"model": "locations", "op": "create", "data": {}},
+            {"model": "items", "op": "frobnicate", "pk": 1},
+            {"model": "activity_types", "op": "create", "data": {"name": "Chore"}},
+            {"model": "items", "op": "update", "pk": 999999, "data": {}},
+        ],
+    )
+    assert [result["status"] for result in results] == [
+        STATUS_ERROR,
+        STATUS_ERROR,
+        STATUS_ERROR,
+        STATUS_ERROR,
+        STATUS_APPLIED,
+        STATUS_CONFLICT,
+    ]
+    assert "storage_location" in results[1]["errors"]
+
+
+@pytest.mark.django_db
+def test_mutations_whose_data_is_not_an_object_fail_alone(user):
+    drill = ItemFactory(user=user, name="Drill")
+    results = apply_mutations(
+        user,
+        [
+            {"model": "items", "op": "create", "data": ["Saw"]},
+            {"model": "items", "op": "update", "pk": drill.pk, "data": "Hammer"},
+            {"model": "activity_types", "op": "create", "data": {"name": "Chore"}},
+        ],
+    )
+    assert [result["status"] for result in results] == [
+        STATUS_ERROR,
+        STATUS_ERROR,
+        STATUS_APPLIED,
+    ]
+    assert Item.objects.get(pk=drill.pk).name == "Drill"
+
+
+@pytest.mark.django_db
+def test_location_moves_are_checked_for_cycles(user, garage):
+    shelf = StorageLocationFactory(user=user, name="Shelf", parent_location=garage)
+    [result] = apply_mutations(
+        user,
+        [
+            {
+                "model": "storage_locations",
+                "op": "update",
+                "pk": garage.pk,
+                "data": {"parent_location": shelf.pk},
+            }
+        ],
+    )
+    assert result["status"] == STATUS_ERROR
+
+
+@pytest.mark.django_db
+def test_sync_endpoint_round_trip(api, user, garage):
+    response = api.get(reverse("plan_it:sync"))
+    assert response.status_code == 200
+    token = response.data["token"]
+
+    ActivityTypeFactory(user=user, name="Chore")
+    response = api.post(
+        reverse("plan_it:sync"),
+        {
+            "token": token,
+            "mutations": [
+                {
+                    "id": "m1",
+                    "model": "items",
+                    "op": "create",
+                    "data": {"name": "Drill", "storage_location": garage.pk},
+                }
+            ],
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.data["results"][0]["status"] == STATUS_APPLIED
+    assert names(response.data["changes"]["items"]) == ["Drill"]
+    assert names(response.data["changes"]["activity_types"]) == ["Chore"]
+
+
+@pytest.mark.django_db
+def test_sync_endpoint_rejects_bad_requests(api):
+    url = reverse("plan_it:sync")
+    assert api.get(url, {"token": "forged"}).status_code == 400
+    response = api.post(url, {"token": "forged", "mutations": []}, format="json")
+    assert response.status_code == 400
+    response = api.post(url, {"mutations": {"not": "a list"}}, format="json")
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_sync_endpoint_requires_an_accepted_registration():
+    client = APIClient()
+    client.force_authenticate(UserFactory(registration_accepted=False))
+    assert client.get(reverse("plan_it:sync")).status_code == 403
+
+
+@pytest.mark.django_db
+def test_prune_sync_tombstones(user, settings):
+    settings.PLAN_IT_SYNC_TOMBSTONE_DAYS = 30
+    SyncTombstone.objects.create(
+        user=user,
+        model_name="items",
+        object_id=1,
+        deleted=timezone.now() - timedelta(days=31),
+    )
+    SyncTombstone.objects.create(user=user, model_name="items", object_id=2)
+    assert prune_sync_tombstones() == 1
+    assert list(SyncTombstone.objects.values_list("object_id", flat=True)) == [2]
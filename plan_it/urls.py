@@ -2,11 +2,13 @@
 
 from django.urls import path
 
-from . import views
+from . import api, views
 
 app_name = "plan_it"
 urlpatterns = [
     path("", views.dashboard, name="dashboard"),
+    path("search/", views.search_view, name="search"),
+    path("api/sync/", api.SyncView.as_view(), name="sync"),
     # StorageLocation
     path(
         "locations/",
@@ -28,6 +30,11 @@ urlpatterns = [
         views.StorageLocationDeleteView.as_view(),
         name="storage_location_delete",
     ),
+    path(
+        "locations/<int:pk>/merge/",
+        views.StorageLocationMergeView.as_view(),
+        name="storage_location_merge",
+    ),
     # Item
     path("items/", views.ItemListView.as_view(), name="item_list"),
     path("items/add/", views.ItemCreateView.as_view(), name="item_add"),
@@ -72,6 +79,16 @@ urlpatterns = [
         views.mark_activity_completed,
         name="activity_complete",
     ),
+    path(
+        "activities/complete/",
+        views.complete_activities_view,
+        name="activities_complete",
+    ),
+    path(
+        "activities/analytics/",
+        views.completion_analytics_view,
+        name="completion_analytics",
+    ),
     # ActivityLocation routes
     path(
         "activity-locations/",
@@ -93,4 +110,9 @@ urlpatterns = [
         views.ActivityLocationDeleteView.as_view(),
         name="activity_location_delete",
     ),
+    path(
+        "activity-locations/<int:pk>/merge/",
+        views.ActivityLocationMergeView.as_view(),
+        name="activity_location_merge",
+    ),
 ]
@@ -1,17 +1,30 @@
 # plan_it/views.py
 
-from collections import defaultdict
 from datetime import date
 
 from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.http import HttpResponseBadRequest, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views import generic
 
-from base.decorators import registration_accepted_required
+from base.decorators import query_budget, registration_accepted_required
 from base.mixins import RegistrationAcceptedMixin
 from config.settings.base import THE_SITE_NAME
 
+from .analytics import (
+    DEFAULT_PERIOD,
+    DEFAULT_WINDOW_DAYS,
+    MAX_WINDOW_DAYS,
+    PERIODS,
+    completion_analytics,
+)
+from .choices import use_cached_choices
+from .completion import complete_activities
+from .dashboard import build_activity_tree
+from .forms import LocationMergeForm
+from .locations import merge_locations, move_location
 from .models import (
     Activity,
     ActivityInstance,
@@ -20,26 +33,13 @@ from .models import (
     Item,
     StorageLocation,
 )
+from .search import DEFAULT_LIMIT, MAX_LIMIT, search
 
 
 @registration_accepted_required
 def dashboard(request):
     today = date.today()
-
-    all_activities = (
-        Activity.objects.filter(user=request.user)
-        .select_related("activity_location", "target_item")
-        .order_by("due_date")
-    )
-
-    grouped_activities = defaultdict(list)
-    for activity in all_activities:
-        loc = activity.activity_location
-        grouped_activities[loc].append(activity)
-
-    top_locations = ActivityLocation.objects.filter(
-        user=request.user, parent_location__isnull=True
-    ).prefetch_related("sublocations")
+    top_locations, uncategorized = build_activity_tree(request.user, today)
 
     items = Item.objects.filter(user=request.user).select_related("storage_location")[
         :10
@@ -53,8 +53,8 @@ def dashboard(request):
         request,
         "plan_it/dashboard.html",
         {
-            "grouped_activities": grouped_activities,
             "top_locations": top_locations,
+            "uncategorized": uncategorized,
             "items": items,
             "recent_completions": recent_completions,
             "today": today,
@@ -76,6 +76,79 @@ class UserAssignMixin:
         return super().form_valid(form)
 
 
+class CachedChoicesMixin:
+    """
+    Offer the user's own objects as the choices of the form's
+    `choice_fields`, a `{field name: model}` dict, from the per-user cache in
+    `plan_it.choices`.
+    """
+
+    choice_fields = {}
+
+    def get_excluded_path(self):
+        return None
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        use_cached_choices(
+            form,
+            self.request.user,
+            self.choice_fields,
+            exclude_path=self.get_excluded_path(),
+        )
+        return form
+
+
+class LocationUpdateMixin:
+    def get_excluded_path(self):
+        # A location can't be moved inside itself or its own subtree.
+        return self.object.path or None
+
+    def form_valid(self, form):
+        # Checked again against the locked rows, in case of a concurrent move.
+        try:
+            self.object = move_location(
+                form.instance, form.cleaned_data["parent_location"]
+            )
+        except ValidationError as error:
+            form.add_error("parent_location", error)
+            return self.form_invalid(form)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class LocationMergeMixin(CachedChoicesMixin):
+    """
+    Merge the location into another of the user's locations, chosen from
+    those outside its own subtree, with `merge_locations`.
+    """
+
+    form_class = LocationMergeForm
+    template_name = "plan_it/location_merge.html"
+
+    def get_excluded_path(self):
+        # A location can't be merged into itself or its own subtree.
+        return self.object.path or None
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        target = form.cleaned_data["target"]
+        # Checked again against the locked rows, in case of a concurrent move.
+        try:
+            merge_locations(self.object, target)
+        except ValidationError as error:
+            form.add_error("target", error)
+            return self.form_invalid(form)
+        messages.success(self.request, f"'{self.object}' merged into '{target}'.")
+        return HttpResponseRedirect(self.get_success_url())
+
+
 # ---- StorageLocation Views ----
 class StorageLocationListView(
     RegistrationAcceptedMixin, UserQuerySetMixin, generic.ListView
@@ -88,25 +161,21 @@ class StorageLocationListView(
 
 
 class StorageLocationCreateView(
-    RegistrationAcceptedMixin, UserAssignMixin, generic.CreateView
+    RegistrationAcceptedMixin, UserAssignMixin, CachedChoicesMixin, generic.CreateView
 ):
     model = StorageLocation
     fields = ["name", "parent_location"]
+    choice_fields = {"parent_location": StorageLocation}
     extra_context = {
         "page_title": "Create Storage Location",
         "the_site_name": THE_SITE_NAME,
         "mode": "create",
     }
 
-    def get_form(self, form_class=None):
-        form = super().get_form(form_class)
-        form.fields["parent_location"].queryset = StorageLocation.objects.filter(
-            user=self.request.user
-        )
-        return form
-
 
-class StorageLocationUpdateView(StorageLocationCreateView, generic.UpdateView):
+class StorageLocationUpdateView(
+    LocationUpdateMixin, StorageLocationCreateView, generic.UpdateView
+):
     extra_context = {
         "page_title": "Update Storage Location",
         "the_site_name": THE_SITE_NAME,
@@ -121,6 +190,23 @@ class StorageLocationDeleteView(
     success_url = reverse_lazy("plan_it:storage_location_list")
 
 
+class StorageLocationMergeView(
+    RegistrationAcceptedMixin,
+    LocationMergeMixin,
+    UserQuerySetMixin,
+    generic.detail.SingleObjectMixin,
+    generic.FormView,
+):
+    model = StorageLocation
+    choice_fields = {"target": StorageLocation}
+    success_url = reverse_lazy("plan_it:storage_location_list")
+    extra_context = {
+        "page_title": "Merge Storage Location",
+        "the_site_name": THE_SITE_NAME,
+        "cancel_url": success_url,
+    }
+
+
 # ---- ActivityLocation Views ----
 class ActivityLocationListView(
     RegistrationAcceptedMixin, UserQuerySetMixin, generic.ListView
@@ -133,25 +219,21 @@ class ActivityLocationListView(
 
 
 class ActivityLocationCreateView(
-    RegistrationAcceptedMixin, UserAssignMixin, generic.CreateView
+    RegistrationAcceptedMixin, UserAssignMixin, CachedChoicesMixin, generic.CreateView
 ):
     model = ActivityLocation
     fields = ["name", "parent_location"]
+    choice_fields = {"parent_location": ActivityLocation}
     extra_context = {
         "page_title": "Create Activity Location",
         "the_site_name": THE_SITE_NAME,
         "mode": "create",
     }
 
-    def get_form(self, form_class=None):
-        form = super().get_form(form_class)
-        form.fields["parent_location"].queryset = ActivityLocation.objects.filter(
-            user=self.request.user
-        )
-        return form
-
 
-class ActivityLocationUpdateView(ActivityLocationCreateView, generic.UpdateView):
+class ActivityLocationUpdateView(
+    LocationUpdateMixin, ActivityLocationCreateView, generic.UpdateView
+):
     extra_context = {
         "page_title": "Update Activity Location",
         "the_site_name": THE_SITE_NAME,
@@ -171,6 +253,23 @@ class ActivityLocationDeleteView(
     success_url = reverse_lazy("plan_it:activity_location_list")
 
 
+class ActivityLocationMergeView(
+    RegistrationAcceptedMixin,
+    LocationMergeMixin,
+    UserQuerySetMixin,
+    generic.detail.SingleObjectMixin,
+    generic.FormView,
+):
+    model = ActivityLocation
+    choice_fields = {"target": ActivityLocation}
+    success_url = reverse_lazy("plan_it:activity_location_list")
+    extra_context = {
+        "page_title": "Merge Activity Location",
+        "the_site_name": THE_SITE_NAME,
+        "cancel_url": success_url,
+    }
+
+
 # ---- Item Views ----
 class ItemListView(RegistrationAcceptedMixin, UserQuerySetMixin, generic.ListView):
     model = Item
@@ -179,23 +278,22 @@ class ItemListView(RegistrationAcceptedMixin, UserQuerySetMixin, generic.ListVie
         "the_site_name": THE_SITE_NAME,
     }
 
+    def get_queryset(self):
+        return super().get_queryset().select_related("storage_location")
+
 
-class ItemCreateView(RegistrationAcceptedMixin, UserAssignMixin, generic.CreateView):
+class ItemCreateView(
+    RegistrationAcceptedMixin, UserAssignMixin, CachedChoicesMixin, generic.CreateView
+):
     model = Item
     fields = ["name", "storage_location", "description"]
+    choice_fields = {"storage_location": StorageLocation}
     extra_context = {
         "page_title": "Create Item",
         "the_site_name": THE_SITE_NAME,
         "mode": "create",
     }
 
-    def get_form(self, form_class=None):
-        form = super().get_form(form_class)
-        form.fields["storage_location"].queryset = StorageLocation.objects.filter(
-            user=self.request.user
-        )
-        return form
-
 
 class ItemUpdateView(ItemCreateView, generic.UpdateView):
     extra_context = {
@@ -252,9 +350,15 @@ class ActivityListView(RegistrationAcceptedMixin, UserQuerySetMixin, generic.Lis
         "the_site_name": THE_SITE_NAME,
     }
 
+    def get_queryset(self):
+        return super().get_queryset().select_related("activity_location")
+
+
+RECURRENCE_FIELDS = ["recurrence_unit", "recurrence_interval"]
+
 
 class ActivityCreateView(
-    RegistrationAcceptedMixin, UserAssignMixin, generic.CreateView
+    RegistrationAcceptedMixin, UserAssignMixin, CachedChoicesMixin, generic.CreateView
 ):
     model = Activity
     fields = [
@@ -265,8 +369,15 @@ class ActivityCreateView(
         "description",
         "due_date",
         "is_recurring",
+        "recurrence_unit",
+        "recurrence_interval",
         "last_completed",
     ]
+    choice_fields = {
+        "type": ActivityType,
+        "target_item": Item,
+        "activity_location": ActivityLocation,
+    }
     extra_context = {
         "page_title": "Create Activity",
         "the_site_name": THE_SITE_NAME,
@@ -275,17 +386,17 @@ class ActivityCreateView(
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
-        form.fields["type"].queryset = ActivityType.objects.filter(
-            user=self.request.user
-        )
-        form.fields["target_item"].queryset = Item.objects.filter(
-            user=self.request.user
-        )
-        form.fields["activity_location"].queryset = ActivityLocation.objects.filter(
-            user=self.request.user
-        )
+        for name in RECURRENCE_FIELDS:
+            form.fields[name].required = False
         return form
 
+    def form_valid(self, form):
+        # Left blank, the recurrence fields fall back to repeating every day.
+        for name in RECURRENCE_FIELDS:
+            if form.cleaned_data.get(name) in (None, ""):
+                setattr(form.instance, name, Activity._meta.get_field(name).default)
+        return super().form_valid(form)
+
 
 class ActivityUpdateView(ActivityCreateView, generic.UpdateView):
     pass
@@ -313,3 +424,82 @@ def mark_activity_completed(request, pk):
         return redirect("plan_it:dashboard")
 
     return redirect("plan_it:activity_list")
+
+
+@registration_accepted_required
+def complete_activities_view(request):
+    """
+    Mark every activity posted as `activity_ids` completed in one request.
+    """
+    if request.method != "POST":
+        return redirect("plan_it:activity_list")
+
+    try:
+        activity_ids = [int(pk) for pk in request.POST.getlist("activity_ids")]
+    except ValueError:
+        return HttpResponseBadRequest("Activity IDs must be integers.")
+    instances = complete_activities(request.user, activity_ids)
+    if instances:
+        messages.success(
+            request,
+            f"Marked {len(instances)} "
+            f"{'activity' if len(instances) == 1 else 'activities'} as completed.",
+        )
+    else:
+        messages.warning(request, "No activities were selected.")
+    return redirect("plan_it:dashboard")
+
+
+@registration_accepted_required
+def completion_analytics_view(request):
+    """
+    Show how often and how regularly each activity and activity type was
+    completed over the last `days` days, bucketed by `period`.
+    """
+    period = request.GET.get("period", DEFAULT_PERIOD)
+    if period not in PERIODS:
+        period = DEFAULT_PERIOD
+    try:
+        days = int(request.GET.get("days", DEFAULT_WINDOW_DAYS))
+    except ValueError:
+        days = DEFAULT_WINDOW_DAYS
+    days = min(max(days, 1), MAX_WINDOW_DAYS)
+
+    analytics = completion_analytics(request.user, period, days)
+    return render(
+        request,
+        "plan_it/completion_analytics.html",
+        {
+            **analytics,
+            "period": period,
+            "period_choices": PERIODS,
+            "days": days,
+            "page_title": "Completion Analytics",
+            "the_site_name": THE_SITE_NAME,
+        },
+    )
+
+
+@query_budget(3)
+@registration_accepted_required
+def search_view(request):
+    """
+    JSON endpoint searching the user's items, storage locations and
+    activities, most relevant first.
+
+    Query parameters:
+
+    - `q`: the words to search for; each matches as a prefix.
+    - `limit`: the most results to return, 20 by default, at most 100.
+    """
+    query = request.GET.get("q", "").strip()
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    limit = min(max(limit, 1), MAX_LIMIT)
+
+    results = search(request.user, query, limit)
+    return JsonResponse(
+        {"query": query, "results": [result._asdict() for result in results]}
+    )
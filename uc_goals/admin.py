@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import Goal, Virtue, VIACharacterStrength
+from .models import DeadlineDigest, Goal, Virtue, VIACharacterStrength
+
+
+@admin.register(DeadlineDigest)
+class DeadlineDigestAdmin(admin.ModelAdmin):
+    list_display = ("user", "opted_out", "last_sent")
+    list_filter = ("opted_out",)
+    search_fields = ("user__username",)
 
 
 @admin.register(Goal)
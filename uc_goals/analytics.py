@@ -0,0 +1,115 @@
+"""
+Which character strengths, and through them which virtues, a user's goals lean
+on.
+
+Each goal counts once for every strength linked to it, and is weighted by the
+size of its subtree: itself plus its unarchived sub-goals, from the
+denormalized `descendant_count`. The strength counts are a grouped aggregate
+over the goals' character strength through table, and the virtue counts are
+summed from its distinct virtue and goal pairs, one query each. They are
+cached per user under a `base.cache` version, which the receivers in
+`uc_goals.signals` bump whenever one of the user's goals or its strengths
+change.
+"""
+
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+
+from base.cache import bump_cache_version, cache_version
+
+from .models import Goal
+
+CACHE_NAMESPACE = "uc_goals:strength_analytics"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+STATE_ACTIVE = "active"
+STATE_COMPLETED = "completed"
+STATE_ARCHIVED = "archived"
+STATE_ALL = "all"
+# The goals each state counts.
+STATE_FILTERS = {
+    STATE_ACTIVE: {"goal__completed": False, "goal__is_archived": False},
+    STATE_COMPLETED: {"goal__completed": True, "goal__is_archived": False},
+    STATE_ARCHIVED: {"goal__is_archived": True},
+    STATE_ALL: {},
+}
+STATES = list(STATE_FILTERS)
+DEFAULT_STATE = STATE_ACTIVE
+
+StrengthCount = namedtuple("StrengthCount", ["pk", "name", "virtue", "goals", "weight"])
+VirtueCount = namedtuple("VirtueCount", ["pk", "name", "goals", "weight"])
+
+
+def _analytics_key(user_id, state, version):
+    return f"{CACHE_NAMESPACE}:{user_id}:{state}:{version}"
+
+
+def bump_analytics_version(user_id):
+    """
+    Invalidate the strength analytics cached for the user.
+    """
+    bump_cache_version(CACHE_NAMESPACE, user_id)
+
+
+def compute_strength_analytics(user, state=DEFAULT_STATE):
+    """
+    Return `{"strengths": [StrengthCount, ...], "virtues": [VirtueCount,
+    ...]}` for `user`'s goals in `state`, heaviest first, in two queries.
+    """
+    links = Goal.character_strengths.through.objects.filter(
+        goal__user=user, **STATE_FILTERS[state]
+    )
+    subtree_size = F("goal__descendant_count") + 1
+
+    strengths = [
+        StrengthCount(
+            pk=row["viacharacterstrength"],
+            name=row["viacharacterstrength__name"],
+            virtue=row["viacharacterstrength__virtue__name"],
+            goals=row["goals"],
+            weight=row["weight"],
+        )
+        for row in links.values(
+            "viacharacterstrength",
+            "viacharacterstrength__name",
+            "viacharacterstrength__virtue__name",
+        )
+        .annotate(goals=Count("goal"), weight=Sum(subtree_size))
+        .order_by("-weight", "viacharacterstrength__name")
+    ]
+
+    # A goal with several strengths of one virtue counts once for it, so the
+    # virtues are summed over the distinct (virtue, goal) pairs.
+    virtues = {}
+    for pk, name, size, _ in links.values_list(
+        "viacharacterstrength__virtue",
+        "viacharacterstrength__virtue__name",
+        "goal__descendant_count",
+        "goal",
+    ).distinct():
+        goals, weight = virtues.get(pk, (name, 0, 0))[1:]
+        virtues[pk] = (name, goals + 1, weight + size + 1)
+    virtues = sorted(
+        (
+            VirtueCount(pk=pk, name=name, goals=goals, weight=weight)
+            for pk, (name, goals, weight) in virtues.items()
+        ),
+        key=lambda virtue: (-virtue.weight, virtue.name),
+    )
+    return {"strengths": strengths, "virtues": virtues}
+
+
+def strength_analytics(user, state=DEFAULT_STATE):
+    """
+    `compute_strength_analytics`, cached per user and state. On a warm cache
+    it costs no queries.
+    """
+    version = cache_version(CACHE_NAMESPACE, user.pk)
+    key = _analytics_key(user.pk, state, version)
+    result = cache.get(key)
+    if result is None:
+        result = compute_strength_analytics(user, state)
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
@@ -5,3 +5,8 @@ class UCGoalsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "uc_goals"
     verbose_name = "UC Goals"
+
+    def ready(self):
+        # Connect the signal receivers which keep the goals' descendant counts
+        # up to date.
+        from uc_goals import signals  # noqa: F401
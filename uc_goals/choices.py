@@ -0,0 +1,78 @@
+"""
+A per-user cache of the goals `GoalForm` offers as parents.
+
+Each user's goals are cached as `(pk, name, parent_id)` rows under a
+`base.cache` version, which the receivers in `uc_goals.signals` bump whenever
+a goal is saved or deleted. On a warm cache the parent choices cost no queries;
+validating a submitted parent still reads that one goal.
+"""
+
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from base.cache import bump_cache_version, cache_version
+
+from .models import Goal
+
+CACHE_NAMESPACE = "uc_goals:choices"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _choices_key(user_id, version):
+    return f"{CACHE_NAMESPACE}:{user_id}:{version}"
+
+
+def bump_choices_version(user_id):
+    """
+    Invalidate the goal choices cached for the user.
+    """
+    bump_cache_version(CACHE_NAMESPACE, user_id)
+
+
+def goal_rows(user):
+    """
+    Return the `(pk, name, parent_id)` rows of `user`'s goals, from the cache
+    or read in one query.
+    """
+    key = _choices_key(user.pk, cache_version(CACHE_NAMESPACE, user.pk))
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(
+            Goal.objects.filter(user=user)
+            .order_by("name", "pk")
+            .values_list("pk", "name", "parent_id")
+        )
+        cache.set(key, rows, CACHE_TIMEOUT)
+    return rows
+
+
+def subtree_pks(rows, pk):
+    """
+    Return the primary keys of the goal `pk` and its descendants in `rows`.
+    """
+    children = defaultdict(list)
+    for child_pk, _, parent_id in rows:
+        children[parent_id].append(child_pk)
+    found = set()
+    pending = [pk]
+    while pending:
+        current = pending.pop()
+        if current not in found:
+            found.add(current)
+            pending.extend(children[current])
+    return found
+
+
+def use_cached_parent_choices(field, user, goal=None):
+    """
+    Offer `user`'s goals, from the cache, as the choices of the `parent`
+    `field`, leaving out `goal` and its sub-goals, under which it can't be
+    placed.
+    """
+    rows = goal_rows(user)
+    excluded = subtree_pks(rows, goal.pk) if goal is not None and goal.pk else set()
+    # Only read to validate a submitted choice.
+    field.queryset = Goal.objects.filter(user=user).exclude(pk__in=excluded)
+    empty = [("", field.empty_label)] if field.empty_label is not None else []
+    field.choices = empty + [(pk, name) for pk, name, _ in rows if pk not in excluded]
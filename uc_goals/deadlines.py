@@ -0,0 +1,159 @@
+"""
+Upcoming and overdue goal deadlines, and the daily digest emailed about them.
+
+Only open goals count: neither completed nor archived. Every read is a range
+of `due_date` over the `(user, completed, due_date)` index, so its cost grows
+with the goals that are due, not with all the goals there are.
+
+A user's `DeadlineDigest` records whether they have opted out of the digest
+and the last day it was sent to them, so it goes out at most once a day.
+"""
+
+import logging
+from collections import namedtuple
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+
+from .models import DeadlineDigest, Goal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAYS = 14
+MAX_DAYS = 365
+# How far ahead the daily digest looks.
+DIGEST_DAYS = 7
+# Digests sent over one mail connection at a time.
+DIGEST_BATCH_SIZE = 100
+
+Deadline = namedtuple("Deadline", ["pk", "name", "due_date"])
+Digest = namedtuple("Digest", ["user_id", "username", "email", "overdue", "upcoming"])
+
+
+def upcoming_deadlines(user, today, days=DEFAULT_DAYS):
+    """
+    Return `{"overdue": [...], "upcoming": [...]}`, the user's open goals due
+    before `today` and those due in the next `days` days, soonest first, in
+    one range scan each.
+    """
+    goals = Goal.objects.filter(user=user, completed=False, is_archived=False).order_by(
+        "due_date", "pk"
+    )
+    return {
+        "overdue": list(goals.filter(due_date__lt=today)),
+        "upcoming": list(
+            goals.filter(due_date__gte=today, due_date__lte=today + timedelta(days))
+        ),
+    }
+
+
+def build_digests(today, days=DIGEST_DAYS):
+    """
+    Return a `Digest` for every active user with an email address and an
+    open goal that is overdue or due in the next `days` days, read in one
+    query for all of them. Users who opted out, or were sent their digest
+    `today` already, are left out.
+    """
+    rows = (
+        Goal.objects.filter(
+            completed=False,
+            is_archived=False,
+            due_date__lte=today + timedelta(days),
+            user__is_active=True,
+        )
+        .exclude(user__email="")
+        .exclude(
+            Q(user__uc_goals_deadline_digest__opted_out=True)
+            | Q(user__uc_goals_deadline_digest__last_sent__gte=today)
+        )
+        .order_by("user_id", "due_date", "pk")
+        .values_list(
+            "user_id", "user__username", "user__email", "pk", "name", "due_date"
+        )
+    )
+    digests = []
+    for (user_id, username, email), goals in groupby(rows, key=lambda row: row[:3]):
+        deadlines = [Deadline(*row[3:]) for row in goals]
+        digests.append(
+            Digest(
+                user_id=user_id,
+                username=username,
+                email=email,
+                overdue=[goal for goal in deadlines if goal.due_date < today],
+                upcoming=[goal for goal in deadlines if goal.due_date >= today],
+            )
+        )
+    return digests
+
+
+def digest_message(digest, today):
+    """
+    Return the `EmailMessage` for `digest`.
+    """
+    lines = [f"Hi {digest.username},", "", "These goals of yours need attention.", ""]
+    for title, deadlines in [
+        ("Overdue", digest.overdue),
+        ("Due soon", digest.upcoming),
+    ]:
+        if deadlines:
+            lines.append(f"{title}:")
+            lines.extend(
+                f"- {goal.name} ({goal.due_date:%a %d %b})" for goal in deadlines
+            )
+            lines.append("")
+    lines.append("You can stop these emails on your Upcoming Deadlines page.")
+    return EmailMessage(
+        subject=f"Your goal deadlines for {today:%a %d %b}",
+        body="\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[digest.email],
+    )
+
+
+def mark_digests_sent(user_ids, today):
+    """
+    Record that the users with `user_ids` were sent their digest `today`, in
+    one query.
+    """
+    DeadlineDigest.objects.bulk_create(
+        [DeadlineDigest(user_id=user_id, last_sent=today) for user_id in user_ids],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["last_sent"],
+    )
+
+
+def send_digests(digests, today, batch_size=DIGEST_BATCH_SIZE):
+    """
+    Email each of `digests`, `batch_size` messages per mail connection, and
+    mark the users they reached as sent `today`. Returns the number of
+    messages sent.
+
+    A message or a whole batch that fails is logged and skipped, so one mail
+    error doesn't stop the rest. Its users aren't marked, so sending again
+    the same day reaches only them.
+    """
+    sent = 0
+    for start in range(0, len(digests), batch_size):
+        batch = digests[start : start + batch_size]  # noqa: E203
+        delivered = []
+        # SMTP and socket errors are all `OSError`s.
+        try:
+            with get_connection() as connection:
+                for digest in batch:
+                    try:
+                        if connection.send_messages([digest_message(digest, today)]):
+                            delivered.append(digest.user_id)
+                    except OSError:
+                        logger.exception(
+                            "Could not send the deadline digest to user %s.",
+                            digest.user_id,
+                        )
+        except OSError:
+            logger.exception("Could not send a batch of deadline digests.")
+        mark_digests_sent(delivered, today)
+        sent += len(delivered)
+    return sent
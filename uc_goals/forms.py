@@ -1,17 +1,20 @@
 from django import forms
 
+from .choices import use_cached_parent_choices
 from .models import Goal
 
 
 class GoalForm(forms.ModelForm):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, user=None, **kwargs):
         """
-        Override the __init__ method to filter the queryset for the parent field. This
-        prevents a goal from being its own parent.
+        Override the __init__ method to filter the choices for the parent field.
+        Only the user's own goals are offered, from the cache in `uc_goals.choices`,
+        and never the goal itself or one of its sub-goals, which would make a cycle.
         """
         super().__init__(*args, **kwargs)
+        if user is not None:
+            use_cached_parent_choices(self.fields["parent"], user, self.instance)
         if self.instance.pk:  # If updating an existing instance
-            self.fields["parent"].queryset = Goal.objects.exclude(pk=self.instance.pk)
             # Set initial values for the M2M field from related objects
             self.fields["character_strengths"].initial = (
                 self.instance.character_strengths.all()
@@ -0,0 +1,86 @@
+"""
+Reparent goals without creating cycles, and archive or unarchive whole
+subtrees.
+
+Both walk the tree with a recursive query over indexed columns instead of
+loading it, so their cost grows with the depth or size of the part of the
+tree involved, not with the number of goals.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .analytics import bump_analytics_version
+from .models import (
+    Goal,
+    adjust_ancestor_counts,
+    ancestor_ids,
+    goal_contribution,
+    rebuild_goal_progress,
+    subtree_ids,
+)
+
+
+def check_reparent(goal, parent):
+    """
+    Raise `ValidationError` unless `goal` can be placed under `parent`, read
+    from their current rows.
+    """
+    if parent is None:
+        return
+    if parent.user_id != goal.user_id:
+        raise ValidationError("A goal can't be placed under another user's goal.")
+    ancestors = Goal.objects.filter(pk__in=ancestor_ids(Goal, parent.pk))
+    if goal.pk and ancestors.filter(pk=goal.pk).exists():
+        raise ValidationError("A goal can't be placed under itself or its sub-goals.")
+
+
+def reparent_goal(goal, parent):
+    """
+    Place `goal` and its subtree under `parent`, or at the top level if
+    `parent` is `None`, in one transaction. Unsaved changes to `goal` are
+    saved along with the move.
+    """
+    with transaction.atomic():
+        if parent is not None:
+            # Locked, so a concurrent move can't slip a cycle past the check.
+            parent = Goal.objects.select_for_update().get(pk=parent.pk)
+        check_reparent(goal, parent)
+        goal.parent = parent
+        goal.save()
+    return goal
+
+
+def set_subtree_archived(goal, archived):
+    """
+    Archive or unarchive `goal` and all of its sub-goals with one `UPDATE`,
+    and bring the descendant counts up to date. Returns the number of goals
+    in the subtree.
+    """
+    with transaction.atomic():
+        goal = Goal.objects.select_for_update().get(pk=goal.pk)
+        old_total, old_completed = goal_contribution(goal)
+        old_total += goal.descendant_count
+        old_completed += goal.completed_descendant_count
+
+        subtree = Goal.objects.filter(pk__in=subtree_ids(Goal, goal.pk))
+        if archived:
+            # Archived goals count for nothing, so neither do their subtrees.
+            updated = subtree.update(
+                is_archived=True, descendant_count=0, completed_descendant_count=0
+            )
+        else:
+            updated = subtree.update(is_archived=False)
+            rebuild_goal_progress(Goal, subtree)
+
+        goal.refresh_from_db()
+        new_total, new_completed = goal_contribution(goal)
+        adjust_ancestor_counts(
+            Goal,
+            goal.parent_id,
+            new_total + goal.descendant_count - old_total,
+            new_completed + goal.completed_descendant_count - old_completed,
+        )
+    # The bulk update sends no signals.
+    bump_analytics_version(goal.user_id)
+    return updated
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from uc_goals.models import Goal, rebuild_goal_progress
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every goal's total and completed descendant counts from the "
+        "goal trees, e.g. after `loaddata` or a queryset `update`."
+    )
+
+    def handle(self, *args, **options):
+        written = rebuild_goal_progress(Goal)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the progress of {written} goals.")
+        )
@@ -0,0 +1,69 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+def build_goal_progress(apps, schema_editor):
+    Goal = apps.get_model("uc_goals", "Goal")
+    goals = {
+        goal.pk: goal
+        for goal in Goal.objects.only("pk", "parent", "completed", "is_archived")
+    }
+    children = {pk: [] for pk in goals}
+    pending = []
+    for goal in goals.values():
+        if goal.parent_id in goals:
+            children[goal.parent_id].append(goal)
+        else:
+            pending.append(goal)
+
+    # Every goal is visited after all of its children. Goals caught in a
+    # parent cycle are never reached and keep counts of 0.
+    order = []
+    while pending:
+        goal = pending.pop()
+        order.append(goal)
+        pending.extend(children[goal.pk])
+    for goal in reversed(order):
+        for child in children[goal.pk]:
+            # Archived goals count for nothing.
+            if not child.is_archived:
+                goal.descendant_count += 1 + child.descendant_count
+                goal.completed_descendant_count += (
+                    int(child.completed) + child.completed_descendant_count
+                )
+
+    Goal.objects.bulk_update(
+        goals.values(),
+        ["descendant_count", "completed_descendant_count"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("uc_goals", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="goal",
+            name="completed_descendant_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="How many of the unarchived goals below this one are completed.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="goal",
+            name="descendant_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="How many unarchived goals are below this one.",
+            ),
+        ),
+        migrations.RunPython(build_goal_progress, migrations.RunPython.noop),
+    ]
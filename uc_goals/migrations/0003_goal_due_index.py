@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("uc_goals", "0002_goal_progress"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["user", "completed", "due_date"], name="uc_goals_goal_due_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("uc_goals", "0003_goal_due_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeadlineDigest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "opted_out",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the user has stopped the digest.",
+                    ),
+                ),
+                (
+                    "last_sent",
+                    models.DateField(
+                        blank=True,
+                        editable=False,
+                        help_text="The last day the digest was sent, so it is sent once a day.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        help_text="The user the digest is emailed to.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="uc_goals_deadline_digest",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Deadline Digest",
+                "verbose_name_plural": "Deadline Digests",
+            },
+        ),
+    ]
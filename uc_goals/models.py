@@ -1,8 +1,117 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.expressions import RawSQL
 from django.urls import reverse
 
 from django.conf import settings
 
+# The primary keys of a goal and all of its ancestors, each step an index
+# lookup on the primary key. `UNION` rather than `UNION ALL` stops the
+# recursion should the parents ever form a cycle.
+ANCESTORS_SQL = """
+WITH RECURSIVE ancestors(id, parent_id) AS (
+    SELECT id, parent_id FROM {table} WHERE id = %s
+    UNION
+    SELECT goal.id, goal.parent_id
+    FROM {table} AS goal JOIN ancestors ON goal.id = ancestors.parent_id
+)
+SELECT id FROM ancestors
+"""
+# The primary keys of a goal and all of its descendants, each step an index
+# lookup on `parent_id`.
+SUBTREE_SQL = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT id FROM {table} WHERE id = %s
+    UNION
+    SELECT goal.id FROM {table} AS goal JOIN subtree ON goal.parent_id = subtree.id
+)
+SELECT id FROM subtree
+"""
+
+
+def ancestor_ids(model, goal_id):
+    """
+    A subquery of the primary keys of the goal with `goal_id` and its
+    ancestors, for use in `pk__in`.
+    """
+    return RawSQL(ANCESTORS_SQL.format(table=model._meta.db_table), [goal_id])
+
+
+def subtree_ids(model, goal_id):
+    """
+    A subquery of the primary keys of the goal with `goal_id` and its
+    descendants, for use in `pk__in`.
+    """
+    return RawSQL(SUBTREE_SQL.format(table=model._meta.db_table), [goal_id])
+
+
+def adjust_ancestor_counts(model, goal_id, total, completed):
+    """
+    Add `total` and `completed` to the descendant counts of the goal with
+    `goal_id` and of each of its ancestors, in one query.
+    """
+    if goal_id is None or not (total or completed):
+        return
+    model.objects.filter(pk__in=ancestor_ids(model, goal_id)).update(
+        descendant_count=F("descendant_count") + total,
+        completed_descendant_count=F("completed_descendant_count") + completed,
+    )
+
+
+def rebuild_goal_progress(model, queryset=None):
+    """
+    Recompute the descendant counts of every goal of `model` in `queryset`
+    (all of them by default) from the tree, bottom-up, in one read and one
+    bulk write. Returns the number of goals updated.
+    """
+    if queryset is None:
+        queryset = model.objects.all()
+    goals = {
+        goal.pk: goal
+        for goal in queryset.only("pk", "parent", "completed", "is_archived")
+    }
+    children = {pk: [] for pk in goals}
+    roots = []
+    for goal in goals.values():
+        goal.descendant_count = goal.completed_descendant_count = 0
+        if goal.parent_id in goals:
+            children[goal.parent_id].append(goal)
+        else:
+            roots.append(goal)
+
+    # Every goal is visited after all of its children. Goals caught in a
+    # parent cycle are never reached and keep counts of 0.
+    order = []
+    pending = list(roots)
+    while pending:
+        goal = pending.pop()
+        order.append(goal)
+        pending.extend(children[goal.pk])
+    for goal in reversed(order):
+        for child in children[goal.pk]:
+            total, completed = goal_contribution(child)
+            goal.descendant_count += total + child.descendant_count
+            goal.completed_descendant_count += (
+                completed + child.completed_descendant_count
+            )
+
+    model.objects.bulk_update(
+        goals.values(),
+        ["descendant_count", "completed_descendant_count"],
+        batch_size=500,
+    )
+    return len(goals)
+
+
+def goal_contribution(goal):
+    """
+    Return what `goal` itself adds to its ancestors' `(total, completed)`
+    descendant counts. Archived goals count for nothing.
+    """
+    if goal.is_archived:
+        return 0, 0
+    return 1, int(goal.completed)
+
 
 class Goal(models.Model):
     user = models.ForeignKey(
@@ -30,6 +139,16 @@ class Goal(models.Model):
     due_date = models.DateField(blank=True, null=True)
     completed = models.BooleanField(default=False)
     is_archived = models.BooleanField(default=False)
+    descendant_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="How many unarchived goals are below this one.",
+    )
+    completed_descendant_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="How many of the unarchived goals below this one are completed.",
+    )
 
     def get_absolute_url(self):
         """
@@ -41,9 +160,113 @@ class Goal(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def progress(self):
+        """
+        The percentage of the goals below this one that are completed, or
+        `None` if there are none.
+        """
+        if not self.descendant_count:
+            return None
+        return round(100 * self.completed_descendant_count / self.descendant_count)
+
+    def save(self, *args, **kwargs):
+        """
+        Save the goal and update its ancestors' descendant counts for it
+        being created, completed, archived or moved, with one query per
+        ancestor chain changed.
+
+        The counts are kept up to date by this method and by the
+        `pre_delete` receiver in `uc_goals.signals`. Queryset `update`s and
+        `loaddata` bypass them; run `manage.py rebuild_goal_progress` after
+        those.
+        """
+        model = type(self)
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                adjust_ancestor_counts(model, self.parent_id, *goal_contribution(self))
+                return
+
+            old = (
+                model.objects.select_for_update()
+                .only(
+                    "parent",
+                    "completed",
+                    "is_archived",
+                    "descendant_count",
+                    "completed_descendant_count",
+                )
+                .get(pk=self.pk)
+            )
+            # The counts in the database are current; this instance's may not be.
+            self.descendant_count = old.descendant_count
+            self.completed_descendant_count = old.completed_descendant_count
+            super().save(*args, **kwargs)
+
+            old_total, old_completed = goal_contribution(old)
+            new_total, new_completed = goal_contribution(self)
+            if old.parent_id != self.parent_id:
+                adjust_ancestor_counts(
+                    model,
+                    old.parent_id,
+                    -(old_total + old.descendant_count),
+                    -(old_completed + old.completed_descendant_count),
+                )
+                adjust_ancestor_counts(
+                    model,
+                    self.parent_id,
+                    new_total + self.descendant_count,
+                    new_completed + self.completed_descendant_count,
+                )
+            else:
+                adjust_ancestor_counts(
+                    model,
+                    self.parent_id,
+                    new_total - old_total,
+                    new_completed - old_completed,
+                )
+
     class Meta:
         verbose_name = "Goal"
         verbose_name_plural = "Goals"
+        indexes = [
+            # Upcoming and overdue deadlines are ranges of `due_date` within one
+            # user's open goals.
+            models.Index(
+                fields=["user", "completed", "due_date"], name="uc_goals_goal_due_idx"
+            ),
+        ]
+
+
+class DeadlineDigest(models.Model):
+    """
+    A user's daily goal deadline digest: whether they want it, and the last
+    day it was sent. Users without one get the digest.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="uc_goals_deadline_digest",
+        help_text="The user the digest is emailed to.",
+    )
+    opted_out = models.BooleanField(
+        default=False, help_text="Whether the user has stopped the digest."
+    )
+    last_sent = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="The last day the digest was sent, so it is sent once a day.",
+    )
+
+    class Meta:
+        verbose_name = "Deadline Digest"
+        verbose_name_plural = "Deadline Digests"
+
+    def __str__(self):
+        return f"{self.user} | {'opted out' if self.opted_out else 'subscribed'}"
 
 
 class Virtue(models.Model):
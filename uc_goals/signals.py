@@ -0,0 +1,66 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from uc_goals.analytics import bump_analytics_version
+from uc_goals.choices import bump_choices_version
+from uc_goals.models import Goal, adjust_ancestor_counts, goal_contribution
+
+
+@receiver(pre_delete, sender=Goal)
+def uncount_deleted_goal(sender, instance, **kwargs):
+    """
+    Take a deleted goal out of its ancestors' descendant counts.
+
+    Deleting a goal deletes its sub-goals too, and each of them is taken out
+    by its own call, before any of the rows are gone, so this works for
+    cascades and queryset deletes alike.
+    """
+    adjust_ancestor_counts(
+        sender, instance.parent_id, *(-count for count in goal_contribution(instance))
+    )
+
+
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+def invalidate_cached_choices(sender, instance, raw=False, **kwargs):
+    """
+    Drop the user's cached parent choices when one of their goals changes.
+    """
+    if raw:
+        return
+    bump_choices_version(instance.user_id)
+
+
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+def invalidate_analytics_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Drop the user's cached strength analytics when one of their goals, or its
+    place in the tree, changes.
+    """
+    if raw:
+        return
+    bump_analytics_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Goal.character_strengths.through)
+def invalidate_analytics_on_strengths(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Drop the cached strength analytics of the users whose goals gained or lost
+    a character strength, whichever side of the relation was changed.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        user_ids = {instance.user_id}
+    elif action == "pre_clear":
+        # Read before the links are gone.
+        user_ids = set(instance.goals.values_list("user_id", flat=True))
+    else:
+        user_ids = set(
+            Goal.objects.filter(pk__in=pk_set).values_list("user_id", flat=True)
+        )
+    for user_id in user_ids:
+        bump_analytics_version(user_id)
@@ -0,0 +1,26 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.utils import timezone
+
+from .deadlines import build_digests, send_digests
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30 * 60)
+def send_deadline_digests(self):
+    """
+    Email every user a digest of their overdue goals and those due in the next
+    week, from one query for all users, sent in batches over shared mail
+    connections. Scheduled daily by Celery beat, see `CELERY_BEAT_SCHEDULE`.
+
+    Retried later if some digests could not be sent. Users already sent their
+    digest that day are skipped, so running it again is safe.
+    """
+    today = timezone.localdate()
+    digests = build_digests(today)
+    sent = send_digests(digests, today)
+    logger.info("Sent %s goal deadline digests.", sent)
+    if sent < len(digests):
+        raise self.retry()
+    return sent
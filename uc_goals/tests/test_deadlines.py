@@ -0,0 +1,159 @@
+import smtplib
+from datetime import date, timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from uc_goals.deadlines import build_digests, send_digests, upcoming_deadlines
+from uc_goals.models import DeadlineDigest, Goal
+from uc_goals.tasks import send_deadline_digests
+
+TODAY = date(2025, 6, 11)
+
+
+class RefusingUser1Backend(locmem.EmailBackend):
+    def send_messages(self, messages):
+        if any("user1@example.com" in message.to for message in messages):
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+
+class DeadlinesTestCase(TestCase):
+    def setUp(self):
+        self.user = self.make_user("user1")
+        self.other_user = self.make_user("user2")
+
+    def make_user(self, username, **kwargs):
+        kwargs.setdefault("email", f"{username}@example.com")
+        return get_user_model().objects.create_user(
+            username=username,
+            password="password123",
+            registration_accepted=True,
+            **kwargs,
+        )
+
+    def goal(self, name, days, user=None, **kwargs):
+        return Goal.objects.create(
+            user=user or self.user,
+            name=name,
+            due_date=TODAY + timedelta(days),
+            **kwargs,
+        )
+
+
+class UpcomingDeadlinesTest(DeadlinesTestCase):
+    def test_splits_open_goals_into_overdue_and_upcoming(self):
+        late = self.goal("Late", -3)
+        soon = self.goal("Soon", 2)
+        today = self.goal("Today", 0)
+        self.goal("Later", 30)
+        self.goal("Done", 1, completed=True)
+        self.goal("Shelved", 1, is_archived=True)
+        self.goal("Theirs", 1, user=self.other_user)
+        Goal.objects.create(user=self.user, name="Someday")
+
+        deadlines = upcoming_deadlines(self.user, TODAY, days=14)
+
+        self.assertEqual(deadlines["overdue"], [late])
+        self.assertEqual(deadlines["upcoming"], [today, soon])
+
+    def test_view(self):
+        self.goal("Late", -3)
+        self.client.login(username="user1", password="password123")
+
+        response = self.client.get(
+            reverse("uc_goals:upcoming_deadlines"), {"days": "x"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["days"], 14)
+        self.assertContains(response, "Late")
+        self.assertFalse(response.context["digest_opted_out"])
+
+    def test_opting_out_of_the_digest(self):
+        self.client.login(username="user1", password="password123")
+        url = reverse("uc_goals:deadline_digest")
+
+        self.client.post(url, {"opted_out": "1"})
+        self.assertTrue(DeadlineDigest.objects.get(user=self.user).opted_out)
+        response = self.client.get(reverse("uc_goals:upcoming_deadlines"))
+        self.assertTrue(response.context["digest_opted_out"])
+
+        self.client.post(url, {"opted_out": "0"})
+        self.assertFalse(DeadlineDigest.objects.get(user=self.user).opted_out)
+
+
+class DeadlineDigestTest(DeadlinesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.goal("Late", -1)
+        self.goal("Soon", 3)
+        self.goal("Later", 30)
+        self.goal("Theirs", 0, user=self.other_user)
+        self.goal("No Email", 0, user=self.make_user("nomail", email=""))
+        self.goal("Inactive", 0, user=self.make_user("gone", is_active=False))
+
+    def test_builds_every_digest_in_one_query(self):
+        with self.assertNumQueries(1):
+            digests = build_digests(TODAY)
+
+        self.assertEqual([digest.username for digest in digests], ["user1", "user2"])
+        mine = digests[0]
+        self.assertEqual([goal.name for goal in mine.overdue], ["Late"])
+        self.assertEqual([goal.name for goal in mine.upcoming], ["Soon"])
+
+    def test_leaves_out_users_who_opted_out_or_were_sent_today(self):
+        DeadlineDigest.objects.create(user=self.user, opted_out=True)
+        DeadlineDigest.objects.create(user=self.other_user, last_sent=TODAY)
+
+        self.assertEqual(build_digests(TODAY), [])
+        self.assertEqual(len(build_digests(TODAY + timedelta(1))), 1)
+
+    def test_sends_digests_in_batches(self):
+        with mock.patch(
+            "uc_goals.deadlines.get_connection", wraps=mail.get_connection
+        ) as get_connection:
+            sent = send_digests(build_digests(TODAY), TODAY, batch_size=1)
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(get_connection.call_count, 2)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["user1@example.com"])
+        self.assertEqual(message.from_email, settings.DEFAULT_FROM_EMAIL)
+        self.assertIn("- Late (Tue 10 Jun)", message.body)
+        self.assertIn("- Soon (Sat 14 Jun)", message.body)
+        self.assertEqual(
+            set(DeadlineDigest.objects.values_list("last_sent", flat=True)), {TODAY}
+        )
+
+    def test_sends_each_digest_once_a_day(self):
+        send_digests(build_digests(TODAY), TODAY)
+
+        self.assertEqual(send_digests(build_digests(TODAY), TODAY), 0)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_a_failed_digest_does_not_stop_the_others(self):
+        with mock.patch(
+            "uc_goals.deadlines.get_connection", RefusingUser1Backend
+        ), self.assertLogs("uc_goals.deadlines", "ERROR"):
+            sent = send_digests(build_digests(TODAY), TODAY, batch_size=1)
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(
+            [message.to for message in mail.outbox], [["user2@example.com"]]
+        )
+        # Only the failed digest is sent on the next run.
+        self.assertEqual(send_digests(build_digests(TODAY), TODAY), 1)
+        self.assertEqual(mail.outbox[-1].to, ["user1@example.com"])
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_task_sends_one_email_per_user(self):
+        with mock.patch("uc_goals.tasks.timezone.localdate", return_value=TODAY):
+            self.assertEqual(send_deadline_digests.delay().get(), 2)
+
+        self.assertEqual(len(mail.outbox), 2)
@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+
+from uc_goals.forms import GoalForm
+from uc_goals.hierarchy import reparent_goal, set_subtree_archived
+from uc_goals.models import Goal
+
+
+class GoalHierarchyTestCase(TestCase):
+    """
+    Concern > Goal > Sub-Goal, and Other Concern.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="user1", password="password123", registration_accepted=True
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username="user2", password="password123", registration_accepted=True
+        )
+        self.concern = self.create("Concern", is_ultimate_concern=True)
+        self.goal = self.create("Goal", parent=self.concern)
+        self.sub_goal = self.create("Sub-Goal", parent=self.goal, completed=True)
+        self.other_concern = self.create("Other Concern", is_ultimate_concern=True)
+        self.not_mine = Goal.objects.create(user=self.other_user, name="Not Mine")
+
+    def create(self, name, **kwargs):
+        return Goal.objects.create(user=self.user, name=name, **kwargs)
+
+    def counts(self, goal):
+        goal.refresh_from_db()
+        return goal.descendant_count, goal.completed_descendant_count
+
+
+class ReparentGoalTest(GoalHierarchyTestCase):
+    def test_moves_the_goal(self):
+        reparent_goal(self.goal, self.other_concern)
+
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.parent, self.other_concern)
+        self.assertEqual(self.counts(self.other_concern), (2, 1))
+
+    def test_refuses_cycles(self):
+        for parent in [self.goal, self.sub_goal]:
+            with self.assertRaises(ValidationError):
+                reparent_goal(self.goal, parent)
+        self.goal.refresh_from_db()
+        self.assertEqual(self.goal.parent, self.concern)
+
+    def test_refuses_another_users_goal(self):
+        with self.assertRaises(ValidationError):
+            reparent_goal(self.goal, self.not_mine)
+
+
+class SetSubtreeArchivedTest(GoalHierarchyTestCase):
+    def test_archives_and_unarchives_the_subtree(self):
+        self.assertEqual(set_subtree_archived(self.goal, True), 2)
+
+        self.assertEqual(
+            set(Goal.objects.filter(is_archived=True).values_list("name", flat=True)),
+            {"Goal", "Sub-Goal"},
+        )
+        self.assertEqual(self.counts(self.concern), (0, 0))
+
+        set_subtree_archived(self.goal, False)
+
+        self.assertFalse(Goal.objects.filter(is_archived=True).exists())
+        self.assertEqual(self.counts(self.concern), (2, 1))
+        self.assertEqual(self.counts(self.goal), (1, 1))
+
+    def test_archives_in_a_fixed_number_of_queries(self):
+        deep = self.sub_goal
+        for level in range(10):
+            deep = self.create(f"Level {level}", parent=deep)
+        # Savepoint, lock, one update for the subtree, refresh, one for the
+        # ancestors and release, however deep the subtree is.
+        with self.assertNumQueries(6):
+            set_subtree_archived(self.goal, True)
+        self.assertEqual(Goal.objects.filter(is_archived=True).count(), 12)
+        self.assertEqual(self.counts(self.concern), (0, 0))
+
+    def test_view_archives_the_subtree(self):
+        self.client.login(username="user1", password="password123")
+        url = reverse("uc_goals:goal_archive", kwargs={"pk": self.goal.pk})
+
+        self.client.post(url)
+        self.assertTrue(Goal.objects.get(pk=self.sub_goal.pk).is_archived)
+        self.client.post(url, {"archived": "0"})
+        self.assertFalse(Goal.objects.get(pk=self.sub_goal.pk).is_archived)
+
+        response = self.client.post(
+            reverse("uc_goals:goal_archive", kwargs={"pk": self.not_mine.pk})
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class GoalFormParentChoicesTest(GoalHierarchyTestCase):
+    def parent_choices(self, form):
+        return [label for pk, label in form.fields["parent"].choices if pk]
+
+    def test_offers_only_the_users_goals_outside_the_subtree(self):
+        form = GoalForm(instance=self.goal, user=self.user)
+
+        self.assertEqual(self.parent_choices(form), ["Concern", "Other Concern"])
+
+    def test_refuses_a_sub_goal_as_parent(self):
+        form = GoalForm(
+            {"name": "Goal", "parent": self.sub_goal.pk},
+            instance=self.goal,
+            user=self.user,
+        )
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("parent", form.errors)
+
+    def test_choices_are_cached(self):
+        GoalForm(user=self.user)
+        with self.assertNumQueries(0):
+            form = GoalForm(user=self.user)
+            choices = self.parent_choices(form)
+        self.assertIn("Sub-Goal", choices)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create("New Goal")
+        self.assertIn("New Goal", self.parent_choices(GoalForm(user=self.user)))
+
+    def test_update_view_saves_the_new_parent(self):
+        self.client.login(username="user1", password="password123")
+
+        response = self.client.post(
+            reverse("uc_goals:goal_update", kwargs={"pk": self.goal.pk}),
+            {"name": "Goal", "parent": self.other_concern.pk},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.counts(self.other_concern), (2, 1))
+        self.assertEqual(self.counts(self.concern), (0, 0))
@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from uc_goals.models import Goal
+
+
+class GoalProgressTest(TestCase):
+    """
+    Concern > Goal > Sub-Goal, and Other Concern.
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="user1", password="password123", registration_accepted=True
+        )
+        self.concern = self.create("Concern", is_ultimate_concern=True)
+        self.goal = self.create("Goal", parent=self.concern)
+        self.sub_goal = self.create("Sub-Goal", parent=self.goal)
+        self.other_concern = self.create("Other Concern", is_ultimate_concern=True)
+
+    def create(self, name, **kwargs):
+        return Goal.objects.create(user=self.user, name=name, **kwargs)
+
+    def counts(self, goal):
+        goal.refresh_from_db()
+        return goal.descendant_count, goal.completed_descendant_count
+
+    def rebuild(self):
+        call_command("rebuild_goal_progress", stdout=StringIO())
+
+    def assertCountsMatchRebuild(self):
+        def all_counts():
+            return list(
+                Goal.objects.order_by("pk").values_list(
+                    "pk", "descendant_count", "completed_descendant_count"
+                )
+            )
+
+        incremental = all_counts()
+        self.rebuild()
+        self.assertEqual(incremental, all_counts())
+
+    def test_creating_counts_for_every_ancestor(self):
+        self.assertEqual(self.counts(self.concern), (2, 0))
+        self.assertEqual(self.counts(self.goal), (1, 0))
+        self.assertEqual(self.counts(self.sub_goal), (0, 0))
+        self.assertCountsMatchRebuild()
+
+    def test_completing_and_archiving(self):
+        self.sub_goal.completed = True
+        self.sub_goal.save()
+        self.assertEqual(self.counts(self.concern), (2, 1))
+        self.assertEqual(self.concern.progress, 50)
+
+        self.sub_goal.is_archived = True
+        self.sub_goal.save()
+        self.assertEqual(self.counts(self.concern), (1, 0))
+        self.assertEqual(self.counts(self.goal), (0, 0))
+        self.assertIsNone(self.goal.progress)
+        self.assertCountsMatchRebuild()
+
+    def test_moving_carries_the_subtree(self):
+        self.sub_goal.completed = True
+        self.sub_goal.save()
+
+        self.goal.parent = self.other_concern
+        self.goal.save()
+
+        self.assertEqual(self.counts(self.concern), (0, 0))
+        self.assertEqual(self.counts(self.other_concern), (2, 1))
+        self.assertCountsMatchRebuild()
+
+    def test_saving_a_stale_instance_keeps_the_counts(self):
+        stale = Goal.objects.get(pk=self.goal.pk)
+        self.create("Another Sub-Goal", parent=self.goal)
+
+        stale.name = "Renamed"
+        stale.save()
+
+        self.assertEqual(self.counts(self.goal), (2, 0))
+
+    def test_deleting_uncounts_the_subtree(self):
+        self.create("Sibling", parent=self.concern, completed=True)
+        self.assertEqual(self.counts(self.concern), (3, 1))
+
+        self.goal.delete()
+
+        self.assertEqual(self.counts(self.concern), (1, 1))
+        Goal.objects.filter(name="Sibling").delete()
+        self.assertEqual(self.counts(self.concern), (0, 0))
+
+    def test_queries_do_not_grow_with_depth(self):
+        def completing_costs(goal):
+            goal.completed = True
+            with CaptureQueriesContext(connection) as queries:
+                goal.save()
+            return len(queries)
+
+        deep = self.sub_goal
+        for level in range(5):
+            deep = self.create(f"Level {level}", parent=deep)
+        self.assertEqual(completing_costs(self.goal), completing_costs(deep))
+        self.assertEqual(self.counts(self.concern), (7, 2))
+
+    def test_rebuild_fixes_bypassed_updates(self):
+        Goal.objects.filter(pk=self.sub_goal.pk).update(completed=True)
+        Goal.objects.update(descendant_count=0)
+
+        self.rebuild()
+
+        self.assertEqual(self.counts(self.concern), (2, 1))
+        self.assertEqual(self.counts(self.goal), (1, 1))
@@ -0,0 +1,136 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from uc_goals.analytics import (
+    STATE_ACTIVE,
+    STATE_ALL,
+    STATE_ARCHIVED,
+    STATE_COMPLETED,
+    strength_analytics,
+)
+from uc_goals.hierarchy import set_subtree_archived
+from uc_goals.models import Goal, Virtue, VIACharacterStrength
+
+
+class StrengthAnalyticsTest(TestCase):
+    """
+    Concern (Curiosity, Creativity) with the sub-goals Goal (Curiosity) and
+    Sub-Goal (Bravery, completed), and another user's goal (Curiosity).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="user1", password="password123", registration_accepted=True
+        )
+        other_user = get_user_model().objects.create_user(
+            username="user2", password="password123", registration_accepted=True
+        )
+        wisdom = Virtue.objects.create(name="Wisdom", description="Knowing")
+        courage = Virtue.objects.create(name="Courage", description="Doing")
+        self.curiosity = self.strength("Curiosity", wisdom)
+        self.creativity = self.strength("Creativity", wisdom)
+        self.bravery = self.strength("Bravery", courage)
+
+        self.concern = self.goal("Concern", [self.curiosity, self.creativity])
+        self.goal("Goal", [self.curiosity], parent=self.concern)
+        self.sub_goal = self.goal(
+            "Sub-Goal", [self.bravery], parent=self.concern, completed=True
+        )
+        Goal.objects.create(user=other_user, name="Theirs").character_strengths.add(
+            self.curiosity
+        )
+
+    def strength(self, name, virtue):
+        return VIACharacterStrength.objects.create(
+            name=name, description=name, virtue=virtue
+        )
+
+    def goal(self, name, strengths, **kwargs):
+        goal = Goal.objects.create(user=self.user, name=name, **kwargs)
+        goal.character_strengths.add(*strengths)
+        return goal
+
+    def counts(self, rows):
+        return {row.name: (row.goals, row.weight) for row in rows}
+
+    def test_counts_strengths_and_virtues_weighted_by_subtree(self):
+        analytics = strength_analytics(self.user, STATE_ALL)
+
+        # The concern weighs 3: itself and its two sub-goals.
+        self.assertEqual(
+            self.counts(analytics["strengths"]),
+            {"Curiosity": (2, 4), "Creativity": (1, 3), "Bravery": (1, 1)},
+        )
+        self.assertEqual(analytics["strengths"][0].name, "Curiosity")
+        # The concern has two wisdom strengths but counts once for wisdom.
+        self.assertEqual(
+            self.counts(analytics["virtues"]),
+            {"Wisdom": (2, 4), "Courage": (1, 1)},
+        )
+
+    def test_filters_by_state(self):
+        self.assertNotIn(
+            "Bravery",
+            self.counts(strength_analytics(self.user, STATE_ACTIVE)["strengths"]),
+        )
+        self.assertEqual(
+            list(
+                self.counts(strength_analytics(self.user, STATE_COMPLETED)["strengths"])
+            ),
+            ["Bravery"],
+        )
+        self.assertEqual(strength_analytics(self.user, STATE_ARCHIVED)["strengths"], [])
+
+    def test_results_are_cached_until_goals_change(self):
+        strength_analytics(self.user)
+        with self.assertNumQueries(0):
+            strength_analytics(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sub_goal.completed = False
+            self.sub_goal.save()
+        self.assertIn(
+            "Bravery", self.counts(strength_analytics(self.user)["strengths"])
+        )
+
+    def test_strength_changes_invalidate_the_cache(self):
+        strength_analytics(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.concern.character_strengths.remove(self.creativity)
+        self.assertNotIn(
+            "Creativity", self.counts(strength_analytics(self.user)["strengths"])
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bravery.goals.add(self.concern)
+        self.assertEqual(
+            self.counts(strength_analytics(self.user)["strengths"])["Bravery"], (1, 3)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.curiosity.goals.clear()
+        self.assertNotIn(
+            "Curiosity", self.counts(strength_analytics(self.user)["strengths"])
+        )
+
+    def test_subtree_archive_invalidates_the_cache(self):
+        strength_analytics(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_subtree_archived(self.concern, True)
+
+        self.assertEqual(strength_analytics(self.user)["strengths"], [])
+
+    def test_view(self):
+        self.client.login(username="user1", password="password123")
+        url = reverse("uc_goals:strength_analytics")
+
+        response = self.client.get(url, {"state": "all"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["virtues"][0]["name"], "Wisdom")
+
+        self.assertEqual(self.client.get(url, {"state": "nope"}).status_code, 400)
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from uc_goals.models import Goal, Virtue, VIACharacterStrength
+from uc_goals.tree import load_goal_forest
+
+
+class GoalTreeTestCase(TestCase):
+    """
+    A concern with two levels of sub-goals, and an orphan goal.
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="user1", password="password123", registration_accepted=True
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username="user2", password="password123", registration_accepted=True
+        )
+        virtue = Virtue.objects.create(name="Wisdom", description="Knowing")
+        self.strength = VIACharacterStrength.objects.create(
+            name="Curiosity", description="Asking", virtue=virtue
+        )
+
+        self.concern = Goal.objects.create(
+            user=self.user, name="Concern", is_ultimate_concern=True
+        )
+        self.goal = Goal.objects.create(
+            user=self.user, name="Goal", parent=self.concern
+        )
+        self.goal.character_strengths.add(self.strength)
+        self.sub_goal = Goal.objects.create(
+            user=self.user, name="Sub-Goal", parent=self.goal
+        )
+        self.orphan = Goal.objects.create(user=self.user, name="Orphan")
+        Goal.objects.create(user=self.other_user, name="Not Mine")
+
+    def add_sub_goals(self, count):
+        for index in range(count):
+            goal = Goal.objects.create(
+                user=self.user, name=f"Extra {index}", parent=self.sub_goal
+            )
+            goal.character_strengths.add(self.strength)
+
+
+class LoadGoalForestTest(GoalTreeTestCase):
+    def test_builds_the_tree(self):
+        forest = load_goal_forest(self.user)
+
+        self.assertEqual(forest.roots, [self.concern, self.orphan])
+        self.assertEqual(len(forest.goals), 4)
+        concern = forest.goals[self.concern.pk]
+        self.assertEqual(concern.children, [self.goal])
+        self.assertEqual(concern.children[0].children, [self.sub_goal])
+
+    def test_reads_the_tree_in_two_queries(self):
+        self.add_sub_goals(5)
+        with self.assertNumQueries(2):
+            forest = load_goal_forest(self.user)
+            goal = forest.goals[self.goal.pk]
+            self.assertEqual(goal.parent, self.concern)
+            self.assertEqual(list(goal.character_strengths.all()), [self.strength])
+            self.assertEqual(len(goal.children[0].children), 5)
+
+    def test_goals_in_a_cycle_have_no_children(self):
+        Goal.objects.filter(pk=self.goal.pk).update(parent=self.sub_goal)
+
+        forest = load_goal_forest(self.user)
+
+        self.assertEqual(forest.goals[self.concern.pk].children, [])
+        self.assertEqual(forest.goals[self.goal.pk].children, [])
+
+
+class GoalTreeViewsTest(GoalTreeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="user1", password="password123")
+
+    def assertQueriesDoNotGrow(self, url):
+        with self.assertNumQueries(4):
+            self.client.get(url)
+        self.add_sub_goals(5)
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertContains(response, "Extra 4")
+        self.assertContains(response, "Curiosity")
+
+    def test_goal_detail_renders_the_subtree(self):
+        self.assertQueriesDoNotGrow(
+            reverse("uc_goals:goal_detail", kwargs={"pk": self.concern.pk})
+        )
+
+    def test_ultimate_concerns_render_their_subtrees(self):
+        url = reverse("uc_goals:uc_list")
+        self.assertQueriesDoNotGrow(url)
+        self.assertEqual(self.client.get(url).context["goals"], [self.concern])
+
+    def test_orphan_goals(self):
+        response = self.client.get(reverse("uc_goals:orphan_list"))
+
+        self.assertEqual(response.context["goals"], [self.orphan])
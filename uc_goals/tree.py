@@ -0,0 +1,47 @@
+"""
+Load a user's goals as a tree in memory, so a whole tree renders without
+further queries.
+"""
+
+from collections import defaultdict, namedtuple
+
+from .models import Goal
+
+# `roots` are the goals without a parent and `goals` maps every goal's primary
+# key to the goal.
+GoalForest = namedtuple("GoalForest", ["roots", "goals"])
+
+
+def load_goal_forest(user):
+    """
+    Return the `GoalForest` of all of `user`'s goals, read with one query plus
+    one for their character strengths.
+
+    Each goal gets a `children` list of its sub-goals, in the order they were
+    created, and its `parent` and `character_strengths.all` are filled in from
+    what was read. Goals caught in a parent cycle can't be reached from a
+    root and are given no children, so rendering them can't recurse forever.
+    """
+    goals = {
+        goal.pk: goal
+        for goal in Goal.objects.filter(user=user)
+        .prefetch_related("character_strengths")
+        .order_by("pk")
+    }
+    children = defaultdict(list)
+    roots = []
+    for goal in goals.values():
+        goal.children = []
+        parent = goals.get(goal.parent_id)
+        if parent is None:
+            roots.append(goal)
+        else:
+            goal.parent = parent
+            children[parent.pk].append(goal)
+
+    pending = list(roots)
+    while pending:
+        goal = pending.pop()
+        goal.children = children[goal.pk]
+        pending.extend(goal.children)
+    return GoalForest(roots=roots, goals=goals)
@@ -8,6 +8,18 @@ urlpatterns = [
     path("<int:pk>/", views.GoalDetailView.as_view(), name="goal_detail"),
     path("<int:pk>/update/", views.GoalUpdateView.as_view(), name="goal_update"),
     path("<int:pk>/delete/", views.GoalDeleteView.as_view(), name="goal_delete"),
+    path("<int:pk>/archive/", views.archive_goal_subtree, name="goal_archive"),
     path("ucs/", views.ultimate_concerns, name="uc_list"),
     path("orphans/", views.orphan_goals, name="orphan_list"),
+    path("deadlines/", views.upcoming_deadlines_view, name="upcoming_deadlines"),
+    path(
+        "deadlines/digest/",
+        views.deadline_digest_subscription,
+        name="deadline_digest",
+    ),
+    path(
+        "analytics/strengths/",
+        views.strength_analytics_view,
+        name="strength_analytics",
+    ),
 ]
@@ -1,14 +1,22 @@
-from django.shortcuts import render
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views.generic import DetailView, DeleteView
 from django.views.generic.edit import CreateView, UpdateView
 
-from base.decorators import registration_accepted_required
+from base.decorators import query_budget, registration_accepted_required
 from base.mixins import RegistrationAcceptedMixin
 from config.settings.base import THE_SITE_NAME
-from uc_goals.models import Goal
+from uc_goals.models import DeadlineDigest, Goal
 
+from .analytics import DEFAULT_STATE, STATES, strength_analytics
+from .deadlines import DEFAULT_DAYS, MAX_DAYS, upcoming_deadlines
 from .forms import GoalForm
+from .hierarchy import reparent_goal, set_subtree_archived
+from .tree import load_goal_forest
 
 
 class GoalCreateView(RegistrationAcceptedMixin, CreateView):
@@ -40,6 +48,12 @@ class GoalCreateView(RegistrationAcceptedMixin, CreateView):
         form.instance.user = self.request.user  # Assign the logged-in user
         return super().form_valid(form)
 
+    def get_form_kwargs(self):
+        # Lets the form offer only the user's own goals as parents.
+        kwargs = super().get_form_kwargs()
+        kwargs["user"] = self.request.user
+        return kwargs
+
     def get_context_data(self, **kwargs):
         """
         Override the get_context_data method to add extra context to the template.
@@ -111,6 +125,17 @@ class GoalDetailView(RegistrationAcceptedMixin, DetailView):
     #     print("print(obj): ", obj)
     #     return obj
 
+    def get_object(self, queryset=None):
+        """
+        Return the goal from the user's whole goal tree, loaded in two queries, so
+        its sub-goals render without any more.
+        """
+        forest = load_goal_forest(self.request.user)
+        try:
+            return forest.goals[self.kwargs["pk"]]
+        except KeyError:
+            raise Http404("No goal found matching the query")
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # `DetailView` provides the object as `self.object`. This can be used to get
@@ -146,6 +171,28 @@ class GoalUpdateView(RegistrationAcceptedMixin, UpdateView):
         # print(queryset.query)
         return queryset
 
+    def get_form_kwargs(self):
+        # Lets the form offer only the user's own goals as parents.
+        kwargs = super().get_form_kwargs()
+        kwargs["user"] = self.request.user
+        return kwargs
+
+    def form_valid(self, form):
+        """
+        Save the goal through `reparent_goal`, which checks the new parent again
+        against the locked rows, in case a concurrent move would make a cycle.
+        """
+        try:
+            with transaction.atomic():
+                self.object = reparent_goal(
+                    form.save(commit=False), form.cleaned_data["parent"]
+                )
+                form.save_m2m()
+        except ValidationError as error:
+            form.add_error("parent", error)
+            return self.form_invalid(form)
+        return HttpResponseRedirect(self.get_success_url())
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # `UpdateView` provides the object as `self.object`. This can be used to get
@@ -167,7 +214,8 @@ def ultimate_concerns(request):
     """
     Goals which are ultimate concerns (top level goals) and owned by the user.
     """
-    goals = Goal.objects.filter(is_ultimate_concern=True, user=request.user)
+    forest = load_goal_forest(request.user)
+    goals = [goal for goal in forest.goals.values() if goal.is_ultimate_concern]
     return render(
         request,
         "uc_goals/goal_list.html",
@@ -184,9 +232,12 @@ def orphan_goals(request):
     """
     Goals which are not ultimate concerns but are owned by the user.
     """
-    goals = Goal.objects.filter(
-        is_ultimate_concern=False, parent__isnull=True, user=request.user
-    )
+    forest = load_goal_forest(request.user)
+    goals = [
+        goal
+        for goal in forest.goals.values()
+        if not goal.is_ultimate_concern and goal.parent_id is None
+    ]
     return render(
         request,
         "uc_goals/goal_list.html",
@@ -196,3 +247,85 @@ def orphan_goals(request):
             "page_title": "Orphan Goals",
         },
     )
+
+
+@query_budget(5)
+@registration_accepted_required
+def upcoming_deadlines_view(request):
+    """
+    The user's open goals that are overdue or due in the next `days` days, and
+    whether they get the daily digest of them.
+    """
+    try:
+        days = int(request.GET.get("days", DEFAULT_DAYS))
+    except ValueError:
+        days = DEFAULT_DAYS
+    days = min(max(days, 1), MAX_DAYS)
+    today = timezone.localdate()
+    return render(
+        request,
+        "uc_goals/goal_deadlines.html",
+        {
+            **upcoming_deadlines(request.user, today, days),
+            "days": days,
+            "today": today,
+            "digest_opted_out": DeadlineDigest.objects.filter(
+                user=request.user, opted_out=True
+            ).exists(),
+            "the_site_name": THE_SITE_NAME,
+            "page_title": "Upcoming Deadlines",
+        },
+    )
+
+
+@registration_accepted_required
+def deadline_digest_subscription(request):
+    """
+    Stop the user's daily deadline digest, or restart it if `opted_out` is
+    posted as "0".
+    """
+    if request.method == "POST":
+        DeadlineDigest.objects.update_or_create(
+            user=request.user,
+            defaults={"opted_out": request.POST.get("opted_out") != "0"},
+        )
+    return redirect("uc_goals:upcoming_deadlines")
+
+
+@registration_accepted_required
+def archive_goal_subtree(request, pk):
+    """
+    Archive a goal and all of its sub-goals, or unarchive them if `archived` is
+    posted as "0".
+    """
+    goal = get_object_or_404(Goal, pk=pk, user=request.user)
+    if request.method == "POST":
+        set_subtree_archived(goal, request.POST.get("archived") != "0")
+    return redirect("uc_goals:goal_detail", pk=goal.pk)
+
+
+@query_budget(4)
+@registration_accepted_required
+def strength_analytics_view(request):
+    """
+    JSON endpoint counting how many of the user's goals, and how much of their
+    goal trees, lean on each character strength and virtue.
+
+    Query parameters:
+
+    - `state`: which goals to count, one of "active" (the default),
+      "completed", "archived" or "all".
+    """
+    state = request.GET.get("state", DEFAULT_STATE)
+    if state not in STATES:
+        return JsonResponse(
+            {"error": f"state must be one of {', '.join(STATES)}."}, status=400
+        )
+    analytics = strength_analytics(request.user, state)
+    return JsonResponse(
+        {
+            "state": state,
+            "strengths": [strength._asdict() for strength in analytics["strengths"]],
+            "virtues": [virtue._asdict() for virtue in analytics["virtues"]],
+        }
+    )
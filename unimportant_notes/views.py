@@ -171,7 +171,13 @@ class UnimportantNoteListView(RegistrationAcceptedMixin, FormMixin, ListView):
     }
 
     def get_queryset(self) -> QuerySet[Any]:
-        return super().get_queryset().filter(author=self.request.user)
+        return (
+            super()
+            .get_queryset()
+            .filter(author=self.request.user)
+            .select_related("author")
+            .prefetch_related("tag")
+        )
 
     def get_form_kwargs(self) -> dict[str, Any]:
         """
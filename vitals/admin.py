@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from vitals.models import BloodPressure, BodyWeight, Pulse, Temperature
+from vitals.models import (
+    BloodPressure,
+    BodyWeight,
+    Pulse,
+    Temperature,
+    VitalsRollup,
+    VitalsSketch,
+)
 
 
 @admin.register(BloodPressure)
@@ -195,3 +202,76 @@ class BodyWeightAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(VitalsRollup)
+class VitalsRollupAdmin(admin.ModelAdmin):
+    """
+    Inherit from `admin.ModelAdmin` so we can customize the admin panel for
+    the `VitalsRollup` model.
+
+    Rollups are maintained automatically, so every field is read-only.
+    """
+
+    list_display = (
+        "user",
+        "metric",
+        "period",
+        "bucket_start",
+        "count",
+        "minimum",
+        "maximum",
+        "updated",
+    )
+    ordering = ("user", "metric", "period", "-bucket_start")
+    list_filter = (
+        "metric",
+        "period",
+        "user",
+    )
+    search_fields = ("user__username",)
+    readonly_fields = (
+        "user",
+        "metric",
+        "period",
+        "bucket_start",
+        "count",
+        "total",
+        "sum_of_squares",
+        "minimum",
+        "maximum",
+        "updated",
+    )
+
+
+@admin.register(VitalsSketch)
+class VitalsSketchAdmin(admin.ModelAdmin):
+    """
+    Inherit from `admin.ModelAdmin` so we can customize the admin panel for
+    the `VitalsSketch` model.
+
+    Sketches are maintained automatically, so every field is read-only.
+    """
+
+    list_display = (
+        "user",
+        "metric",
+        "count",
+        "is_stale",
+        "updated",
+    )
+    ordering = ("user", "metric")
+    list_filter = (
+        "metric",
+        "is_stale",
+        "user",
+    )
+    search_fields = ("user__username",)
+    readonly_fields = (
+        "user",
+        "metric",
+        "count",
+        "state",
+        "is_stale",
+        "updated",
+    )
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class VitalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vitals'
+
+    def ready(self):
+        # Connect the signal receivers which keep `VitalsRollup` and
+        # `VitalsSketch` up to date.
+        from vitals import signals  # noqa: F401
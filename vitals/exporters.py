@@ -0,0 +1,178 @@
+# vitals/exporters.py
+
+import csv
+import json
+from decimal import Decimal
+
+from django.db import models
+
+from vitals.importers import FORMAT_CSV, FORMAT_JSONL, IMPORT_SPECS
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - pyarrow is optional.
+    pyarrow = None
+
+FORMAT_PARQUET = "parquet"
+
+CONTENT_TYPES = {
+    FORMAT_CSV: "text/csv",
+    FORMAT_JSONL: "application/x-ndjson",
+    FORMAT_PARQUET: "application/vnd.apache.parquet",
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def export_formats():
+    """
+    Return the available export formats. Parquet needs `pyarrow`.
+    """
+    formats = [FORMAT_CSV, FORMAT_JSONL]
+    if pyarrow is not None:
+        formats.append(FORMAT_PARQUET)
+    return formats
+
+
+def export_columns(kind):
+    """
+    Return the columns of a `kind` export. They are the columns
+    `vitals.importers` reads, so an export can be imported again.
+    """
+    return ("created", *IMPORT_SPECS[kind].value_fields)
+
+
+def export_queryset(user, kind, start=None, end=None):
+    """
+    Return the `(created, *values)` rows of `user`'s `kind` readings between
+    `start` (inclusive) and `end` (exclusive), oldest first.
+    """
+    spec = IMPORT_SPECS[kind]
+    readings = spec.model.objects.filter(**{spec.user_field: user})
+    if start is not None:
+        readings = readings.filter(created__gte=start)
+    if end is not None:
+        readings = readings.filter(created__lt=end)
+    return readings.order_by("created", "id").values_list(*export_columns(kind))
+
+
+class _Echo:
+    """
+    A file-like object that returns what is written to it instead of keeping
+    it, so `csv.writer` can produce one line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _iter_csv(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for created, *values in rows:
+        yield writer.writerow([created.isoformat(), *values])
+
+
+def _iter_jsonl(rows, columns):
+    for created, *values in rows:
+        record = [created.isoformat()] + [
+            float(value) if isinstance(value, Decimal) else value for value in values
+        ]
+        yield json.dumps(dict(zip(columns, record))) + "\n"
+
+
+class _ParquetSink:
+    """
+    A write-only file for `pyarrow` that hands out the bytes written so far,
+    so a Parquet file can be streamed one row group at a time.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _parquet_schema(kind):
+    spec = IMPORT_SPECS[kind]
+    fields = [pyarrow.field("created", pyarrow.timestamp("us", tz="UTC"))]
+    for name in spec.value_fields:
+        field = spec.model._meta.get_field(name)
+        if isinstance(field, models.DecimalField):
+            arrow_type = pyarrow.decimal128(field.max_digits, field.decimal_places)
+        else:
+            arrow_type = pyarrow.int32()
+        fields.append(pyarrow.field(name, arrow_type))
+    return pyarrow.schema(fields)
+
+
+def _iter_parquet(rows, columns, kind, chunk_size):
+    schema = _parquet_schema(kind)
+    sink = _ParquetSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == chunk_size:
+            writer.write_table(_parquet_table(batch, columns, schema))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_table(_parquet_table(batch, columns, schema))
+    writer.close()
+    yield sink.drain()
+
+
+def _parquet_table(batch, columns, schema):
+    return pyarrow.table(
+        {name: [row[index] for row in batch] for index, name in enumerate(columns)},
+        schema=schema,
+    )
+
+
+def stream_export(
+    user, kind, file_format, start=None, end=None, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Yield an export of `user`'s `kind` readings in `file_format` piece by
+    piece: lines of text for CSV and JSON Lines, row groups of bytes for
+    Parquet.
+
+    Readings are read with `QuerySet.iterator`, `chunk_size` rows at a time
+    (a server-side cursor on PostgreSQL), so memory use does not depend on
+    the length of the history.
+    """
+    columns = export_columns(kind)
+    rows = export_queryset(user, kind, start, end).iterator(chunk_size=chunk_size)
+    if file_format == FORMAT_CSV:
+        return _iter_csv(rows, columns)
+    if file_format == FORMAT_JSONL:
+        return _iter_jsonl(rows, columns)
+    if file_format == FORMAT_PARQUET and pyarrow is not None:
+        return _iter_parquet(rows, columns, kind, chunk_size)
+    raise ValueError(f"Unsupported export format: {file_format!r}")
+
+
+def export_filename(kind, file_format):
+    return f"{kind}.{file_format}"
@@ -0,0 +1,34 @@
+from django import forms
+
+from vitals.importers import IMPORT_SPECS, format_for_name
+
+
+class VitalsImportForm(forms.Form):
+    """
+    Form to upload a CSV or JSON Lines file of vitals readings.
+    """
+
+    kind = forms.ChoiceField(
+        label="Readings",
+        choices=[
+            (kind, spec.model._meta.verbose_name_plural.title())
+            for kind, spec in IMPORT_SPECS.items()
+        ],
+        help_text="The kind of readings in the file.",
+    )
+    file = forms.FileField(
+        label="File",
+        help_text=(
+            "A `.csv` or `.jsonl` file with a `created` column and the value "
+            "columns of the readings."
+        ),
+    )
+
+    def clean_file(self):
+        """
+        Reject files whose format cannot be told from their extension.
+        """
+        file = self.cleaned_data["file"]
+        if format_for_name(file.name) is None:
+            raise forms.ValidationError("Upload a `.csv` or `.jsonl` file.")
+        return file
@@ -0,0 +1,211 @@
+# vitals/importers.py
+
+import csv
+import json
+import os
+from collections import namedtuple
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from vitals.metrics import metrics_for_model
+from vitals.models import BloodPressure, BodyWeight, Pulse, Temperature
+from vitals.rollups import record_readings
+from vitals.sketches import record_sketch_values
+
+ImportSpec = namedtuple("ImportSpec", ["model", "user_field", "value_fields"])
+
+# What an import file can contain: one kind of reading per file, with a
+# `created` column plus the value columns.
+IMPORT_SPECS = {
+    "bloodpressure": ImportSpec(
+        BloodPressure, "user", ("systolic", "diastolic", "pulse")
+    ),
+    "pulse": ImportSpec(Pulse, "user", ("bpm",)),
+    "temperature": ImportSpec(Temperature, "subject", ("measurement",)),
+    "bodyweight": ImportSpec(BodyWeight, "subject", ("measurement",)),
+}
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+# Only the first errors are kept, so a badly formatted file cannot make the
+# report grow with the file.
+MAX_REPORTED_ERRORS = 50
+
+
+class ImportReport:
+    """
+    Running totals of an import, handed to the progress callback after every
+    batch.
+    """
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+
+    def add_error(self, line_number, error):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, "; ".join(error.messages)))
+
+    def __str__(self):
+        return (
+            f"Processed {self.processed} rows: {self.created} created, "
+            f"{self.duplicates} duplicates, {self.invalid} invalid."
+        )
+
+
+def format_for_name(name):
+    """
+    Return the import format of a file from its extension, or `None`.
+    """
+    return FORMAT_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def read_rows(stream, file_format):
+    """
+    Yield `(line_number, row)` for every record of the text `stream`, one at a
+    time. `row` is a `dict`, or `None` for a JSON Lines line that is not valid
+    JSON.
+    """
+    if file_format == FORMAT_CSV:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def clean_row(spec, row):
+    """
+    Validate one imported `row` against the fields of `spec.model` and return
+    its deduplication key, `(created, *values)`.
+
+    Raises `ValidationError` if the row is unusable.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError("The row could not be parsed.")
+    raw_created = row.get("created")
+    created = parse_datetime(str(raw_created)) if raw_created else None
+    if created is None:
+        raise ValidationError("`created` must be an ISO 8601 date and time.")
+    if timezone.is_naive(created):
+        created = timezone.make_aware(created)
+
+    values = []
+    errors = []
+    for name in spec.value_fields:
+        field = spec.model._meta.get_field(name)
+        value = row.get(name)
+        if isinstance(value, float):
+            # Validate JSON numbers as written, e.g. 99.1 rather than 99.10.
+            value = str(value)
+        try:
+            values.append(field.clean(value, None))
+        except ValidationError as error:
+            errors.extend(f"{name}: {message}" for message in error.messages)
+    if errors:
+        raise ValidationError(errors)
+    return (created, *values)
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of up to `size` items of `iterable`.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_readings(
+    user, kind, stream, file_format, batch_size=DEFAULT_BATCH_SIZE, progress=None
+):
+    """
+    Import the `kind` readings in the text `stream` for `user` and return an
+    `ImportReport`.
+
+    Rows are read lazily and handled `batch_size` at a time, so memory use does
+    not depend on the size of the file. Each batch is validated, deduplicated
+    on `(user, created, values)` against itself and the database, and inserted
+    in its own transaction. `progress`, if given, is called with the report
+    after every batch.
+    """
+    spec = IMPORT_SPECS[kind]
+    report = ImportReport()
+    for chunk in chunked(read_rows(stream, file_format), batch_size):
+        keys = {}
+        for line_number, row in chunk:
+            report.processed += 1
+            try:
+                key = clean_row(spec, row)
+            except ValidationError as error:
+                report.add_error(line_number, error)
+                continue
+            if key in keys:
+                report.duplicates += 1
+            else:
+                keys[key] = line_number
+        _insert_batch(user, spec, list(keys), report)
+        if progress is not None:
+            progress(report)
+    return report
+
+
+def _insert_batch(user, spec, keys, report):
+    if not keys:
+        return
+    with transaction.atomic():
+        existing = set(
+            spec.model.objects.filter(
+                **{spec.user_field: user},
+                created__in={key[0] for key in keys},
+            ).values_list("created", *spec.value_fields)
+        )
+        new_keys = [key for key in keys if key not in existing]
+        report.duplicates += len(keys) - len(new_keys)
+        if not new_keys:
+            return
+
+        readings = [
+            spec.model(
+                **{spec.user_field: user},
+                **dict(zip(spec.value_fields, key[1:])),
+            )
+            for key in new_keys
+        ]
+        spec.model.objects.bulk_create(readings)
+        # `created` is `auto_now_add`, so `bulk_create` stamps every reading
+        # with the current time. Put the imported times back.
+        for reading, key in zip(readings, new_keys):
+            reading.created = key[0]
+        spec.model.objects.bulk_update(readings, ["created"])
+
+        # `bulk_create` does not send `post_save`, so update the rollups and
+        # sketches here, once per metric for the whole batch.
+        for metric in metrics_for_model(spec.model):
+            index = spec.value_fields.index(metric.value_field) + 1
+            pairs = [(key[0], key[index]) for key in new_keys]
+            record_readings(metric.name, user.pk, pairs)
+            record_sketch_values(metric.name, user.pk, [value for _, value in pairs])
+        report.created += len(new_keys)
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from vitals.importers import (
+    DEFAULT_BATCH_SIZE,
+    FORMAT_CSV,
+    FORMAT_JSONL,
+    IMPORT_SPECS,
+    format_for_name,
+    import_readings,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import vitals readings for one user from a CSV or JSON Lines file. "
+        "Rows already recorded with the same `created` time and values are "
+        "skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to import.")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="The username of the user the readings belong to.",
+        )
+        parser.add_argument(
+            "--kind",
+            required=True,
+            choices=list(IMPORT_SPECS),
+            help="The kind of readings in the file.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=[FORMAT_CSV, FORMAT_JSONL],
+            help="The file format. Defaults to the one of the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of rows validated and inserted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named {options['user']!r}.")
+        file_format = options["format"] or format_for_name(options["path"])
+        if file_format is None:
+            raise CommandError("Cannot tell the file format; pass --format.")
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+            report = import_readings(
+                user,
+                options["kind"],
+                stream,
+                file_format,
+                batch_size=options["batch_size"],
+                progress=lambda report: self.stdout.write(str(report)),
+            )
+        for line_number, message in report.errors:
+            self.stderr.write(f"Line {line_number}: {message}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {report.created} readings."))
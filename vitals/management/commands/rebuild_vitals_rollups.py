@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from vitals.rollups import rebuild_rollups
+from vitals.sketches import rebuild_sketches
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild `VitalsRollup` and `VitalsSketch` rows from scratch from the "
+        "vitals readings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only rebuild the rollups of the user with this id. Repeatable.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of users rebuilt per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(
+            user_ids=options["user_ids"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} vitals rollups."))
+        written = rebuild_sketches(
+            user_ids=options["user_ids"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} vitals sketches."))
@@ -0,0 +1,29 @@
+# vitals/metrics.py
+
+from collections import namedtuple
+
+from vitals.models import BloodPressure, BodyWeight, Pulse, Temperature
+
+Metric = namedtuple("Metric", ["name", "model", "user_field", "value_field"])
+
+# Every metric tracked by the `vitals` app, keyed by the names used in
+# `VITALS_METRIC_CHOICES`.
+METRICS = {
+    "systolic": Metric("systolic", BloodPressure, "user", "systolic"),
+    "diastolic": Metric("diastolic", BloodPressure, "user", "diastolic"),
+    "bp_pulse": Metric("bp_pulse", BloodPressure, "user", "pulse"),
+    "pulse": Metric("pulse", Pulse, "user", "bpm"),
+    "temperature": Metric("temperature", Temperature, "subject", "measurement"),
+    "body_weight": Metric("body_weight", BodyWeight, "subject", "measurement"),
+}
+
+BLOOD_PRESSURE_METRICS = ("systolic", "diastolic", "bp_pulse")
+
+VITALS_MODELS = (BloodPressure, Pulse, Temperature, BodyWeight)
+
+
+def metrics_for_model(model):
+    """
+    Return the `Metric`s whose readings are stored on `model`.
+    """
+    return [metric for metric in METRICS.values() if metric.model is model]
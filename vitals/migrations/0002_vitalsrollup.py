@@ -0,0 +1,147 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("vitals", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VitalsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("systolic", "Systolic Blood Pressure"),
+                            ("diastolic", "Diastolic Blood Pressure"),
+                            ("bp_pulse", "Blood Pressure Pulse"),
+                            ("pulse", "Pulse"),
+                            ("temperature", "Temperature"),
+                            ("body_weight", "Body Weight"),
+                        ],
+                        help_text="The vitals metric that is rolled up.",
+                        max_length=20,
+                        verbose_name="Metric",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[
+                            ("all", "All Time"),
+                            ("day", "Day"),
+                            ("week", "Week"),
+                            ("month", "Month"),
+                        ],
+                        help_text="The length of the bucket of time that is rolled up.",
+                        max_length=5,
+                        verbose_name="Period",
+                    ),
+                ),
+                (
+                    "bucket_start",
+                    models.DateField(
+                        blank=True,
+                        help_text="The first day of the bucket. Empty for the `all` period.",
+                        null=True,
+                        verbose_name="Bucket Start",
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of readings in the bucket.",
+                        verbose_name="Count",
+                    ),
+                ),
+                (
+                    "total",
+                    models.FloatField(
+                        default=0,
+                        help_text="The sum of the readings in the bucket.",
+                        verbose_name="Total",
+                    ),
+                ),
+                (
+                    "sum_of_squares",
+                    models.FloatField(
+                        default=0,
+                        help_text="The sum of the squared readings in the bucket.",
+                        verbose_name="Sum of Squares",
+                    ),
+                ),
+                (
+                    "minimum",
+                    models.FloatField(
+                        blank=True,
+                        help_text="The smallest reading in the bucket.",
+                        null=True,
+                        verbose_name="Minimum",
+                    ),
+                ),
+                (
+                    "maximum",
+                    models.FloatField(
+                        blank=True,
+                        help_text="The largest reading in the bucket.",
+                        null=True,
+                        verbose_name="Maximum",
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time this rollup was last updated.",
+                        verbose_name="Updated",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="The user whose readings are rolled up.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vitals_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Vitals Rollup",
+                "verbose_name_plural": "Vitals Rollups",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="vitalsrollup",
+            constraint=models.UniqueConstraint(
+                fields=("user", "metric", "period", "bucket_start"),
+                name="vitals_rollup_unique_bucket",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="vitalsrollup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("bucket_start__isnull", True)),
+                fields=("user", "metric", "period"),
+                name="vitals_rollup_unique_all_time",
+            ),
+        ),
+    ]
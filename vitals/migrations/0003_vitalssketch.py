@@ -0,0 +1,98 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("vitals", "0002_vitalsrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VitalsSketch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("systolic", "Systolic Blood Pressure"),
+                            ("diastolic", "Diastolic Blood Pressure"),
+                            ("bp_pulse", "Blood Pressure Pulse"),
+                            ("pulse", "Pulse"),
+                            ("temperature", "Temperature"),
+                            ("body_weight", "Body Weight"),
+                        ],
+                        help_text="The vitals metric that is sketched.",
+                        max_length=20,
+                        verbose_name="Metric",
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of readings added to the sketch.",
+                        verbose_name="Count",
+                    ),
+                ),
+                (
+                    "state",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="The serialized sketch.",
+                        verbose_name="State",
+                    ),
+                ),
+                (
+                    "is_stale",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Designates that a reading was edited or deleted and the sketch must be rebuilt before it is used.",
+                        verbose_name="Is Stale",
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time this sketch was last updated.",
+                        verbose_name="Updated",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="The user whose readings are sketched.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vitals_sketches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Vitals Sketch",
+                "verbose_name_plural": "Vitals Sketches",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="vitalssketch",
+            constraint=models.UniqueConstraint(
+                fields=("user", "metric"), name="vitals_sketch_unique_metric"
+            ),
+        ),
+    ]
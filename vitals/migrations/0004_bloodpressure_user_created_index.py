@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vitals", "0003_vitalssketch"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bloodpressure",
+            index=models.Index(
+                fields=["user", "-created", "-id"], name="vitals_bp_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("vitals", "0004_bloodpressure_user_created_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VitalsExport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time this object was created.",
+                        verbose_name="Created",
+                    ),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time this object was last updated.",
+                        verbose_name="Updated",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("bloodpressure", "Blood Pressure"),
+                            ("pulse", "Pulse"),
+                            ("temperature", "Temperature"),
+                            ("bodyweight", "Body Weight"),
+                        ],
+                        help_text="The kind of readings exported.",
+                        max_length=20,
+                        verbose_name="Kind",
+                    ),
+                ),
+                (
+                    "file_format",
+                    models.CharField(
+                        choices=[
+                            ("csv", "CSV"),
+                            ("jsonl", "JSON Lines"),
+                            ("parquet", "Parquet"),
+                        ],
+                        help_text="The format of the export file.",
+                        max_length=10,
+                        verbose_name="File Format",
+                    ),
+                ),
+                (
+                    "start",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Only export readings taken at or after this time.",
+                        null=True,
+                        verbose_name="Start",
+                    ),
+                ),
+                (
+                    "end",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Only export readings taken before this time.",
+                        null=True,
+                        verbose_name="End",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        help_text="How far along the export is.",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        help_text="The finished export.",
+                        upload_to="vitals_exports/",
+                        verbose_name="File",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="The user whose readings are exported.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vitals_exports",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Vitals Export",
+                "verbose_name_plural": "Vitals Exports",
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+from django.db import migrations
+from django.db.models import (
+    Count,
+    DateField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Sum,
+)
+from django.db.models.functions import Trunc
+
+# A copy of `vitals.metrics.METRICS` as it stood when this migration was
+# written, as (metric, model name, user field, value field).
+METRICS = [
+    ("systolic", "BloodPressure", "user", "systolic"),
+    ("diastolic", "BloodPressure", "user", "diastolic"),
+    ("bp_pulse", "BloodPressure", "user", "pulse"),
+    ("pulse", "Pulse", "user", "bpm"),
+    ("temperature", "Temperature", "subject", "measurement"),
+    ("body_weight", "BodyWeight", "subject", "measurement"),
+]
+BUCKET_PERIODS = ["day", "week", "month"]
+BATCH_SIZE = 500
+
+
+def build_rollups(apps):
+    VitalsRollup = apps.get_model("vitals", "VitalsRollup")
+    for metric, model_name, user_field, value_field in METRICS:
+        readings = apps.get_model("vitals", model_name).objects.all()
+        user_column = f"{user_field}_id"
+        value = F(value_field)
+        aggregates = {
+            "count": Count("pk"),
+            "total": Sum(value, output_field=FloatField()),
+            "sum_of_squares": Sum(
+                ExpressionWrapper(value * value, output_field=FloatField())
+            ),
+            "minimum": Min(value, output_field=FloatField()),
+            "maximum": Max(value, output_field=FloatField()),
+        }
+
+        for row in readings.values(user_column).annotate(**aggregates).order_by():
+            yield VitalsRollup(
+                user_id=row.pop(user_column), metric=metric, period="all", **row
+            )
+        for period in BUCKET_PERIODS:
+            rows = (
+                readings.annotate(
+                    bucket=Trunc("created", period, output_field=DateField())
+                )
+                .values(user_column, "bucket")
+                .annotate(**aggregates)
+                .order_by()
+            )
+            for row in rows:
+                yield VitalsRollup(
+                    user_id=row.pop(user_column),
+                    metric=metric,
+                    period=period,
+                    bucket_start=row.pop("bucket"),
+                    **row,
+                )
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Roll up the readings written before rollups were maintained.
+    """
+    VitalsRollup = apps.get_model("vitals", "VitalsRollup")
+    VitalsRollup.objects.all().delete()
+    VitalsRollup.objects.bulk_create(build_rollups(apps), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vitals", "0005_vitalsexport"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:41
+
+from django.db import migrations, models
+import vitals.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vitals", "0006_backfill_vitals_rollups"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vitalsexport",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                help_text="The finished export.",
+                storage=vitals.models.export_storage,
+                upload_to=vitals.models.export_upload_to,
+                verbose_name="File",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+from django.db.models import Count
+
+# A copy of `vitals.metrics.METRICS` as it stood when this migration was
+# written, as (metric, model name, user field, value field).
+METRICS = [
+    ("systolic", "BloodPressure", "user", "systolic"),
+    ("diastolic", "BloodPressure", "user", "diastolic"),
+    ("bp_pulse", "BloodPressure", "user", "pulse"),
+    ("pulse", "Pulse", "user", "bpm"),
+    ("temperature", "Temperature", "subject", "measurement"),
+    ("body_weight", "BodyWeight", "subject", "measurement"),
+]
+BATCH_SIZE = 500
+
+
+def build_stale_sketches(apps):
+    VitalsSketch = apps.get_model("vitals", "VitalsSketch")
+    for metric, model_name, user_field, _ in METRICS:
+        sketched = VitalsSketch.objects.filter(metric=metric).values("user_id")
+        user_column = f"{user_field}_id"
+        rows = (
+            apps.get_model("vitals", model_name)
+            .objects.exclude(**{f"{user_column}__in": sketched})
+            .values(user_column)
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        for row in rows:
+            yield VitalsSketch(
+                user_id=row[user_column],
+                metric=metric,
+                count=row["count"],
+                is_stale=True,
+            )
+
+
+def backfill_sketches(apps, schema_editor):
+    """
+    Add a stale sketch for every metric of every user with readings written
+    before sketches were maintained, so they are rebuilt from all of them
+    rather than only from the readings written since. The counts let
+    `metric_quantiles` choose between the sketch and the exact answer.
+    """
+    VitalsSketch = apps.get_model("vitals", "VitalsSketch")
+    VitalsSketch.objects.bulk_create(build_stale_sketches(apps), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vitals", "0007_vitalsexport_private_file"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sketches, migrations.RunPython.noop),
+    ]
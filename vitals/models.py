@@ -1,4 +1,8 @@
+import os
+import uuid
+
 from django.conf import settings
+from django.core.files.storage import get_storage_class
 from django.db import models
 
 from base.models import CreatedUpdatedBase
@@ -30,6 +34,13 @@ class BloodPressure(CreatedUpdatedBase):
 
     class Meta:
         verbose_name_plural = "Blood Pressure Measurements"
+        indexes = [
+            # Serves the keyset pagination of a user's readings, newest first.
+            models.Index(
+                fields=["user", "-created", "-id"],
+                name="vitals_bp_user_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -114,3 +125,290 @@ class BodyWeight(CreatedUpdatedBase):
 
     def __str__(self):
         return f"{self.subject.username} | {self.measurement} lbs"
+
+
+VITALS_METRIC_CHOICES = [
+    ("systolic", "Systolic Blood Pressure"),
+    ("diastolic", "Diastolic Blood Pressure"),
+    ("bp_pulse", "Blood Pressure Pulse"),
+    ("pulse", "Pulse"),
+    ("temperature", "Temperature"),
+    ("body_weight", "Body Weight"),
+]
+
+
+class VitalsRollup(models.Model):
+    """
+    Running statistics of one `metric` for one `user` over one bucket of time.
+
+    The `all` period has no `bucket_start` and covers the user's whole history.
+    Rows are kept up to date as readings are written (see `vitals.rollups`) and
+    can be rebuilt with the `rebuild_vitals_rollups` management command.
+    """
+
+    PERIOD_ALL = "all"
+    PERIOD_DAY = "day"
+    PERIOD_WEEK = "week"
+    PERIOD_MONTH = "month"
+    PERIOD_CHOICES = [
+        (PERIOD_ALL, "All Time"),
+        (PERIOD_DAY, "Day"),
+        (PERIOD_WEEK, "Week"),
+        (PERIOD_MONTH, "Month"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="vitals_rollups",
+        help_text="The user whose readings are rolled up.",
+    )
+    metric = models.CharField(
+        verbose_name="Metric",
+        max_length=20,
+        choices=VITALS_METRIC_CHOICES,
+        help_text="The vitals metric that is rolled up.",
+    )
+    period = models.CharField(
+        verbose_name="Period",
+        max_length=5,
+        choices=PERIOD_CHOICES,
+        help_text="The length of the bucket of time that is rolled up.",
+    )
+    bucket_start = models.DateField(
+        verbose_name="Bucket Start",
+        null=True,
+        blank=True,
+        help_text="The first day of the bucket. Empty for the `all` period.",
+    )
+    count = models.PositiveIntegerField(
+        verbose_name="Count",
+        default=0,
+        help_text="The number of readings in the bucket.",
+    )
+    total = models.FloatField(
+        verbose_name="Total",
+        default=0,
+        help_text="The sum of the readings in the bucket.",
+    )
+    sum_of_squares = models.FloatField(
+        verbose_name="Sum of Squares",
+        default=0,
+        help_text="The sum of the squared readings in the bucket.",
+    )
+    minimum = models.FloatField(
+        verbose_name="Minimum",
+        null=True,
+        blank=True,
+        help_text="The smallest reading in the bucket.",
+    )
+    maximum = models.FloatField(
+        verbose_name="Maximum",
+        null=True,
+        blank=True,
+        help_text="The largest reading in the bucket.",
+    )
+    updated = models.DateTimeField(
+        "Updated",
+        auto_now=True,
+        help_text="The date and time this rollup was last updated.",
+    )
+
+    class Meta:
+        verbose_name = "Vitals Rollup"
+        verbose_name_plural = "Vitals Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "metric", "period", "bucket_start"],
+                name="vitals_rollup_unique_bucket",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "metric", "period"],
+                condition=models.Q(bucket_start__isnull=True),
+                name="vitals_rollup_unique_all_time",
+            ),
+        ]
+
+    @property
+    def mean(self):
+        """
+        The mean of the readings in the bucket.
+        """
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    @property
+    def variance(self):
+        """
+        The population variance of the readings in the bucket.
+        """
+        if not self.count:
+            return None
+        return max(self.sum_of_squares / self.count - self.mean**2, 0.0)
+
+    def __str__(self):
+        bucket = self.bucket_start or "all time"
+        return f"{self.user.username} | {self.metric} | {self.period} {bucket}"
+
+
+class VitalsSketch(models.Model):
+    """
+    A mergeable quantile sketch of one `metric` for one `user`.
+
+    Answers approximate quantiles (median, p90, p99, ...) of a user's whole
+    history without reading every reading. See `vitals.sketches`.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="vitals_sketches",
+        help_text="The user whose readings are sketched.",
+    )
+    metric = models.CharField(
+        verbose_name="Metric",
+        max_length=20,
+        choices=VITALS_METRIC_CHOICES,
+        help_text="The vitals metric that is sketched.",
+    )
+    count = models.PositiveIntegerField(
+        verbose_name="Count",
+        default=0,
+        help_text="The number of readings added to the sketch.",
+    )
+    state = models.JSONField(
+        verbose_name="State",
+        default=dict,
+        blank=True,
+        help_text="The serialized sketch.",
+    )
+    is_stale = models.BooleanField(
+        verbose_name="Is Stale",
+        default=False,
+        help_text=(
+            "Designates that a reading was edited or deleted and the sketch "
+            "must be rebuilt before it is used."
+        ),
+    )
+    updated = models.DateTimeField(
+        "Updated",
+        auto_now=True,
+        help_text="The date and time this sketch was last updated.",
+    )
+
+    class Meta:
+        verbose_name = "Vitals Sketch"
+        verbose_name_plural = "Vitals Sketches"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "metric"],
+                name="vitals_sketch_unique_metric",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} | {self.metric} | {self.count} readings"
+
+
+def export_storage():
+    """
+    Return the storage `VitalsExport` files are written to, configured by
+    `VITALS_EXPORT_STORAGE` and `VITALS_EXPORT_STORAGE_OPTIONS`.
+    """
+    storage_class = get_storage_class(settings.VITALS_EXPORT_STORAGE)
+    return storage_class(**settings.VITALS_EXPORT_STORAGE_OPTIONS)
+
+
+def export_upload_to(instance, filename):
+    """
+    Store each export under its user with a random name, so exports never
+    overwrite each other and their names can't be guessed.
+    """
+    extension = os.path.splitext(filename)[1]
+    return f"vitals_exports/{instance.user_id}/{uuid.uuid4().hex}{extension}"
+
+
+class VitalsExport(CreatedUpdatedBase):
+    """
+    An export of one kind of a user's vitals readings, written to default
+    storage by the `export_vitals_to_storage` Celery task.
+
+    Large exports are made this way instead of being streamed from the web
+    worker; the user polls the export until `file` can be downloaded. The
+    file is private and is only served by `vitals_export_download`.
+    """
+
+    KIND_CHOICES = [
+        ("bloodpressure", "Blood Pressure"),
+        ("pulse", "Pulse"),
+        ("temperature", "Temperature"),
+        ("bodyweight", "Body Weight"),
+    ]
+    FORMAT_CHOICES = [
+        ("csv", "CSV"),
+        ("jsonl", "JSON Lines"),
+        ("parquet", "Parquet"),
+    ]
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="vitals_exports",
+        help_text="The user whose readings are exported.",
+    )
+    kind = models.CharField(
+        verbose_name="Kind",
+        max_length=20,
+        choices=KIND_CHOICES,
+        help_text="The kind of readings exported.",
+    )
+    file_format = models.CharField(
+        verbose_name="File Format",
+        max_length=10,
+        choices=FORMAT_CHOICES,
+        help_text="The format of the export file.",
+    )
+    start = models.DateTimeField(
+        verbose_name="Start",
+        null=True,
+        blank=True,
+        help_text="Only export readings taken at or after this time.",
+    )
+    end = models.DateTimeField(
+        verbose_name="End",
+        null=True,
+        blank=True,
+        help_text="Only export readings taken before this time.",
+    )
+    status = models.CharField(
+        verbose_name="Status",
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        help_text="How far along the export is.",
+    )
+    file = models.FileField(
+        verbose_name="File",
+        upload_to=export_upload_to,
+        storage=export_storage,
+        blank=True,
+        help_text="The finished export.",
+    )
+
+    class Meta:
+        verbose_name = "Vitals Export"
+        verbose_name_plural = "Vitals Exports"
+
+    def __str__(self):
+        return f"{self.user.username} | {self.kind}.{self.file_format} | {self.status}"
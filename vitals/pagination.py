@@ -0,0 +1,52 @@
+# vitals/pagination.py
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+
+
+def encode_cursor(reading):
+    """
+    Encode the position of `reading` in `(-created, -id)` order as an opaque,
+    URL-safe cursor.
+    """
+    raw = f"{reading.created.isoformat()}|{reading.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by `encode_cursor` into `(created, pk)`.
+
+    Raises `Http404` for a cursor that cannot be decoded, the same way an
+    invalid page number does for Django's own pagination.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created, pk = raw.split("|")
+        return datetime.fromisoformat(created), int(pk)
+    except (ValueError, UnicodeError):
+        raise Http404("Invalid cursor.")
+
+
+def keyset_page(queryset, cursor=None, page_size=25):
+    """
+    Return one page of `queryset`, newest first, and the cursor of the next
+    page (`None` on the last page).
+
+    Instead of an `OFFSET`, each page starts strictly after the `(created, id)`
+    of the last row of the previous page, so with an index on
+    `(user, created, id)` every page costs the same as the first.
+    """
+    queryset = queryset.order_by("-created", "-id")
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created__lt=created) | Q(created=created, id__lt=pk)
+        )
+    rows = list(queryset[:page_size + 1])
+    page = rows[:page_size]
+    next_cursor = encode_cursor(page[-1]) if len(rows) > page_size else None
+    return page, next_cursor
@@ -0,0 +1,257 @@
+# vitals/rollups.py
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DateField,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Greatest, Least, Trunc
+from django.utils import timezone
+
+from vitals.metrics import METRICS, metrics_for_model
+from vitals.models import VitalsRollup
+
+BUCKET_PERIODS = (
+    VitalsRollup.PERIOD_DAY,
+    VitalsRollup.PERIOD_WEEK,
+    VitalsRollup.PERIOD_MONTH,
+)
+
+
+def bucket_starts(created):
+    """
+    Return the `bucket_start` of every period that the local date of `created`
+    falls into, keyed by period.
+    """
+    day = timezone.localdate(created)
+    return {
+        VitalsRollup.PERIOD_ALL: None,
+        VitalsRollup.PERIOD_DAY: day,
+        VitalsRollup.PERIOD_WEEK: day - timedelta(days=day.weekday()),
+        VitalsRollup.PERIOD_MONTH: day.replace(day=1),
+    }
+
+
+def record_readings(metric_name, user_id, readings):
+    """
+    Add `readings`, an iterable of `(created, value)` pairs, to the rollups of
+    `metric_name` for the user with `user_id`.
+
+    Readings are combined per bucket first so each affected rollup row is
+    written once, all inside one transaction.
+    """
+    buckets = {}
+    for created, value in readings:
+        value = float(value)
+        for period, bucket_start in bucket_starts(created).items():
+            key = (period, bucket_start)
+            if key not in buckets:
+                buckets[key] = [0, 0.0, 0.0, value, value]
+            bucket = buckets[key]
+            bucket[0] += 1
+            bucket[1] += value
+            bucket[2] += value * value
+            bucket[3] = min(bucket[3], value)
+            bucket[4] = max(bucket[4], value)
+
+    with transaction.atomic():
+        for (period, bucket_start), bucket in buckets.items():
+            _add_to_bucket(metric_name, user_id, period, bucket_start, *bucket)
+
+
+def _add_to_bucket(
+    metric_name, user_id, period, bucket_start, count, total, squares, low, high
+):
+    rollup, created = VitalsRollup.objects.get_or_create(
+        user_id=user_id,
+        metric=metric_name,
+        period=period,
+        bucket_start=bucket_start,
+        defaults={
+            "count": count,
+            "total": total,
+            "sum_of_squares": squares,
+            "minimum": low,
+            "maximum": high,
+        },
+    )
+    if not created:
+        VitalsRollup.objects.filter(pk=rollup.pk).update(
+            count=F("count") + count,
+            total=F("total") + total,
+            sum_of_squares=F("sum_of_squares") + squares,
+            minimum=Least("minimum", Value(low)),
+            maximum=Greatest("maximum", Value(high)),
+            updated=timezone.now(),
+        )
+
+
+def record_instance(instance):
+    """
+    Add a newly created vitals reading to the rollups of all of its metrics.
+    """
+    for metric in metrics_for_model(type(instance)):
+        record_readings(
+            metric.name,
+            getattr(instance, f"{metric.user_field}_id"),
+            [(instance.created, getattr(instance, metric.value_field))],
+        )
+
+
+def refresh_instance_buckets(instance):
+    """
+    Recompute, from the readings themselves, every rollup bucket that
+    `instance` belongs to.
+
+    Used when a reading is edited or deleted, since a minimum or maximum cannot
+    be backed out incrementally. Only the buckets containing `instance` are
+    touched, so the cost is bounded by the size of those buckets.
+    """
+    starts = bucket_starts(instance.created)
+    with transaction.atomic():
+        for metric in metrics_for_model(type(instance)):
+            user_id = getattr(instance, f"{metric.user_field}_id")
+            for period, bucket_start in starts.items():
+                _refresh_bucket(metric, user_id, period, bucket_start)
+
+
+def _refresh_bucket(metric, user_id, period, bucket_start):
+    readings = metric.model.objects.filter(**{f"{metric.user_field}_id": user_id})
+    if period != VitalsRollup.PERIOD_ALL:
+        readings = readings.annotate(
+            bucket=Trunc("created", period, output_field=DateField())
+        ).filter(bucket=bucket_start)
+    values = readings.aggregate(**_rollup_aggregates(metric))
+
+    lookup = {
+        "user_id": user_id,
+        "metric": metric.name,
+        "period": period,
+        "bucket_start": bucket_start,
+    }
+    if not values["count"]:
+        VitalsRollup.objects.filter(**lookup).delete()
+        return
+    VitalsRollup.objects.update_or_create(defaults=values, **lookup)
+
+
+def _rollup_aggregates(metric):
+    value = F(metric.value_field)
+    return {
+        "count": Count("pk"),
+        "total": Sum(value, output_field=FloatField()),
+        "sum_of_squares": Sum(
+            ExpressionWrapper(value * value, output_field=FloatField())
+        ),
+        "minimum": Min(value, output_field=FloatField()),
+        "maximum": Max(value, output_field=FloatField()),
+    }
+
+
+def rebuild_rollups(user_ids=None, batch_size=500):
+    """
+    Throw away and recompute every rollup from the readings themselves.
+
+    Users are processed `batch_size` at a time. For each batch the grouped
+    aggregates are computed in the database and the rows are written with
+    `bulk_create`, one transaction per batch. Returns the number of rollup rows
+    written.
+    """
+    users = get_user_model().objects.order_by("pk")
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    all_user_ids = list(users.values_list("pk", flat=True))
+
+    written = 0
+    for offset in range(0, len(all_user_ids), batch_size):
+        batch = all_user_ids[offset:offset + batch_size]
+        with transaction.atomic():
+            VitalsRollup.objects.filter(user_id__in=batch).delete()
+            rollups = list(_build_rollups(batch))
+            VitalsRollup.objects.bulk_create(rollups, batch_size=batch_size)
+        written += len(rollups)
+    return written
+
+
+def _build_rollups(user_ids):
+    for metric in METRICS.values():
+        user_column = f"{metric.user_field}_id"
+        readings = metric.model.objects.filter(**{f"{user_column}__in": user_ids})
+        aggregates = _rollup_aggregates(metric)
+
+        for row in readings.values(user_column).annotate(**aggregates).order_by():
+            yield VitalsRollup(
+                user_id=row.pop(user_column),
+                metric=metric.name,
+                period=VitalsRollup.PERIOD_ALL,
+                **row,
+            )
+        for period in BUCKET_PERIODS:
+            rows = (
+                readings.annotate(
+                    bucket=Trunc("created", period, output_field=DateField())
+                )
+                .values(user_column, "bucket")
+                .annotate(**aggregates)
+                .order_by()
+            )
+            for row in rows:
+                yield VitalsRollup(
+                    user_id=row.pop(user_column),
+                    metric=metric.name,
+                    period=period,
+                    bucket_start=row.pop("bucket"),
+                    **row,
+                )
+
+
+def rollup_summary(user, metric_names):
+    """
+    Return the all-time statistics of `metric_names` for `user` from one query
+    of the rollup table.
+
+    The result has the same shape as `vitals.stats.summarize`, keyed by metric
+    name. Rollups do not track medians, so every `median` is `None`.
+    """
+    rollups = {
+        rollup.metric: rollup
+        for rollup in VitalsRollup.objects.filter(
+            user=user,
+            metric__in=metric_names,
+            period=VitalsRollup.PERIOD_ALL,
+        )
+    }
+    summary = {"count": 0}
+    for name in metric_names:
+        rollup = rollups.get(name)
+        if rollup is None:
+            summary[name] = {"min": None, "max": None, "mean": None, "median": None}
+            continue
+        summary["count"] = max(summary["count"], rollup.count)
+        summary[name] = {
+            "min": _as_number(rollup.minimum),
+            "max": _as_number(rollup.maximum),
+            "mean": round(rollup.mean, 2),
+            "median": None,
+        }
+    return summary
+
+
+def _as_number(value):
+    """
+    Rollups are stored as floats; give whole numbers back as `int`s so integer
+    readings round-trip unchanged.
+    """
+    if value is not None and float(value).is_integer():
+        return int(value)
+    return value
@@ -0,0 +1,49 @@
+# vitals/signals.py
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from vitals.models import BloodPressure, BodyWeight, Pulse, Temperature
+from vitals.rollups import record_instance, refresh_instance_buckets
+from vitals.sketches import mark_sketches_stale, record_sketch_instance
+
+
+@receiver(post_save, sender=BloodPressure)
+@receiver(post_save, sender=Pulse)
+@receiver(post_save, sender=Temperature)
+@receiver(post_save, sender=BodyWeight)
+def update_vitals_aggregates_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep `VitalsRollup` and `VitalsSketch` in step with vitals readings as they
+    are written.
+
+    New readings are added incrementally; edited readings refresh the rollup
+    buckets they belong to and mark their sketches stale.
+    """
+    if raw:
+        return
+    if created:
+        record_instance(instance)
+        record_sketch_instance(instance)
+    else:
+        refresh_instance_buckets(instance)
+        mark_sketches_stale(instance)
+
+
+@receiver(post_delete, sender=BloodPressure)
+@receiver(post_delete, sender=Pulse)
+@receiver(post_delete, sender=Temperature)
+@receiver(post_delete, sender=BodyWeight)
+def update_vitals_aggregates_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Refresh the rollup buckets of a deleted reading and mark its sketches
+    stale.
+
+    Skipped when the reading is removed because its user is being deleted,
+    since the user's rollups and sketches are deleted along with it.
+    """
+    if isinstance(origin, get_user_model()):
+        return
+    refresh_instance_buckets(instance)
+    mark_sketches_stale(instance)
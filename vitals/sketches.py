@@ -0,0 +1,387 @@
+# vitals/sketches.py
+
+import logging
+import math
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from kombu.exceptions import OperationalError
+
+from vitals.metrics import METRICS, metrics_for_model
+from vitals.models import VitalsSketch
+from vitals.stats import quantiles
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+# Seconds during which a queued sketch rebuild is not queued again. A rebuild
+# that was lost is queued by the next read after that.
+REBUILD_QUEUE_TIMEOUT = 600
+
+
+class KLLSketch:
+    """
+    A KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Items are kept in a stack of "compactors". Level `h` holds items that each
+    stand for `2 ** h` readings; when a level fills up it is sorted and every
+    other item is promoted to the level above. Memory stays around `3 * k`
+    items however many readings are added, updates are amortized O(1), two
+    sketches can be merged, and rank error shrinks roughly as `1 / k`.
+
+    The classic algorithm flips a coin to choose which half of a compactor is
+    promoted. Here each level alternates instead, so the same readings always
+    give the same sketch.
+    """
+
+    def __init__(self, k=200, c=2 / 3):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.compactors = [[]]
+        self.offsets = [0]
+
+    def capacity(self, level):
+        height = len(self.compactors) - level - 1
+        return int(math.ceil(self.c**height * self.k)) + 1
+
+    @property
+    def size(self):
+        return sum(len(compactor) for compactor in self.compactors)
+
+    @property
+    def max_size(self):
+        return sum(self.capacity(level) for level in range(len(self.compactors)))
+
+    def update(self, value):
+        self.compactors[0].append(float(value))
+        self.n += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        while self.size >= self.max_size:
+            self._compress()
+
+    def quantile(self, fraction):
+        """
+        Return an estimate of the `fraction` quantile, or `None` when empty.
+        """
+        if not self.n:
+            return None
+        weighted = sorted(
+            (value, 2**level)
+            for level, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+        total = sum(weight for _, weight in weighted)
+        target = fraction * total
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+    def _grow(self):
+        self.compactors.append([])
+        self.offsets.append(0)
+
+    def _compress(self):
+        for level in range(len(self.compactors)):
+            compactor = self.compactors[level]
+            if len(compactor) < self.capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self._grow()
+            compactor.sort()
+            # Keep the odd item out, if any, at this level.
+            leftover = [compactor.pop()] if len(compactor) % 2 else []
+            offset = self.offsets[level]
+            self.offsets[level] = 1 - offset
+            self.compactors[level + 1].extend(compactor[offset::2])
+            self.compactors[level] = leftover
+            # Compacting one level is enough to make room.
+            break
+
+    def to_dict(self):
+        return {
+            "k": self.k,
+            "n": self.n,
+            "compactors": self.compactors,
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data.get("k", 200))
+        if data:
+            sketch.n = data["n"]
+            sketch.compactors = [list(compactor) for compactor in data["compactors"]]
+            sketch.offsets = list(data["offsets"])
+        return sketch
+
+
+def record_sketch_values(metric_name, user_id, values):
+    """
+    Add `values` to the `metric_name` sketch of the user with `user_id`.
+
+    The sketch row is locked while it is updated so concurrent writes are not
+    lost.
+    """
+    with transaction.atomic():
+        row, _ = VitalsSketch.objects.select_for_update().get_or_create(
+            user_id=user_id,
+            metric=metric_name,
+        )
+        if row.is_stale:
+            # A stale sketch is rebuilt from the readings by a queued task,
+            # which will include these values.
+            return
+        sketch = KLLSketch.from_dict(row.state)
+        for value in values:
+            sketch.update(value)
+        row.state = sketch.to_dict()
+        row.count = sketch.n
+        row.save(update_fields=["state", "count", "updated"])
+
+
+def record_sketch_instance(instance):
+    """
+    Add a newly created vitals reading to the sketches of all of its metrics.
+    """
+    for metric in metrics_for_model(type(instance)):
+        record_sketch_values(
+            metric.name,
+            getattr(instance, f"{metric.user_field}_id"),
+            [getattr(instance, metric.value_field)],
+        )
+
+
+def mark_sketches_stale(instance):
+    """
+    Flag the sketches of an edited or deleted reading as stale and queue their
+    rebuild.
+
+    Sketches cannot forget a reading, so they are rebuilt from the readings by
+    `rebuild_vitals_sketch` once the write has committed. Until then quantiles
+    are answered exactly.
+    """
+    for metric in metrics_for_model(type(instance)):
+        user_id = getattr(instance, f"{metric.user_field}_id")
+        sketches = VitalsSketch.objects.filter(user_id=user_id, metric=metric.name)
+        if sketches.update(is_stale=True):
+            queue_sketch_rebuild(user_id, metric.name)
+
+
+def _rebuild_queued_key(user_id, metric_name):
+    return f"vitals_sketch:{user_id}:{metric_name}:rebuild_queued"
+
+
+def queue_sketch_rebuild(user_id, metric_name):
+    """
+    Queue `rebuild_vitals_sketch` for the user's `metric_name` sketch once the
+    current transaction commits, unless a rebuild is queued already.
+    """
+    from vitals.tasks import rebuild_vitals_sketch  # avoid circular import
+
+    def queue():
+        key = _rebuild_queued_key(user_id, metric_name)
+        if not cache.add(key, True, timeout=REBUILD_QUEUE_TIMEOUT):
+            return
+        try:
+            rebuild_vitals_sketch.delay(user_id, metric_name)
+        except OperationalError:
+            # The sketch stays stale and is answered exactly; saving the
+            # reading itself must not fail because the broker is down.
+            cache.delete(key)
+            logger.warning(
+                "Could not queue a %s sketch rebuild for %s.", metric_name, user_id
+            )
+
+    transaction.on_commit(queue)
+
+
+def rebuild_sketch(user_id, metric_name):
+    """
+    Rebuild the user's stale `metric_name` sketch from their readings. Returns
+    whether the sketch was rebuilt.
+
+    The row stays locked while the readings are read, so a reading written
+    meanwhile is either among them or added to the rebuilt sketch afterwards
+    by `record_sketch_values`.
+    """
+    # Let a write that marks the sketch stale again queue another rebuild.
+    cache.delete(_rebuild_queued_key(user_id, metric_name))
+    with transaction.atomic():
+        row = (
+            VitalsSketch.objects.select_for_update()
+            .filter(user_id=user_id, metric=metric_name)
+            .first()
+        )
+        if row is None or not row.is_stale:
+            return False
+        sketch = build_sketch(METRICS[metric_name], user_id)
+        row.state, row.count, row.is_stale = sketch.to_dict(), sketch.n, False
+        row.save(update_fields=["state", "count", "is_stale", "updated"])
+    return True
+
+
+def build_sketch(metric, user_id, chunk_size=2000):
+    """
+    Build a sketch of `metric` for the user with `user_id` by streaming their
+    readings from the database.
+    """
+    sketch = KLLSketch()
+    readings = (
+        metric.model.objects.filter(**{f"{metric.user_field}_id": user_id})
+        .order_by()
+        .values_list(metric.value_field, flat=True)
+    )
+    for value in readings.iterator(chunk_size=chunk_size):
+        sketch.update(value)
+    return sketch
+
+
+def rebuild_sketches(user_ids=None, batch_size=500):
+    """
+    Throw away and rebuild every sketch from the readings themselves. Returns
+    the number of sketches written.
+    """
+    users = get_user_model().objects.order_by("pk")
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    all_user_ids = list(users.values_list("pk", flat=True))
+
+    written = 0
+    for offset in range(0, len(all_user_ids), batch_size):
+        batch = all_user_ids[offset:offset + batch_size]
+        sketches = []
+        for user_id in batch:
+            for metric in METRICS.values():
+                sketch = build_sketch(metric, user_id)
+                if sketch.n:
+                    sketches.append(
+                        VitalsSketch(
+                            user_id=user_id,
+                            metric=metric.name,
+                            count=sketch.n,
+                            state=sketch.to_dict(),
+                        )
+                    )
+        with transaction.atomic():
+            VitalsSketch.objects.filter(user_id__in=batch).delete()
+            VitalsSketch.objects.bulk_create(sketches, batch_size=batch_size)
+        written += len(sketches)
+    return written
+
+
+def _sketch_rows(user, metric_names):
+    return {
+        row.metric: row
+        for row in VitalsSketch.objects.filter(user=user, metric__in=metric_names)
+    }
+
+
+def sketch_quantiles(user, metric_names, fractions=DEFAULT_QUANTILES, rows=None):
+    """
+    Return the sketched quantiles of `metric_names` for `user`, keyed by metric
+    name and then fraction, together with each metric's reading count.
+
+    Metrics whose sketch is stale are answered exactly instead, and their
+    rebuild is queued. `rows` are the user's `VitalsSketch` rows by metric,
+    when they have been read already.
+    """
+    if rows is None:
+        rows = _sketch_rows(user, metric_names)
+    stale = _queue_stale_rebuilds(user, rows, metric_names)
+    result = exact_quantiles(user, stale, fractions) if stale else {}
+    for name in metric_names:
+        if name in stale:
+            continue
+        row = rows.get(name)
+        sketch = KLLSketch.from_dict(row.state if row else {})
+        result[name] = {
+            "count": sketch.n,
+            "quantiles": {
+                fraction: sketch.quantile(fraction) for fraction in fractions
+            },
+        }
+    return {name: result[name] for name in metric_names}
+
+
+def _queue_stale_rebuilds(user, rows, metric_names):
+    """
+    Queue the rebuild of the stale sketches among `metric_names` and return
+    their names.
+    """
+    stale = [name for name in metric_names if name in rows and rows[name].is_stale]
+    for name in stale:
+        queue_sketch_rebuild(user.pk, name)
+    return stale
+
+
+def exact_quantiles(user, metric_names, fractions=DEFAULT_QUANTILES):
+    """
+    Return the exact quantiles of `metric_names` for `user` in the same shape
+    as `sketch_quantiles`, with one query per vitals model involved.
+    """
+    by_model = {}
+    for name in metric_names:
+        by_model.setdefault(METRICS[name].model, []).append(METRICS[name])
+
+    result = {}
+    for model, metrics in by_model.items():
+        user_field = metrics[0].user_field
+        fields = [metric.value_field for metric in metrics]
+        readings = model.objects.filter(**{user_field: user})
+        values = quantiles(readings, fields, fractions)
+        for metric in metrics:
+            result[metric.name] = {
+                "count": values["count"],
+                "quantiles": values[metric.value_field],
+            }
+    return result
+
+
+def metric_quantiles(user, metric_names, fractions=DEFAULT_QUANTILES):
+    """
+    Return the quantiles of `metric_names` for `user`, choosing between exact
+    and sketched answers according to `settings.VITALS_QUANTILE_MODE`:
+
+    - `"exact"`: always compute exact quantiles from the readings.
+    - `"sketch"`: always answer from the sketches.
+    - `"auto"`: answer from the sketch once a metric has at least
+      `settings.VITALS_SKETCH_THRESHOLD` readings, so large accounts stay fast
+      while small ones stay exact.
+    """
+    mode = getattr(settings, "VITALS_QUANTILE_MODE", "auto")
+    if mode == "exact":
+        return exact_quantiles(user, metric_names, fractions)
+    if mode == "sketch":
+        return sketch_quantiles(user, metric_names, fractions)
+
+    # The count of a stale sketch is only an estimate, but it is good enough to
+    # choose with, and small histories then never queue a sketch rebuild.
+    threshold = getattr(settings, "VITALS_SKETCH_THRESHOLD", 5000)
+    rows = _sketch_rows(user, metric_names)
+    large = [
+        name for name in metric_names if name in rows and rows[name].count >= threshold
+    ]
+    stale = _queue_stale_rebuilds(user, rows, large)
+    large = [name for name in large if name not in stale]
+    small = [name for name in metric_names if name not in large]
+    result = {}
+    if large:
+        # Stale sketches were left to the exact answer, so no readings are read.
+        result.update(sketch_quantiles(user, large, fractions, rows=rows))
+    if small:
+        result.update(exact_quantiles(user, small, fractions))
+    return {name: result[name] for name in metric_names}
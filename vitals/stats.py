@@ -0,0 +1,251 @@
+# vitals/stats.py
+
+from django.db import connections
+from django.db.models import Aggregate, Avg, Count, FloatField, Max, Min
+
+from vitals.models import BloodPressure
+
+BLOOD_PRESSURE_FIELDS = ("systolic", "diastolic", "pulse")
+
+
+class Percentile(Aggregate):
+    """
+    Postgres `PERCENTILE_CONT` ordered-set aggregate.
+    """
+
+    function = "PERCENTILE_CONT"
+    name = "Percentile"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction, **extra):
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+class Median(Percentile):
+    """
+    Postgres `PERCENTILE_CONT(0.5)` ordered-set aggregate.
+    """
+
+    name = "Median"
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, 0.5, **extra)
+
+
+def summarize(queryset, fields):
+    """
+    Return `count` and the `min`, `max`, `mean` and `median` of each of `fields`
+    over `queryset` using a single database round-trip.
+
+    The result looks like:
+
+        {
+            "count": 3,
+            "systolic": {"min": 110, "max": 120, "mean": 115.0, "median": 115},
+            ...
+        }
+
+    Every statistic is `None` when `queryset` is empty.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        row = _summarize_with_percentile(queryset, fields)
+    else:
+        row = _summarize_with_window(queryset, fields, connection)
+
+    summary = {"count": row["count"]}
+    for field in fields:
+        mean = row[f"{field}_mean"]
+        summary[field] = {
+            "min": row[f"{field}_min"],
+            "max": row[f"{field}_max"],
+            "mean": round(mean, 2) if mean is not None else None,
+            "median": _median_value(row[f"{field}_median"], row["count"]),
+        }
+    return summary
+
+
+def _median_value(median, count):
+    """
+    Give the median the type `statistics.median` would: the middle reading
+    itself, so an `int` for integer readings, when `count` is odd, and the
+    mean of the two middle readings when it is even. The database returns a
+    float either way.
+    """
+    if median is not None and count % 2 and float(median).is_integer():
+        return int(median)
+    return median
+
+
+def _summarize_with_percentile(queryset, fields):
+    """
+    Compute the summary with regular aggregates plus `PERCENTILE_CONT`.
+    """
+    aggregates = {"count": Count("pk")}
+    for field in fields:
+        aggregates[f"{field}_min"] = Min(field)
+        aggregates[f"{field}_max"] = Max(field)
+        aggregates[f"{field}_mean"] = Avg(field)
+        aggregates[f"{field}_median"] = Median(field)
+    return queryset.order_by().aggregate(**aggregates)
+
+
+def _summarize_with_window(queryset, fields, connection):
+    """
+    Compute the summary for backends without `PERCENTILE_CONT` (SQLite).
+
+    Each row is ranked per field with `ROW_NUMBER()` and the median is the
+    average of the one or two rows sitting at the middle offset(s).
+    """
+    qn = connection.ops.quote_name
+    select_columns = ["COUNT(*)"]
+    for field in fields:
+        column = qn(field)
+        rank = qn(field + "_rank")
+        select_columns += [
+            f"MIN({column})",
+            f"MAX({column})",
+            f"AVG({column})",
+            f"AVG(CASE WHEN {rank} IN ((n + 1) / 2, (n + 2) / 2) "
+            f"THEN {column} END)",
+        ]
+    sql, params = _ranked_select(queryset, fields, connection, select_columns)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        values = iter(cursor.fetchone())
+
+    row = {"count": next(values)}
+    for field in fields:
+        for statistic in ("min", "max", "mean", "median"):
+            row[f"{field}_{statistic}"] = next(values)
+    return row
+
+
+def _ranked_select(queryset, fields, connection, select_columns):
+    """
+    Build `SELECT <select_columns>` over `queryset`'s `fields`, where each row
+    also carries a `<field>_rank` `ROW_NUMBER()` per field and the row count
+    `n`.
+    """
+    qn = connection.ops.quote_name
+    inner_sql, params = queryset.order_by().values(*fields).query.sql_with_params()
+    rank_columns = ", ".join(
+        f"ROW_NUMBER() OVER (ORDER BY {qn(field)}) AS {qn(field + '_rank')}"
+        for field in fields
+    )
+    sql = (
+        f"SELECT {', '.join(select_columns)} FROM ("
+        f"SELECT *, {rank_columns}, COUNT(*) OVER () AS n "
+        f"FROM ({inner_sql}) AS readings"
+        f") AS ranked"
+    )
+    return sql, params
+
+
+def quantiles(queryset, fields, fractions):
+    """
+    Return the exact, linearly interpolated quantiles (`PERCENTILE_CONT`
+    semantics) of each of `fields` over `queryset` in one database round-trip.
+
+    The result looks like:
+
+        {
+            "count": 3,
+            "systolic": {0.5: 115.0, 0.9: 119.0},
+            ...
+        }
+
+    Every quantile is `None` when `queryset` is empty.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        aggregates = {"count": Count("pk")}
+        for field in fields:
+            for index, fraction in enumerate(fractions):
+                aggregates[f"{field}_{index}"] = Percentile(field, fraction)
+        row = queryset.order_by().aggregate(**aggregates)
+        result = {"count": row["count"]}
+        for field in fields:
+            result[field] = {
+                fraction: row[f"{field}_{index}"]
+                for index, fraction in enumerate(fractions)
+            }
+        return result
+
+    # Fetch the value at the floor and the ceiling of each quantile's rank
+    # position, `1 + fraction * (n - 1)`, then interpolate between them.
+    qn = connection.ops.quote_name
+    select_columns = ["COUNT(*)"]
+    for field in fields:
+        column = qn(field)
+        rank = qn(field + "_rank")
+        for fraction in fractions:
+            position = f"CAST(1 + {float(fraction)!r} * (n - 1) AS INTEGER)"
+            select_columns += [
+                f"MAX(CASE WHEN {rank} = {position} THEN {column} END)",
+                f"MAX(CASE WHEN {rank} = {position} + 1 THEN {column} END)",
+            ]
+    sql, params = _ranked_select(queryset, fields, connection, select_columns)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        values = iter(cursor.fetchone())
+
+    count = next(values)
+    result = {"count": count}
+    for field in fields:
+        result[field] = {}
+        for fraction in fractions:
+            low, high = next(values), next(values)
+            if low is None:
+                result[field][fraction] = None
+                continue
+            position = 1 + float(fraction) * (count - 1)
+            weight = position - int(position)
+            low = float(low)
+            high = float(high) if high is not None else low
+            result[field][fraction] = low + weight * (high - low)
+    return result
+
+
+def blood_pressure_statistics(user):
+    """
+    Return the `summarize` statistics of `user`'s `BloodPressure` readings.
+    """
+    return summarize(
+        BloodPressure.objects.filter(user=user),
+        BLOOD_PRESSURE_FIELDS,
+    )
+
+
+def blood_pressure_range(summary):
+    """
+    Reshape a `blood_pressure_statistics` summary into the minimum and maximum
+    systolic and diastolic readings, or `None` when there are no readings.
+    """
+    if not summary["count"]:
+        return None
+    return {
+        "systolic_min": summary["systolic"]["min"],
+        "diastolic_min": summary["diastolic"]["min"],
+        "systolic_max": summary["systolic"]["max"],
+        "diastolic_max": summary["diastolic"]["max"],
+    }
+
+
+def blood_pressure_averages_and_medians(summary):
+    """
+    Reshape a `blood_pressure_statistics` summary into the average and median
+    systolic and diastolic readings. Every value is `None` when there are no
+    readings.
+
+    The medians may have been filled in from `vitals.sketches`, so they are
+    given the `statistics.median` type here too.
+    """
+    count = summary["count"]
+    return {
+        "systolic_average": summary["systolic"]["mean"],
+        "diastolic_average": summary["diastolic"]["mean"],
+        "systolic_median": _median_value(summary["systolic"]["median"], count),
+        "diastolic_median": _median_value(summary["diastolic"]["median"], count),
+    }
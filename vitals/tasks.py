@@ -0,0 +1,61 @@
+# vitals/tasks.py
+
+import tempfile
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.files import File
+
+from vitals.exporters import export_filename, stream_export
+from vitals.models import VitalsExport
+from vitals.sketches import rebuild_sketch
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def export_vitals_to_storage(export_id):
+    """
+    Write the `VitalsExport` with `export_id` to default storage.
+
+    The export is streamed into a temporary file first, so the worker never
+    holds the whole history in memory either.
+    """
+    export = VitalsExport.objects.get(pk=export_id)
+    export.status = VitalsExport.STATUS_RUNNING
+    export.save(update_fields=["status", "updated"])
+    try:
+        with tempfile.TemporaryFile() as temporary_file:
+            for piece in stream_export(
+                export.user,
+                export.kind,
+                export.file_format,
+                start=export.start,
+                end=export.end,
+            ):
+                if isinstance(piece, str):
+                    piece = piece.encode()
+                temporary_file.write(piece)
+            temporary_file.seek(0)
+            export.file.save(
+                export_filename(export.kind, export.file_format),
+                File(temporary_file),
+                save=False,
+            )
+    except Exception:
+        logger.exception("Vitals export %s failed.", export_id)
+        export.status = VitalsExport.STATUS_FAILED
+        export.save(update_fields=["status", "updated"])
+        raise
+    export.status = VitalsExport.STATUS_DONE
+    export.save(update_fields=["file", "status", "updated"])
+    logger.info("Vitals export %s written to %s.", export_id, export.file.name)
+
+
+@shared_task
+def rebuild_vitals_sketch(user_id, metric_name):
+    """
+    Rebuild the stale `metric_name` `VitalsSketch` of the user with `user_id`.
+    """
+    if rebuild_sketch(user_id, metric_name):
+        logger.info("Rebuilt the %s sketch of user %s.", metric_name, user_id)
@@ -0,0 +1,216 @@
+import io
+import json
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from vitals.exporters import pyarrow, stream_export
+from vitals.importers import import_readings
+from vitals.models import BloodPressure, Temperature, VitalsExport
+from vitals.tasks import export_vitals_to_storage
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = "RegisteredUser"
+PASSWORD_FOR_TESTING = "a_test_password"
+
+VITALS_EXPORT_VIEW_NAME = "vitals:vitals-export"
+
+START = timezone.make_aware(datetime(2024, 1, 1))
+
+
+def streamed_content(response):
+    return b"".join(response.streaming_content)
+
+
+class VitalsExportTestBase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+        for index in range(5):
+            reading = BloodPressure.objects.create(
+                user=cls.user, systolic=120 + index, diastolic=80, pulse=70
+            )
+            BloodPressure.objects.filter(pk=reading.pk).update(
+                created=START + timedelta(days=index)
+            )
+        Temperature.objects.create(subject=cls.user, measurement=Decimal("98.6"))
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+
+class StreamExportTest(VitalsExportTestBase):
+    """
+    Tests for `vitals.exporters.stream_export`.
+    """
+
+    def test_csv(self):
+        lines = list(stream_export(self.user, "bloodpressure", "csv"))
+        self.assertEqual(lines[0], "created,systolic,diastolic,pulse\r\n")
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[1].endswith(",120,80,70\r\n"))
+
+    def test_jsonl(self):
+        lines = list(stream_export(self.user, "temperature", "jsonl"))
+        self.assertEqual(json.loads(lines[0])["measurement"], 98.6)
+
+    def test_date_range(self):
+        lines = list(
+            stream_export(
+                self.user,
+                "bloodpressure",
+                "csv",
+                start=START + timedelta(days=1),
+                end=START + timedelta(days=3),
+            )
+        )
+        self.assertEqual(len(lines), 3)
+
+    def test_export_can_be_imported_again(self):
+        export = "".join(stream_export(self.user, "bloodpressure", "jsonl"))
+        report = import_readings(
+            self.user, "bloodpressure", io.StringIO(export), "jsonl"
+        )
+        self.assertEqual(report.duplicates, 5)
+        self.assertEqual(report.created, 0)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            stream_export(self.user, "bloodpressure", "xlsx")
+
+    @skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        content = b"".join(
+            stream_export(self.user, "bloodpressure", "parquet", chunk_size=2)
+        )
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(content))
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(
+            table.column("systolic").to_pylist(), [120, 121, 122, 123, 124]
+        )
+
+
+class VitalsExportViewTest(VitalsExportTestBase):
+    """
+    Tests for the `vitals_export` and `vitals_export_status` views.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def test_streams_csv(self):
+        response = self.client.get(
+            reverse(VITALS_EXPORT_VIEW_NAME, args=["bloodpressure"]),
+            {"start": "2024-01-02"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("bloodpressure.csv", response["Content-Disposition"])
+        self.assertEqual(len(streamed_content(response).splitlines()), 5)
+
+    def test_bad_parameters(self):
+        url = reverse(VITALS_EXPORT_VIEW_NAME, args=["bloodpressure"])
+        self.assertEqual(self.client.get(url, {"format": "xlsx"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"start": "soon"}).status_code, 400)
+        response = self.client.get(reverse(VITALS_EXPORT_VIEW_NAME, args=["mood"]))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(VITALS_EXPORT_STREAM_LIMIT=4)
+    def test_large_exports_run_in_the_background(self):
+        with mock.patch("vitals.views.export_vitals_to_storage.delay") as delay:
+            response = self.client.get(
+                reverse(VITALS_EXPORT_VIEW_NAME, args=["bloodpressure"])
+            )
+        self.assertEqual(response.status_code, 202)
+        export = VitalsExport.objects.get(user=self.user)
+        delay.assert_called_once_with(export.pk)
+        self.assertEqual(
+            response.json()["status_url"],
+            reverse("vitals:vitals-export-status", args=[export.pk]),
+        )
+
+    def test_background_export(self):
+        with self.settings(MEDIA_ROOT=self.media_root, CELERY_TASK_ALWAYS_EAGER=True):
+            response = self.client.get(
+                reverse(VITALS_EXPORT_VIEW_NAME, args=["bloodpressure"]),
+                {"format": "jsonl", "background": "1"},
+            )
+            status = self.client.get(response.json()["status_url"]).json()
+            self.assertEqual(status["status"], VitalsExport.STATUS_DONE)
+            export = VitalsExport.objects.get(user=self.user)
+            self.assertEqual(
+                status["download_url"],
+                reverse("vitals:vitals-export-download", args=[export.pk]),
+            )
+            download = self.client.get(status["download_url"])
+            self.assertIn("bloodpressure.jsonl", download["Content-Disposition"])
+            self.assertEqual(len(streamed_content(download).splitlines()), 5)
+            download.close()
+
+    def test_exports_are_stored_under_distinct_names(self):
+        other = CustomUser.objects.create(username="AnotherUser")
+        BloodPressure.objects.create(user=other, systolic=130, diastolic=85, pulse=72)
+        exports = [
+            VitalsExport.objects.create(
+                user=user, kind="bloodpressure", file_format="csv"
+            )
+            for user in [self.user, other, self.user]
+        ]
+        with self.settings(MEDIA_ROOT=self.media_root):
+            for export in exports:
+                export_vitals_to_storage(export.pk)
+        names = [VitalsExport.objects.get(pk=export.pk).file.name for export in exports]
+        self.assertEqual(len(set(names)), 3)
+        self.assertTrue(names[0].startswith(f"vitals_exports/{self.user.pk}/"))
+        self.assertTrue(names[1].startswith(f"vitals_exports/{other.pk}/"))
+        self.assertNotIn("bloodpressure", names[0])
+
+    def test_failed_export_is_marked(self):
+        export = VitalsExport.objects.create(
+            user=self.user, kind="bloodpressure", file_format="xlsx"
+        )
+        with self.assertRaises(ValueError), self.assertLogs("vitals.tasks"):
+            export_vitals_to_storage(export.pk)
+        export.refresh_from_db()
+        self.assertEqual(export.status, VitalsExport.STATUS_FAILED)
+
+    def test_status_of_another_users_export(self):
+        other = CustomUser.objects.create(username="AnotherUser")
+        export = VitalsExport.objects.create(
+            user=other, kind="bloodpressure", file_format="csv"
+        )
+        response = self.client.get(
+            reverse("vitals:vitals-export-status", args=[export.pk])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_of_another_users_export(self):
+        other = CustomUser.objects.create(username="AnotherUser")
+        export = VitalsExport.objects.create(
+            user=other,
+            kind="bloodpressure",
+            file_format="csv",
+            status=VitalsExport.STATUS_DONE,
+        )
+        response = self.client.get(
+            reverse("vitals:vitals-export-download", args=[export.pk])
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,236 @@
+import io
+import os
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from vitals.importers import import_readings
+from vitals.models import BloodPressure, Temperature, VitalsRollup, VitalsSketch
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = "RegisteredUser"
+PASSWORD_FOR_TESTING = "a_test_password"
+
+VITALS_IMPORT_VIEW_NAME = "vitals:vitals-import"
+
+BLOOD_PRESSURE_CSV = """created,systolic,diastolic,pulse
+2024-01-01T08:00:00,120,80,70
+2024-01-01T20:00:00,130,85,72
+2024-01-01T20:00:00,130,85,72
+2024-01-02T08:00:00,lots,85,72
+2024-01-02T20:00:00,110,75,
+"""
+
+TEMPERATURE_JSONL = """{"created": "2024-01-01T08:00:00", "measurement": "98.6"}
+{"created": "2024-01-02T08:00:00", "measurement": 99.1}
+
+not json
+{"created": "yesterday", "measurement": "98.6"}
+"""
+
+
+class ImportReadingsTest(TestCase):
+    """
+    Tests for `vitals.importers.import_readings`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+
+    def test_csv_import(self):
+        report = import_readings(
+            self.user, "bloodpressure", io.StringIO(BLOOD_PRESSURE_CSV), "csv"
+        )
+        self.assertEqual(report.processed, 5)
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual(report.invalid, 2)
+        self.assertEqual([line for line, _ in report.errors], [5, 6])
+
+        readings = BloodPressure.objects.filter(user=self.user).order_by("created")
+        self.assertEqual(
+            [reading.created for reading in readings],
+            [
+                timezone.make_aware(datetime(2024, 1, 1, 8)),
+                timezone.make_aware(datetime(2024, 1, 1, 20)),
+            ],
+        )
+
+    def test_jsonl_import(self):
+        report = import_readings(
+            self.user, "temperature", io.StringIO(TEMPERATURE_JSONL), "jsonl"
+        )
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.invalid, 2)
+        self.assertEqual(
+            set(Temperature.objects.values_list("measurement", flat=True)),
+            {Decimal("98.6"), Decimal("99.1")},
+        )
+
+    def test_reimport_skips_existing_readings(self):
+        import_readings(
+            self.user, "bloodpressure", io.StringIO(BLOOD_PRESSURE_CSV), "csv"
+        )
+        report = import_readings(
+            self.user, "bloodpressure", io.StringIO(BLOOD_PRESSURE_CSV), "csv"
+        )
+        self.assertEqual(report.created, 0)
+        self.assertEqual(report.duplicates, 3)
+        self.assertEqual(BloodPressure.objects.count(), 2)
+
+    def test_batches_report_progress(self):
+        reports = []
+        import_readings(
+            self.user,
+            "bloodpressure",
+            io.StringIO(BLOOD_PRESSURE_CSV),
+            "csv",
+            batch_size=2,
+            progress=lambda report: reports.append(report.processed),
+        )
+        self.assertEqual(reports, [2, 4, 5])
+
+    def test_duplicates_across_batches(self):
+        report = import_readings(
+            self.user,
+            "bloodpressure",
+            io.StringIO(BLOOD_PRESSURE_CSV),
+            "csv",
+            batch_size=2,
+        )
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.duplicates, 1)
+
+    def test_rollups_and_sketches_are_updated(self):
+        import_readings(
+            self.user, "bloodpressure", io.StringIO(BLOOD_PRESSURE_CSV), "csv"
+        )
+        rollup = VitalsRollup.objects.get(
+            user=self.user, metric="systolic", period=VitalsRollup.PERIOD_ALL
+        )
+        self.assertEqual(rollup.count, 2)
+        self.assertEqual(rollup.maximum, 130)
+        day = VitalsRollup.objects.get(
+            user=self.user, metric="systolic", period=VitalsRollup.PERIOD_DAY
+        )
+        self.assertEqual(str(day.bucket_start), "2024-01-01")
+        sketch = VitalsSketch.objects.get(user=self.user, metric="diastolic")
+        self.assertEqual(sketch.count, 2)
+
+
+class ImportVitalsCommandTest(TestCase):
+    """
+    Tests for the `import_vitals` management command.
+    """
+
+    def test_command(self):
+        user = CustomUser.objects.create(username=USERNAME_REGISTRATION_ACCEPTED_TRUE)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "readings.csv")
+            with open(path, "w") as file:
+                file.write(BLOOD_PRESSURE_CSV)
+            out, err = io.StringIO(), io.StringIO()
+            call_command(
+                "import_vitals",
+                path,
+                user=user.username,
+                kind="bloodpressure",
+                stdout=out,
+                stderr=err,
+            )
+        self.assertIn("Processed 5 rows: 2 created", out.getvalue())
+        self.assertIn("Imported 2 readings.", out.getvalue())
+        self.assertIn("Line 5:", err.getvalue())
+        self.assertEqual(BloodPressure.objects.filter(user=user).count(), 2)
+
+
+class VitalsImportViewTest(TestCase):
+    """
+    Tests for `VitalsImportView`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_get(self):
+        response = self.client.get(reverse(VITALS_IMPORT_VIEW_NAME))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "vitals/vitals_import.html")
+        self.assertEqual(response.context["page_title"], "Import Vitals")
+
+    def test_upload(self):
+        upload = SimpleUploadedFile("readings.csv", BLOOD_PRESSURE_CSV.encode())
+        response = self.client.post(
+            reverse(VITALS_IMPORT_VIEW_NAME),
+            {"kind": "bloodpressure", "file": upload},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["report"].created, 2)
+        self.assertContains(response, "Line 5:")
+        self.assertEqual(BloodPressure.objects.filter(user=self.user).count(), 2)
+
+    def test_upload_rejects_unknown_extension(self):
+        upload = SimpleUploadedFile("readings.xlsx", b"data")
+        response = self.client.post(
+            reverse(VITALS_IMPORT_VIEW_NAME),
+            {"kind": "bloodpressure", "file": upload},
+        )
+        self.assertFormError(
+            response.context["form"], "file", "Upload a `.csv` or `.jsonl` file."
+        )
+
+    def test_upload_rejects_text_that_is_not_utf_8(self):
+        upload = SimpleUploadedFile(
+            "readings.csv",
+            "created,systolic\n2024-05-16T08:00,120 µ\n".encode("latin-1"),
+        )
+        response = self.client.post(
+            reverse(VITALS_IMPORT_VIEW_NAME),
+            {"kind": "bloodpressure", "file": upload},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response.context["form"], "file", "The file is not UTF-8 encoded text."
+        )
+        self.assertNotIn("report", response.context)
+
+    def test_upload_rejects_a_malformed_csv(self):
+        # A quoted field longer than the csv module's field size limit.
+        upload = SimpleUploadedFile(
+            "readings.csv", b'created,systolic\n"' + b"x" * 200_000 + b'"\n'
+        )
+        response = self.client.post(
+            reverse(VITALS_IMPORT_VIEW_NAME),
+            {"kind": "bloodpressure", "file": upload},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "not a valid CSV file", response.context["form"].errors["file"][0]
+        )
+
+    def test_anonymous_user_is_refused(self):
+        self.client.logout()
+        response = self.client.get(reverse(VITALS_IMPORT_VIEW_NAME))
+        self.assertNotEqual(response.status_code, 200)
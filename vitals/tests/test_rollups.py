@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from vitals.models import BloodPressure, BodyWeight, VitalsRollup
+from vitals.rollups import bucket_starts, rebuild_rollups, rollup_summary
+
+A_TEST_USERNAME = "ACustomUser"
+
+
+def all_time(user, metric):
+    return VitalsRollup.objects.get(
+        user=user, metric=metric, period=VitalsRollup.PERIOD_ALL
+    )
+
+
+class BucketStartsTest(TestCase):
+    """
+    Tests for `vitals.rollups.bucket_starts`.
+    """
+
+    def test_bucket_starts(self):
+        created = timezone.make_aware(datetime(2024, 5, 16, 12, 30))
+        starts = bucket_starts(created)
+        self.assertIsNone(starts[VitalsRollup.PERIOD_ALL])
+        self.assertEqual(str(starts[VitalsRollup.PERIOD_DAY]), "2024-05-16")
+        # 2024-05-16 is a Thursday; weeks start on Monday.
+        self.assertEqual(str(starts[VitalsRollup.PERIOD_WEEK]), "2024-05-13")
+        self.assertEqual(str(starts[VitalsRollup.PERIOD_MONTH]), "2024-05-01")
+
+
+class VitalsRollupMaintenanceTest(TestCase):
+    """
+    Tests for keeping `VitalsRollup` up to date as readings are written.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username=A_TEST_USERNAME)
+
+    def create_blood_pressure(self, systolic, diastolic, pulse):
+        return BloodPressure.objects.create(
+            user=self.user, systolic=systolic, diastolic=diastolic, pulse=pulse
+        )
+
+    def test_new_readings_are_added_incrementally(self):
+        self.create_blood_pressure(120, 80, 70)
+        self.create_blood_pressure(110, 70, 60)
+        rollup = all_time(self.user, "systolic")
+        self.assertEqual(rollup.count, 2)
+        self.assertEqual(rollup.total, 230)
+        self.assertEqual(rollup.sum_of_squares, 120**2 + 110**2)
+        self.assertEqual(rollup.minimum, 110)
+        self.assertEqual(rollup.maximum, 120)
+        self.assertEqual(rollup.mean, 115)
+        self.assertEqual(rollup.variance, 25)
+        # One row per period for each of the three blood pressure metrics.
+        self.assertEqual(VitalsRollup.objects.filter(user=self.user).count(), 12)
+
+    def test_editing_a_reading_refreshes_its_buckets(self):
+        self.create_blood_pressure(120, 80, 70)
+        reading = self.create_blood_pressure(110, 70, 60)
+        reading.systolic = 140
+        reading.save()
+        rollup = all_time(self.user, "systolic")
+        self.assertEqual(rollup.count, 2)
+        self.assertEqual(rollup.minimum, 120)
+        self.assertEqual(rollup.maximum, 140)
+
+    def test_deleting_a_reading_refreshes_its_buckets(self):
+        self.create_blood_pressure(120, 80, 70)
+        reading = self.create_blood_pressure(110, 70, 60)
+        reading.delete()
+        rollup = all_time(self.user, "diastolic")
+        self.assertEqual(rollup.count, 1)
+        self.assertEqual(rollup.minimum, 80)
+
+    def test_deleting_the_last_reading_removes_the_rollups(self):
+        reading = self.create_blood_pressure(120, 80, 70)
+        reading.delete()
+        self.assertFalse(VitalsRollup.objects.filter(user=self.user).exists())
+
+    def test_deleting_the_user_deletes_the_rollups(self):
+        user = CustomUser.objects.create(username="ShortLivedUser")
+        BloodPressure.objects.create(user=user, systolic=120, diastolic=80, pulse=70)
+        user.delete()
+        self.assertFalse(VitalsRollup.objects.exists())
+
+    def test_decimal_readings(self):
+        BodyWeight.objects.create(subject=self.user, measurement=Decimal("180.50"))
+        BodyWeight.objects.create(subject=self.user, measurement=Decimal("179.50"))
+        rollup = all_time(self.user, "body_weight")
+        self.assertEqual(rollup.count, 2)
+        self.assertEqual(rollup.mean, 180.0)
+
+    def test_rollup_summary(self):
+        self.create_blood_pressure(120, 80, 70)
+        self.create_blood_pressure(111, 70, 60)
+        with self.assertNumQueries(1):
+            summary = rollup_summary(self.user, ("systolic", "diastolic"))
+        self.assertEqual(summary["count"], 2)
+        self.assertEqual(
+            summary["systolic"],
+            {"min": 111, "max": 120, "mean": 115.5, "median": None},
+        )
+
+
+class RebuildRollupsTest(TestCase):
+    """
+    Tests for `vitals.rollups.rebuild_rollups` and the
+    `rebuild_vitals_rollups` management command.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username=A_TEST_USERNAME)
+        for days_ago, systolic in [(0, 120), (1, 110), (40, 130)]:
+            reading = BloodPressure.objects.create(
+                user=cls.user, systolic=systolic, diastolic=80, pulse=70
+            )
+            BloodPressure.objects.filter(pk=reading.pk).update(
+                created=timezone.now() - timedelta(days=days_ago)
+            )
+
+    def test_rebuild_matches_the_readings(self):
+        VitalsRollup.objects.all().delete()
+        rebuild_rollups(batch_size=1)
+        rollup = all_time(self.user, "systolic")
+        self.assertEqual(rollup.count, 3)
+        self.assertEqual(rollup.total, 360)
+        self.assertEqual(rollup.minimum, 110)
+        self.assertEqual(rollup.maximum, 130)
+        days = VitalsRollup.objects.filter(
+            user=self.user, metric="systolic", period=VitalsRollup.PERIOD_DAY
+        )
+        self.assertEqual(days.count(), 3)
+        for reading in BloodPressure.objects.filter(user=self.user):
+            day = bucket_starts(reading.created)[VitalsRollup.PERIOD_DAY]
+            self.assertEqual(days.get(bucket_start=day).total, reading.systolic)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("rebuild_vitals_rollups", stdout=out)
+        self.assertIn("vitals rollups", out.getvalue())
+        self.assertEqual(all_time(self.user, "systolic").count, 3)
+
+    def test_migration_backfills_existing_readings(self):
+        VitalsRollup.objects.all().delete()
+        migration = import_module("vitals.migrations.0006_backfill_vitals_rollups")
+        migration.backfill_rollups(apps, None)
+        self.assertEqual(all_time(self.user, "systolic").count, 3)
+        self.assertEqual(
+            VitalsRollup.objects.filter(
+                user=self.user, metric="systolic", period=VitalsRollup.PERIOD_DAY
+            ).count(),
+            3,
+        )
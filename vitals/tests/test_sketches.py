@@ -0,0 +1,200 @@
+import random
+from decimal import Decimal
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.models import CustomUser
+from vitals.models import BloodPressure, Temperature, VitalsSketch
+from vitals.sketches import (
+    KLLSketch,
+    exact_quantiles,
+    metric_quantiles,
+    queue_sketch_rebuild,
+    rebuild_sketch,
+    rebuild_sketches,
+    sketch_quantiles,
+)
+
+A_TEST_USERNAME = "ACustomUser"
+REBUILD_TASK = "vitals.tasks.rebuild_vitals_sketch.delay"
+
+
+def rank_error(values, estimate, fraction):
+    """
+    How far, as a fraction of all values, the rank of `estimate` is from the
+    requested rank.
+    """
+    below = sum(1 for value in values if value < estimate)
+    return abs(below / len(values) - fraction)
+
+
+class KLLSketchTest(TestCase):
+    """
+    Tests for `vitals.sketches.KLLSketch`.
+    """
+
+    def setUp(self):
+        generator = random.Random(1234)
+        self.values = [generator.gauss(120, 15) for _ in range(20000)]
+
+    def test_empty_sketch(self):
+        self.assertIsNone(KLLSketch().quantile(0.5))
+
+    def test_small_sketch_is_exact(self):
+        sketch = KLLSketch()
+        for value in [5, 1, 4, 2, 3]:
+            sketch.update(value)
+        self.assertEqual(sketch.quantile(0.5), 3)
+        self.assertEqual(sketch.quantile(1), 5)
+
+    def test_quantiles_have_bounded_rank_error(self):
+        sketch = KLLSketch()
+        for value in self.values:
+            sketch.update(value)
+        self.assertEqual(sketch.n, len(self.values))
+        self.assertLess(sketch.size, 3 * sketch.k)
+        for fraction in (0.5, 0.9, 0.99):
+            self.assertLess(
+                rank_error(self.values, sketch.quantile(fraction), fraction), 0.02
+            )
+
+    def test_merge(self):
+        left, right = KLLSketch(), KLLSketch()
+        for value in self.values[:7000]:
+            left.update(value)
+        for value in self.values[7000:]:
+            right.update(value)
+        left.merge(right)
+        self.assertEqual(left.n, len(self.values))
+        self.assertLess(rank_error(self.values, left.quantile(0.5), 0.5), 0.02)
+
+    def test_round_trip(self):
+        sketch = KLLSketch()
+        for value in self.values[:1000]:
+            sketch.update(value)
+        restored = KLLSketch.from_dict(sketch.to_dict())
+        self.assertEqual(restored.n, sketch.n)
+        self.assertEqual(restored.quantile(0.9), sketch.quantile(0.9))
+
+
+class VitalsSketchMaintenanceTest(TestCase):
+    """
+    Tests for keeping `VitalsSketch` up to date and answering quantiles.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username=A_TEST_USERNAME)
+        for systolic in [110, 120, 130, 140]:
+            BloodPressure.objects.create(
+                user=cls.user, systolic=systolic, diastolic=80, pulse=70
+            )
+
+    def test_new_readings_update_the_sketch(self):
+        sketch = VitalsSketch.objects.get(user=self.user, metric="systolic")
+        self.assertEqual(sketch.count, 4)
+        self.assertFalse(sketch.is_stale)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_deleting_a_reading_marks_the_sketch_stale(self):
+        with mock.patch(REBUILD_TASK) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                BloodPressure.objects.filter(
+                    user=self.user, systolic=140
+                ).first().delete()
+        sketch = VitalsSketch.objects.get(user=self.user, metric="systolic")
+        self.assertTrue(sketch.is_stale)
+        delay.assert_any_call(self.user.pk, "systolic")
+        self.assertEqual(delay.call_count, 3)
+
+    def test_stale_sketches_are_answered_exactly_until_rebuilt(self):
+        VitalsSketch.objects.filter(user=self.user).update(is_stale=True)
+        BloodPressure.objects.filter(user=self.user, systolic=140).delete()
+        with mock.patch(REBUILD_TASK) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = sketch_quantiles(self.user, ["systolic"], fractions=(1,))
+        self.assertEqual(result["systolic"]["count"], 3)
+        self.assertEqual(result["systolic"]["quantiles"][1], 130)
+        delay.assert_called_once_with(self.user.pk, "systolic")
+        sketch = VitalsSketch.objects.get(user=self.user, metric="systolic")
+        self.assertTrue(sketch.is_stale)
+
+        self.assertTrue(rebuild_sketch(self.user.pk, "systolic"))
+        sketch.refresh_from_db()
+        self.assertFalse(sketch.is_stale)
+        self.assertEqual(sketch.count, 3)
+        self.assertFalse(rebuild_sketch(self.user.pk, "systolic"))
+
+    def test_a_queued_rebuild_is_not_queued_again(self):
+        with mock.patch(REBUILD_TASK) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_sketch_rebuild(self.user.pk, "systolic")
+                queue_sketch_rebuild(self.user.pk, "systolic")
+            self.assertEqual(delay.call_count, 1)
+            # Starting the rebuild lets the next change queue another one.
+            rebuild_sketch(self.user.pk, "systolic")
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_sketch_rebuild(self.user.pk, "systolic")
+        self.assertEqual(delay.call_count, 2)
+
+    @override_settings(VITALS_QUANTILE_MODE="auto", VITALS_SKETCH_THRESHOLD=4)
+    def test_auto_mode_answers_a_stale_large_history_exactly(self):
+        VitalsSketch.objects.filter(user=self.user).update(is_stale=True)
+        with mock.patch(REBUILD_TASK) as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = metric_quantiles(self.user, ["systolic"], fractions=(0.5,))
+        self.assertEqual(result["systolic"]["quantiles"][0.5], 125)
+        delay.assert_called_once_with(self.user.pk, "systolic")
+
+    def test_migration_backfills_stale_sketches(self):
+        VitalsSketch.objects.filter(metric="systolic").delete()
+        migration = import_module("vitals.migrations.0008_backfill_vitals_sketches")
+        migration.backfill_sketches(apps, None)
+        sketch = VitalsSketch.objects.get(user=self.user, metric="systolic")
+        self.assertTrue(sketch.is_stale)
+        self.assertEqual(sketch.count, 4)
+        self.assertEqual(VitalsSketch.objects.filter(user=self.user).count(), 3)
+
+    def test_exact_quantiles(self):
+        Temperature.objects.create(subject=self.user, measurement=Decimal("98.6"))
+        result = exact_quantiles(
+            self.user, ["systolic", "temperature"], fractions=(0.5, 0.9)
+        )
+        self.assertEqual(result["systolic"]["count"], 4)
+        self.assertEqual(result["systolic"]["quantiles"][0.5], 125)
+        self.assertAlmostEqual(result["systolic"]["quantiles"][0.9], 137)
+        self.assertAlmostEqual(result["temperature"]["quantiles"][0.5], 98.6)
+
+    @override_settings(VITALS_QUANTILE_MODE="exact")
+    def test_exact_mode(self):
+        result = metric_quantiles(self.user, ["systolic"], fractions=(0.5,))
+        self.assertEqual(result["systolic"]["quantiles"][0.5], 125)
+
+    @override_settings(VITALS_QUANTILE_MODE="sketch")
+    def test_sketch_mode(self):
+        result = metric_quantiles(self.user, ["systolic"], fractions=(0.5,))
+        # The sketch answers with one of the readings.
+        self.assertEqual(result["systolic"]["quantiles"][0.5], 120)
+
+    @override_settings(VITALS_QUANTILE_MODE="auto", VITALS_SKETCH_THRESHOLD=4)
+    def test_auto_mode_uses_the_sketch_for_large_histories(self):
+        with self.assertNumQueries(1):
+            result = metric_quantiles(self.user, ["systolic"], fractions=(0.5,))
+        self.assertEqual(result["systolic"]["quantiles"][0.5], 120)
+
+    @override_settings(VITALS_QUANTILE_MODE="auto", VITALS_SKETCH_THRESHOLD=5)
+    def test_auto_mode_is_exact_for_small_histories(self):
+        result = metric_quantiles(self.user, ["systolic"], fractions=(0.5,))
+        self.assertEqual(result["systolic"]["quantiles"][0.5], 125)
+
+    def test_rebuild_sketches(self):
+        VitalsSketch.objects.all().delete()
+        self.assertEqual(rebuild_sketches(), 3)
+        sketch = VitalsSketch.objects.get(user=self.user, metric="systolic")
+        self.assertEqual(sketch.count, 4)
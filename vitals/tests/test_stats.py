@@ -0,0 +1,121 @@
+from django.test import TestCase
+
+from accounts.models import CustomUser
+from vitals.models import BloodPressure
+from vitals.stats import (
+    blood_pressure_averages_and_medians,
+    blood_pressure_range,
+    blood_pressure_statistics,
+)
+
+A_TEST_USERNAME = "ACustomUser"
+ANOTHER_TEST_USERNAME = "AnotherCustomUser"
+
+BLOOD_PRESSURE_READINGS = [
+    (120, 80, 70),
+    (110, 70, 60),
+    (115, 75, 90),
+    (131, 85, 64),
+]
+
+
+class BloodPressureStatisticsTest(TestCase):
+    """
+    Tests for `vitals.stats.blood_pressure_statistics`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username=A_TEST_USERNAME)
+        cls.other_user = CustomUser.objects.create(username=ANOTHER_TEST_USERNAME)
+        for systolic, diastolic, pulse in BLOOD_PRESSURE_READINGS:
+            BloodPressure.objects.create(
+                user=cls.user,
+                systolic=systolic,
+                diastolic=diastolic,
+                pulse=pulse,
+            )
+        # A reading for another user which must not leak into the statistics.
+        BloodPressure.objects.create(
+            user=cls.other_user,
+            systolic=200,
+            diastolic=150,
+            pulse=150,
+        )
+
+    def test_uses_a_single_query(self):
+        """
+        All of the statistics should come from one database round-trip.
+        """
+        with self.assertNumQueries(1):
+            blood_pressure_statistics(self.user)
+
+    def test_statistics_with_even_number_of_readings(self):
+        """
+        The median of an even number of readings is the mean of the two middle
+        readings.
+        """
+        summary = blood_pressure_statistics(self.user)
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(
+            summary["systolic"],
+            {"min": 110, "max": 131, "mean": 119.0, "median": 117.5},
+        )
+        self.assertEqual(
+            summary["diastolic"],
+            {"min": 70, "max": 85, "mean": 77.5, "median": 77.5},
+        )
+        self.assertEqual(
+            summary["pulse"],
+            {"min": 60, "max": 90, "mean": 71.0, "median": 67.0},
+        )
+
+    def test_statistics_with_odd_number_of_readings(self):
+        """
+        The median of an odd number of readings is the middle reading.
+        """
+        BloodPressure.objects.filter(user=self.user, systolic=131).delete()
+        summary = blood_pressure_statistics(self.user)
+        self.assertEqual(summary["count"], 3)
+        self.assertEqual(summary["systolic"]["median"], 115)
+        self.assertIsInstance(summary["systolic"]["median"], int)
+        self.assertEqual(summary["diastolic"]["median"], 75)
+        self.assertEqual(summary["pulse"]["median"], 70)
+
+    def test_statistics_with_no_readings(self):
+        """
+        Every statistic should be `None` when the user has no readings.
+        """
+        user = CustomUser.objects.create(username="NoReadingsUser")
+        summary = blood_pressure_statistics(user)
+        self.assertEqual(summary["count"], 0)
+        self.assertEqual(
+            summary["systolic"],
+            {"min": None, "max": None, "mean": None, "median": None},
+        )
+        self.assertIsNone(blood_pressure_range(summary))
+        self.assertEqual(
+            blood_pressure_averages_and_medians(summary),
+            {
+                "systolic_average": None,
+                "diastolic_average": None,
+                "systolic_median": None,
+                "diastolic_median": None,
+            },
+        )
+
+    def test_blood_pressure_range(self):
+        """
+        `blood_pressure_range` should reshape the summary into the range
+        dictionary used by `BloodPressureListView`.
+        """
+        summary = blood_pressure_statistics(self.user)
+        self.assertEqual(
+            blood_pressure_range(summary),
+            {
+                "systolic_min": 110,
+                "diastolic_min": 70,
+                "systolic_max": 131,
+                "diastolic_max": 85,
+            },
+        )
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from vitals.metrics import METRICS
+from vitals.models import BloodPressure
+from vitals.timeseries import (
+    choose_resolution,
+    downsample,
+    largest_triangle_three_buckets,
+)
+
+USERNAME_REGISTRATION_ACCEPTED_TRUE = "RegisteredUser"
+PASSWORD_FOR_TESTING = "a_test_password"
+
+TIMESERIES_VIEW_NAME = "vitals:timeseries-api"
+
+START = timezone.make_aware(datetime(2024, 1, 1))
+END = START + timedelta(days=30)
+
+
+class ChooseResolutionTest(TestCase):
+    """
+    Tests for `vitals.timeseries.choose_resolution`.
+    """
+
+    def test_finest_resolution_that_fits(self):
+        self.assertEqual(choose_resolution(START, END, 1000), "hour")
+        self.assertEqual(choose_resolution(START, END, 30), "day")
+        self.assertEqual(choose_resolution(START, END, 10), "week")
+        decade = START + timedelta(days=3650)
+        self.assertEqual(choose_resolution(START, decade, 1), "year")
+
+
+class LargestTriangleThreeBucketsTest(TestCase):
+    """
+    Tests for `vitals.timeseries.largest_triangle_three_buckets`.
+    """
+
+    def test_keeps_the_ends_and_the_peak(self):
+        series = [
+            {"t": START + timedelta(hours=index), "avg": 100.0}
+            for index in range(100)
+        ]
+        series[50]["avg"] = 200.0
+        sampled = largest_triangle_three_buckets(series, 10)
+        self.assertEqual(len(sampled), 10)
+        self.assertIs(sampled[0], series[0])
+        self.assertIs(sampled[-1], series[-1])
+        self.assertIn(series[50], sampled)
+
+    def test_short_series_is_returned_unchanged(self):
+        series = [{"t": START, "avg": 1.0}, {"t": END, "avg": 2.0}]
+        self.assertEqual(largest_triangle_three_buckets(series, 10), series)
+
+
+class DownsampleTest(TestCase):
+    """
+    Tests for `vitals.timeseries.downsample` and the `timeseries_api` view.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+        # Four readings a day, six hours apart, for thirty days.
+        for index in range(120):
+            reading = BloodPressure.objects.create(
+                user=cls.user, systolic=110 + index % 4 * 10, diastolic=80, pulse=70
+            )
+            BloodPressure.objects.filter(pk=reading.pk).update(
+                created=START + timedelta(hours=6 * index)
+            )
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_buckets(self):
+        with self.assertNumQueries(1):
+            resolution, series = downsample(
+                METRICS["systolic"], self.user, START, END, 40
+            )
+        self.assertEqual(resolution, "day")
+        self.assertEqual(len(series), 30)
+        self.assertEqual(series[0]["t"], START)
+        self.assertEqual(series[0]["count"], 4)
+        self.assertEqual(series[0]["min"], 110)
+        self.assertEqual(series[0]["max"], 140)
+        self.assertEqual(series[0]["avg"], 125)
+
+    def test_lttb(self):
+        resolution, series = downsample(
+            METRICS["systolic"], self.user, START, END, 20, method="lttb"
+        )
+        # Picked from 30 daily buckets, the finest that fit 4 * 20 points.
+        self.assertEqual(resolution, "day")
+        self.assertEqual(len(series), 20)
+
+    def test_range_is_respected(self):
+        _, series = downsample(
+            METRICS["systolic"], self.user, START, START + timedelta(days=2), 1000
+        )
+        self.assertEqual(sum(point["count"] for point in series), 8)
+
+    def test_view(self):
+        response = self.client.get(
+            reverse(TIMESERIES_VIEW_NAME, args=["systolic"]),
+            {"start": "2024-01-01", "end": "2024-01-31", "points": 40},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["resolution"], "day")
+        self.assertEqual(len(data["points"]), 30)
+        self.assertEqual(data["points"][0]["avg"], 125)
+
+    def test_view_rejects_bad_parameters(self):
+        url = reverse(TIMESERIES_VIEW_NAME, args=["systolic"])
+        self.assertEqual(self.client.get(url, {"start": "soon"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"method": "spline"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(
+                url, {"start": "2024-02-01", "end": "2024-01-01"}
+            ).status_code,
+            400,
+        )
+
+    def test_view_unknown_metric(self):
+        response = self.client.get(reverse(TIMESERIES_VIEW_NAME, args=["mood"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_requires_registration(self):
+        self.client.logout()
+        response = self.client.get(reverse(TIMESERIES_VIEW_NAME, args=["systolic"]))
+        self.assertEqual(response.status_code, 403)
@@ -152,7 +152,7 @@ class BloodPressureListViewTest(TestCase):
             BLOOD_PRESSURE_LIST_PAGE_TITLE,
         )
         self.assertEqual(
-            response.context["bloodpressure_list"].count(),
+            len(response.context["bloodpressure_list"]),
             BloodPressure.objects.filter(user=self.user).count(),
         )
 
@@ -291,3 +291,79 @@ class BloodPressureListViewTest(TestCase):
             target_status_code=200,
             fetch_redirect_response=True,
         )
+
+
+class BloodPressurePaginationTest(TestCase):
+    """
+    Test the keyset pagination of `BloodPressureListView` and
+    `blood_pressure_api`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+            registration_accepted=True,
+        )
+        cls.readings = [
+            BloodPressure.objects.create(
+                user=cls.user, systolic=100 + index, diastolic=70, pulse=60
+            )
+            for index in range(30)
+        ]
+
+    def setUp(self):
+        self.client.login(
+            username=USERNAME_REGISTRATION_ACCEPTED_TRUE,
+            password=PASSWORD_FOR_TESTING,
+        )
+
+    def test_list_view_pages_follow_the_cursor(self):
+        """
+        The second page should continue exactly where the first one ended.
+        """
+        response = self.client.get(reverse(BLOOD_PRESSURE_LIST_VIEW_NAME))
+        first_page = response.context["bloodpressure_list"]
+        self.assertEqual(len(first_page), 25)
+        self.assertEqual(first_page[0], self.readings[-1])
+        next_cursor = response.context["next_cursor"]
+        self.assertIsNotNone(next_cursor)
+
+        response = self.client.get(
+            reverse(BLOOD_PRESSURE_LIST_VIEW_NAME), {"cursor": next_cursor}
+        )
+        second_page = response.context["bloodpressure_list"]
+        self.assertEqual(second_page, self.readings[4::-1])
+        self.assertIsNone(response.context["next_cursor"])
+
+    def test_list_view_invalid_cursor(self):
+        """
+        An invalid cursor should give a 404, like an invalid page number.
+        """
+        response = self.client.get(
+            reverse(BLOOD_PRESSURE_LIST_VIEW_NAME), {"cursor": "not-a-cursor"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_api_walks_every_reading_once(self):
+        """
+        Following `next_cursor` through the JSON endpoint should return every
+        reading exactly once, newest first.
+        """
+        seen = []
+        params = {"page_size": 7}
+        while True:
+            response = self.client.get(reverse("vitals:bloodpressure-api"), params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            seen += [reading["id"] for reading in data["results"]]
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+        self.assertEqual(seen, [reading.pk for reading in reversed(self.readings)])
+
+    def test_api_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("vitals:bloodpressure-api"))
+        self.assertEqual(response.status_code, 403)
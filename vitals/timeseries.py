@@ -0,0 +1,136 @@
+# vitals/timeseries.py
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, F, FloatField, Max, Min
+from django.db.models.functions import Trunc
+
+# Date truncation resolutions, finest first, with their approximate length.
+RESOLUTIONS = [
+    ("hour", timedelta(hours=1)),
+    ("day", timedelta(days=1)),
+    ("week", timedelta(weeks=1)),
+    ("month", timedelta(days=30)),
+    ("quarter", timedelta(days=91)),
+    ("year", timedelta(days=365)),
+]
+
+METHOD_BUCKETS = "buckets"
+METHOD_LTTB = "lttb"
+METHODS = (METHOD_BUCKETS, METHOD_LTTB)
+
+# `lttb` picks its points from SQL buckets about this many times finer than the
+# requested number of points.
+LTTB_OVERSAMPLING = 4
+
+
+def choose_resolution(start, end, points):
+    """
+    Return the finest truncation resolution that splits `start` to `end` into
+    no more than `points` buckets.
+    """
+    span = end - start
+    for kind, length in RESOLUTIONS:
+        if span / length <= points:
+            return kind
+    return RESOLUTIONS[-1][0]
+
+
+def bucketed_series(metric, user, start, end, resolution):
+    """
+    Return the `min`, `max`, `avg` and `count` of `metric` for `user` per
+    `resolution` bucket between `start` and `end`, oldest first.
+
+    The bucketing is a single `GROUP BY` over a date-truncated `created`, so
+    only one row per bucket leaves the database.
+    """
+    value = F(metric.value_field)
+    rows = (
+        metric.model.objects.filter(
+            **{metric.user_field: user},
+            created__gte=start,
+            created__lt=end,
+        )
+        .annotate(bucket=Trunc("created", resolution))
+        .values("bucket")
+        .annotate(
+            min=Min(value, output_field=FloatField()),
+            max=Max(value, output_field=FloatField()),
+            avg=Avg(value, output_field=FloatField()),
+            count=Count("pk"),
+        )
+        .order_by("bucket")
+    )
+    return [
+        {
+            "t": row["bucket"],
+            "min": row["min"],
+            "max": row["max"],
+            "avg": row["avg"],
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def largest_triangle_three_buckets(series, threshold):
+    """
+    Downsample `series`, a list of bucketed points, to `threshold` points with
+    the Largest-Triangle-Three-Buckets algorithm (Steinarsson, 2013), plotting
+    each point's `avg`.
+
+    The first and last points are always kept. In between, the series is split
+    into `threshold - 2` buckets and from each the point forming the largest
+    triangle with the previously chosen point and the average of the next
+    bucket is kept, which preserves the visual shape of the line.
+    """
+    if threshold >= len(series) or threshold < 3:
+        return list(series)
+
+    def x(point):
+        return point["t"].timestamp()
+
+    sampled = [series[0]]
+    bucket_size = (len(series) - 2) / (threshold - 2)
+    previous = series[0]
+    for index in range(threshold - 2):
+        bucket_start = int(index * bucket_size) + 1
+        bucket_end = int((index + 1) * bucket_size) + 1
+        next_start = bucket_end
+        next_end = min(int((index + 2) * bucket_size) + 1, len(series))
+        next_bucket = series[next_start:next_end] or [series[-1]]
+        average_x = sum(x(point) for point in next_bucket) / len(next_bucket)
+        average_y = sum(point["avg"] for point in next_bucket) / len(next_bucket)
+
+        best, best_area = None, -1.0
+        for point in series[bucket_start:bucket_end]:
+            area = abs(
+                (x(previous) - average_x) * (point["avg"] - previous["avg"])
+                - (x(previous) - x(point)) * (average_y - previous["avg"])
+            )
+            if area > best_area:
+                best, best_area = point, area
+        sampled.append(best)
+        previous = best
+    sampled.append(series[-1])
+    return sampled
+
+
+def downsample(metric, user, start, end, points, method=METHOD_BUCKETS):
+    """
+    Return `(resolution, series)`: `metric` for `user` between `start` and
+    `end` reduced to at most about `points` points.
+
+    - `buckets`: `min`/`max`/`avg` per date-truncated bucket.
+    - `lttb`: finer SQL buckets reduced to `points` with
+      `largest_triangle_three_buckets`.
+
+    Either way the response size is bounded by `points`, not by the number of
+    readings in the range.
+    """
+    if method == METHOD_LTTB:
+        resolution = choose_resolution(start, end, points * LTTB_OVERSAMPLING)
+        series = bucketed_series(metric, user, start, end, resolution)
+        return resolution, largest_triangle_three_buckets(series, points)
+    resolution = choose_resolution(start, end, points)
+    return resolution, bucketed_series(metric, user, start, end, resolution)
@@ -1,6 +1,16 @@
 from django.urls import path
 
-from vitals.views import BloodPressureCreateView, BloodPressureListView, home
+from vitals.views import (
+    BloodPressureCreateView,
+    BloodPressureListView,
+    VitalsImportView,
+    blood_pressure_api,
+    home,
+    timeseries_api,
+    vitals_export,
+    vitals_export_download,
+    vitals_export_status,
+)
 
 app_name = "vitals"
 urlpatterns = [
@@ -17,5 +27,36 @@ urlpatterns = [
     path(
         "bloodpressures/create/",
         BloodPressureCreateView.as_view(),
-        name="bloodpressure-create")
+        name="bloodpressure-create",
+    ),
+    path(
+        "bloodpressures/api/",
+        blood_pressure_api,
+        name="bloodpressure-api",
+    ),
+    path(
+        "timeseries/<str:metric>/",
+        timeseries_api,
+        name="timeseries-api",
+    ),
+    path(
+        "import/",
+        VitalsImportView.as_view(),
+        name="vitals-import",
+    ),
+    path(
+        "export/<str:kind>/",
+        vitals_export,
+        name="vitals-export",
+    ),
+    path(
+        "exports/<int:pk>/",
+        vitals_export_status,
+        name="vitals-export-status",
+    ),
+    path(
+        "exports/<int:pk>/download/",
+        vitals_export_download,
+        name="vitals-export-download",
+    ),
 ]
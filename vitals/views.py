@@ -1,9 +1,35 @@
-from django.shortcuts import render
-from django.views.generic import CreateView, ListView
+import csv
+import io
+from datetime import datetime, time, timedelta
 
+from django.conf import settings
+from django.http import FileResponse, Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.generic import CreateView, FormView, ListView
+
+from base.decorators import query_budget, registration_accepted_required
 from base.mixins import RegistrationAcceptedMixin
 from config.settings.base import THE_SITE_NAME
-from vitals.models import BloodPressure
+from vitals.exporters import (
+    CONTENT_TYPES,
+    export_filename,
+    export_formats,
+    export_queryset,
+    stream_export,
+)
+from vitals.forms import VitalsImportForm
+from vitals.importers import FORMAT_CSV, IMPORT_SPECS, format_for_name, import_readings
+from vitals.metrics import BLOOD_PRESSURE_METRICS, METRICS
+from vitals.models import BloodPressure, VitalsExport
+from vitals.pagination import keyset_page
+from vitals.rollups import rollup_summary
+from vitals.sketches import metric_quantiles
+from vitals.stats import blood_pressure_averages_and_medians, blood_pressure_range
+from vitals.tasks import export_vitals_to_storage
+from vitals.timeseries import METHOD_BUCKETS, METHODS, downsample
 
 
 def home(request):
@@ -36,38 +62,49 @@ class BloodPressureListView(RegistrationAcceptedMixin, ListView):
     template_name = "vitals/bloodpressure_list.html"
 
     The context_object_name attribute `context_object_name =
-    "bloodpressure_list"` is not needed since Django will use the default
-    context object name.
-    context_object_name = "bloodpressure_list"
+    "bloodpressure_list"` is needed because the page handed to the template
+    is a list rather than a `QuerySet`, so Django cannot derive the default
+    context object name from it.
 
-    This attribute `paginate_by = 10` will be implemented in the future.
-    paginate_by = 10
+    The attribute `paginate_by` is not used. Pages are keyset paginated on
+    `(created, id)` by `keyset_page` instead, so deep pages cost the same as
+    the first one. The `cursor` query parameter selects the page.
     """
 
+    context_object_name = "bloodpressure_list"
+    page_size = 25
+    # Session, user, page, rollups, sketches and exact medians.
+    query_budget = 6
+
     def get_context_data(self, **kwargs):
         """
         Override the `get_context_data` method to add
-        `user_averages_and_medians`.
+        `user_averages_and_medians` and `user_pressure_range`.
+
+        The minimums, maximums and averages are read from the user's
+        precomputed `VitalsRollup` rows. Medians come from
+        `metric_quantiles`, which answers exactly for small histories and from
+        the `VitalsSketch` for large ones.
         """
-        context = super().get_context_data(**kwargs)
-        user = self.request.user
-        # Get the average and median of the current user's blood pressure
-        # measurements.
-        user_blood_pressure_averages_and_medians = (
-            user.get_average_and_median_blood_pressure()
+        page, next_cursor = keyset_page(
+            self.object_list,
+            cursor=self.request.GET.get("cursor"),
+            page_size=self.page_size,
         )
-        user_blood_pressure_range = user.get_blood_pressure_range()
-        if user_blood_pressure_averages_and_medians is None:
-            context["user_averages_and_medians"] = {
-                "systolic_average": None,
-                "diastolic_average": None,
-                "systolic_median": None,
-                "diastolic_median": None,
-            }
-        else:
-            context["user_averages_and_medians"] = (
-                user_blood_pressure_averages_and_medians
+        context = super().get_context_data(object_list=page, **kwargs)
+        context["next_cursor"] = next_cursor
+        summary = rollup_summary(self.request.user, BLOOD_PRESSURE_METRICS)
+        if summary["count"]:
+            medians = metric_quantiles(
+                self.request.user, ("systolic", "diastolic"), fractions=(0.5,)
             )
+            for name, values in medians.items():
+                summary[name]["median"] = values["quantiles"][0.5]
+        context["user_averages_and_medians"] = blood_pressure_averages_and_medians(
+            summary
+        )
+        user_blood_pressure_range = blood_pressure_range(summary)
+        if user_blood_pressure_range is not None:
             context["user_pressure_range"] = user_blood_pressure_range
         return context
 
@@ -83,7 +120,210 @@ class BloodPressureListView(RegistrationAcceptedMixin, ListView):
         """
         return BloodPressure.objects.filter(
             user=self.request.user,
-        ).order_by("-created")
+        ).order_by("-created", "-id")
+
+
+@query_budget(3)
+@registration_accepted_required
+def blood_pressure_api(request):
+    """
+    JSON endpoint for a page of the user's blood pressure measurements,
+    newest first.
+
+    Pass the `next_cursor` of one response as the `cursor` query parameter to
+    get the next page. `page_size` defaults to 25 and is capped at 100.
+    """
+    try:
+        page_size = min(int(request.GET.get("page_size", 25)), 100)
+    except ValueError:
+        page_size = 25
+    page, next_cursor = keyset_page(
+        BloodPressure.objects.filter(user=request.user),
+        cursor=request.GET.get("cursor"),
+        page_size=max(page_size, 1),
+    )
+    return JsonResponse(
+        {
+            "results": [
+                {
+                    "id": reading.pk,
+                    "systolic": reading.systolic,
+                    "diastolic": reading.diastolic,
+                    "pulse": reading.pulse,
+                    "created": reading.created.isoformat(),
+                }
+                for reading in page
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def _parse_moment(value):
+    """
+    Parse an ISO date or date-time query parameter into an aware `datetime`.
+    A bare date means midnight at the start of that day.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date: {value!r}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+@query_budget(3)
+@registration_accepted_required
+def timeseries_api(request, metric):
+    """
+    JSON endpoint for a downsampled series of one of the user's vitals
+    metrics, for charting.
+
+    Query parameters:
+
+    - `start` and `end`: ISO dates or date-times; default to the last year.
+    - `points`: the target number of points, 200 by default, at most 1000.
+    - `method`: `buckets` (default) for `min`/`max`/`avg` per bucket, or
+      `lttb` for a Largest-Triangle-Three-Buckets line.
+    """
+    if metric not in METRICS:
+        raise Http404("Unknown metric.")
+    try:
+        end = (
+            _parse_moment(request.GET["end"])
+            if "end" in request.GET
+            else timezone.now()
+        )
+        start = (
+            _parse_moment(request.GET["start"])
+            if "start" in request.GET
+            else end - timedelta(days=365)
+        )
+        points = int(request.GET.get("points", 200))
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    method = request.GET.get("method", METHOD_BUCKETS)
+    if method not in METHODS:
+        return JsonResponse({"error": f"Unknown method: {method!r}"}, status=400)
+    if start >= end:
+        return JsonResponse({"error": "start must be before end."}, status=400)
+    points = min(max(points, 3), 1000)
+
+    resolution, series = downsample(
+        METRICS[metric], request.user, start, end, points, method=method
+    )
+    return JsonResponse(
+        {
+            "metric": metric,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "method": method,
+            "resolution": resolution,
+            "points": [
+                dict(point, t=point["t"].isoformat()) for point in series
+            ],
+        }
+    )
+
+
+@registration_accepted_required
+def vitals_export(request, kind):
+    """
+    Export the user's `kind` readings, oldest first.
+
+    Query parameters:
+
+    - `format`: `csv` (default), `jsonl`, or `parquet` when `pyarrow` is
+      installed.
+    - `start` and `end`: optional ISO dates or date-times.
+    - `background`: set to `1` to always export in the background.
+
+    The file is streamed straight from the database unless it has more than
+    `settings.VITALS_EXPORT_STREAM_LIMIT` rows. Then a `VitalsExport` is
+    written by a Celery task instead and the response, with status 202, links
+    to `vitals_export_status`.
+    """
+    if kind not in IMPORT_SPECS:
+        raise Http404("Unknown kind of reading.")
+    file_format = request.GET.get("format", FORMAT_CSV)
+    if file_format not in export_formats():
+        return JsonResponse({"error": f"Unknown format: {file_format!r}"}, status=400)
+    try:
+        start = _parse_moment(request.GET["start"]) if "start" in request.GET else None
+        end = _parse_moment(request.GET["end"]) if "end" in request.GET else None
+    except ValueError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+
+    background = request.GET.get("background") == "1"
+    if not background:
+        rows = export_queryset(request.user, kind, start, end).count()
+        background = rows > settings.VITALS_EXPORT_STREAM_LIMIT
+    if background:
+        export = VitalsExport.objects.create(
+            user=request.user,
+            kind=kind,
+            file_format=file_format,
+            start=start,
+            end=end,
+        )
+        export_vitals_to_storage.delay(export.pk)
+        return JsonResponse(
+            {
+                "id": export.pk,
+                "status": export.status,
+                "status_url": reverse("vitals:vitals-export-status", args=[export.pk]),
+            },
+            status=202,
+        )
+
+    response = StreamingHttpResponse(
+        stream_export(request.user, kind, file_format, start, end),
+        content_type=CONTENT_TYPES[file_format],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{export_filename(kind, file_format)}"'
+    )
+    return response
+
+
+@registration_accepted_required
+def vitals_export_status(request, pk):
+    """
+    JSON endpoint for the status of one of the user's background exports,
+    with its download link once it is done.
+    """
+    export = get_object_or_404(VitalsExport, pk=pk, user=request.user)
+    done = export.status == VitalsExport.STATUS_DONE
+    return JsonResponse(
+        {
+            "id": export.pk,
+            "status": export.status,
+            "download_url": (
+                reverse("vitals:vitals-export-download", args=[export.pk])
+                if done
+                else None
+            ),
+        }
+    )
+
+
+@registration_accepted_required
+def vitals_export_download(request, pk):
+    """
+    Serve the file of one of the user's finished background exports.
+    """
+    export = get_object_or_404(
+        VitalsExport, pk=pk, user=request.user, status=VitalsExport.STATUS_DONE
+    )
+    return FileResponse(
+        export.file.open("rb"),
+        as_attachment=True,
+        filename=export_filename(export.kind, export.file_format),
+        content_type=CONTENT_TYPES[export.file_format],
+    )
 
 
 # Check if user is logged in and then check if the user has
@@ -125,3 +365,45 @@ class BloodPressureCreateView(
         """
         form.instance.user = self.request.user
         return super().form_valid(form)
+
+
+class VitalsImportView(RegistrationAcceptedMixin, FormView):
+    """
+    `FormView` for a user to upload a file of vitals readings.
+
+    The file is streamed through `import_readings`, so large device exports
+    are imported in constant memory. The page is rendered again with the
+    import report.
+    """
+
+    form_class = VitalsImportForm
+    template_name = "vitals/vitals_import.html"
+
+    extra_context = {
+        "the_site_name": THE_SITE_NAME,
+        "page_title": "Import Vitals",
+    }
+
+    def form_valid(self, form):
+        """
+        Override the `form_valid` method to import the uploaded file for the
+        current user.
+        """
+        upload = form.cleaned_data["file"]
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            report = import_readings(
+                self.request.user,
+                form.cleaned_data["kind"],
+                stream,
+                format_for_name(upload.name),
+            )
+        except UnicodeDecodeError:
+            form.add_error("file", "The file is not UTF-8 encoded text.")
+            return self.form_invalid(form)
+        except csv.Error as error:
+            form.add_error("file", f"The file is not a valid CSV file: {error}")
+            return self.form_invalid(form)
+        return self.render_to_response(
+            self.get_context_data(form=self.form_class(), report=report)
+        )